@@ -27,6 +27,7 @@ CORE_VARIABLE_NAME = "-core-"
 TIMERS_VARIABLE_NAME = "[t]"
 QUESTIONS_VARIABLE_NAME = "[q]"
 COUNT_VARIABLE_NAME = "[c]"
+PREFETCH_VARIABLES_NAME = "[v]"
 
 
 class BotEnginePyTest:
@@ -430,6 +431,9 @@ class BotEnginePyTest:
             self.loggers[name] = self.create_logger(name)
         return self.loggers[name]
 
+    def get_logger_handle(self, name="bot"):
+        return self.get_logger(name)
+
     def log(self, message, num_of_blank_lines=1):
         """Log with blank lines before the message"""
         logger = self.get_logger(f"{__name__}.{__class__.__name__}")
@@ -595,6 +599,13 @@ class BotEnginePyTest:
         """
         return self.inputs.get("data", None)
 
+    def download_data_requests(self, data):
+        """Download data requests - can't do much"""
+        self.get_logger(f"{__name__}.{__class__.__name__}").warning(
+            "WARNING: download_data_requests() called, but we can't return anything"
+        )
+        return {}
+
     def get_input_key(self):
         """
         :return: the key provided by the input, if any
@@ -982,6 +993,13 @@ class BotEnginePyTest:
                 self.variables_to_flush.update(variables_dictionary)
         return
 
+    def save_serialized_variables(self, variables_dictionary):
+        self.get_logger(f"{__name__}.{__class__.__name__}").debug(
+            ">save_serialized_variables() variables={}".format(list(variables_dictionary.keys()))
+        )
+        self.variables.update(variables_dictionary)
+        self.variables_to_flush.update(variables_dictionary)
+
     def load_variable(self, name, shared=False):
         self.get_logger(f"{__name__}.{__class__.__name__}").debug(
             ">load_variable() name={} shared={}".format(name, shared)
@@ -1002,6 +1020,15 @@ class BotEnginePyTest:
             return_values[name] = self.variables.get(name)
         return return_values
 
+    def prefetch_variables(self, names=None):
+        return
+
+    def set_prefetch_variables(self, names):
+        self.save_variable(PREFETCH_VARIABLES_NAME, list(names), required_for_each_execution=True)
+
+    def get_prefetch_variables(self):
+        return list(self.variables.get(CORE_VARIABLE_NAME, {}).get(PREFETCH_VARIABLES_NAME) or [])
+
     def delete_variable(self, name, shared=False):
         self.get_logger(f"{__name__}.{__class__.__name__}").debug(
             ">delete_variable() name={} shared={}".format(name, shared)
@@ -3141,6 +3168,20 @@ class BotEnginePyTest:
         )
         return {}
 
+    def iterate_measurements(
+        self,
+        device_id,
+        oldest_timestamp_ms,
+        newest_timestamp_ms=None,
+        user_id=None,
+        param_name=None,
+        index=None,
+    ):
+        self.get_logger(f"{__name__}.{__class__.__name__}").warning(
+            "WARNING: iterate_measurements() called, but we can't return anything"
+        )
+        return iter([])
+
     def request_data(
         self,
         type=1,
@@ -8,9 +8,11 @@ file 'LICENSE.txt', which is part of this source code package.
 """
 
 import importlib
+import importlib.util
 import json
 
 import localization
+import persistence
 from controller import Controller
 from startup import StartUpUtil
 from utilities.utilities import getsize, Color
@@ -88,6 +90,10 @@ def run(botengine):
     controller = load_controller(botengine)
     botengine.get_logger(f"{__name__}").debug("|run() Controller Loaded")
 
+    # Remember the controller of this execution, so the statistics don't need to load it again
+    global _executed_controller
+    _executed_controller = (botengine, controller)
+
     # When running locally, report the largest objects inside the controller
     # Only execute this once per local execution, similar to how new_version() is triggered
     if hasattr(botengine, "local") and botengine.local and botengine.local_execution_count == 0:
@@ -251,9 +257,7 @@ def run(botengine):
             trigger_event(botengine, controller, queue_trigger_type, queue_triggers)
 
         # Always save your variables!
-        botengine.save_variable(
-            "controller", controller, required_for_each_execution=True
-        )
+        persistence.save_controller(botengine, controller)
         startup.reset()
         botengine.save_variable(
             "startup_tool", startup, required_for_each_execution=True
@@ -272,7 +276,10 @@ def load_controller(botengine):
     """
     botengine.get_logger(f"{__name__}").debug(">load_controller()")
     try:
-        controller = botengine.load_variable("controller")
+        controller = persistence.load_controller(botengine)
+    except persistence.ControllerLoadError:
+        # Never replace a saved controller that can't be loaded with a new one
+        raise
     except Exception as e:
         controller = None
         botengine.get_logger(f"{__name__}").warning(
@@ -284,9 +291,7 @@ def load_controller(botengine):
             "|load_controller() Creating a new Controller object. Hello."
         )
         controller = Controller()
-        botengine.save_variable(
-            "controller", controller, required_for_each_execution=True
-        )
+        persistence.save_controller(botengine, controller)
     
     botengine.get_logger(f"{__name__}").debug("|load_controller() track locations")
     controller.track_new_and_deleted_locations(botengine)
@@ -327,10 +332,17 @@ def get_intelligence_statistics(botengine):
     :param botengine: BotEngine environment
     :return: Microservice statistics
     """
-    controller = load_controller(botengine)
+    if _executed_controller is not None and _executed_controller[0] is botengine:
+        controller = _executed_controller[1]
+    else:
+        controller = load_controller(botengine)
     return controller.get_intelligence_statistics(botengine)
 
 
+# The botengine and controller of the most recent execution of run()
+_executed_controller = None
+
+
 def trigger_event(botengine, controller, trigger_type, triggers):
     botengine.get_logger(f"{__name__}").info(
         ">trigger_event() trigger_type={}".format(trigger_type)
@@ -833,36 +845,35 @@ def trigger_event(botengine, controller, trigger_type, triggers):
         botengine.get_logger(f"{__name__}").info(
             "|trigger_event() Data request received"
         )
-        events = {}
+        events = None
         data = botengine.get_data_block()
         botengine.get_logger(f"{__name__}").debug(
             "|trigger_event() data={}".format(data)
         )
 
         if botengine.playback:
-            for d in data:
-                reference = None
-                if "key" in d:
-                    reference = d["key"]
+            # The playback recording already holds the decompressed files
+            events = botengine.download_data_requests(data)
 
-                if reference not in events:
-                    events[reference] = {}
-                botengine.get_logger(f"{__name__}").info(
-                    "|trigger_event() Inserting from playback {} ({} bytes)...".format(
-                        d["deviceId"], d["dataLength"]
-                    )
-                )
-                events[reference][d["deviceId"]] = d["data"]
+        elif importlib.util.find_spec("lz4") is None:
+            botengine.get_logger(f"{__name__}").error(
+                "|trigger_event() Attempted to import 'lz4' to uncompress the data request response, but lz4 is not available. Please add 'lz4' to 'pip_install_remotely' in your structure.json."
+            )
 
+        else:
+            # Download every device's file in parallel, decompressing as they download
+            events = botengine.download_data_requests(data)
+
+        if events is not None:
             data_events = {}
 
             for reference, value in events.items():
                 if reference not in data_events:
                     data_events[reference] = {}
 
-                for device_id, decompressed_content in value.items():
+                for device_id, content in value.items():
                     data_events[reference][controller.get_device(botengine, device_id)] = (
-                        decompressed_content
+                        content
                     )
 
             for reference in data_events:
@@ -870,53 +881,9 @@ def trigger_event(botengine, controller, trigger_type, triggers):
                     botengine, reference, data_events[reference]
                 )
 
-        else:
-            imported = False
-
-            try:
-                import lz4.block
-
-                imported = True
-            except ImportError:
-                botengine.get_logger(f"{__name__}").error(
-                    "|trigger_event() Attempted to import 'lz4' to uncompress the data request response, but lz4 is not available. Please add 'lz4' to 'pip_install_remotely' in your structure.json."
-                )
-                pass
-
-            if imported:
-                for d in data:
-                    reference = None
-                    if "key" in d:
-                        reference = d["key"]
-
-                    if reference not in events:
-                        events[reference] = {}
-
-                    botengine.get_logger(f"{__name__}").info(
-                        "|trigger_event() Downloading {} ({} bytes)...".format(
-                            d["deviceId"], d["dataLength"]
-                        )
-                    )
-                    r = botengine.send_data_request(d["url"], timeout=60, stream=True)
-                    events[reference][d["deviceId"]] = lz4.block.decompress(
-                        r.content, uncompressed_size=d["dataLength"]
-                    )
-
-                data_events = {}
-
-                for reference, value in events.items():
-                    if reference not in data_events:
-                        data_events[reference] = {}
-
-                    for device_id, decompressed_content in value.items():
-                        data_events[reference][controller.get_device(botengine, device_id)] = (
-                            decompressed_content
-                        )
-
-                for reference in data_events:
-                    controller.async_data_request_ready(
-                        botengine, reference, data_events[reference]
-                    )
+            # Release the downloaded files. Content a microservice kept a reference to stays readable until it's
+            # released too, so nothing is closed out from under it.
+            del events, data_events
 
     # MESSAGES
     if trigger_type & botengine.TRIGGER_MESSAGES != 0:
@@ -927,23 +894,110 @@ def trigger_event(botengine, controller, trigger_type, triggers):
         if messages is not None:
             controller.sync_messages(botengine, messages)
 
+    # Deliver deferred signals once, after every event of this trigger was delivered
+    controller.flush_signals(botengine)
     botengine.get_logger(f"{__name__}").info("<trigger_event()")
 
 
 def extract_available_device_type_classes(botengine):
     """
-    Extract all available device type classes from a module
+    Extract all available device type classes from a module.
+    The device modules are only imported once per process, and then cached.
     :return List of device type classes
     """
-    #
-    # Walk through our devices directory
+    return _get_device_type_registry(botengine)[0]
+
+
+def get_device_type_class(botengine, device_type):
+    """
+    Get the device class for the given device type
+    :param botengine: BotEngine environment
+    :param device_type: Device type integer
+    :return: Device class, or None if this bot doesn't support the device type
+    """
+    return _get_device_type_registry(botengine)[1].get(device_type)
+
+
+# Device type class registries, cached for the life of this process: { devices_directory: (classes, { device_type: class }) }
+_device_type_registries = {}
+
+
+def _get_device_type_registry(botengine):
+    """
+    Build the device type class registry once per process.
+    Device modules come from the devices.json index written when the bot is assembled,
+    or by walking the devices/ directory if the index doesn't exist.
+    :param botengine: BotEngine environment
+    :return: (list of device type classes, dictionary of { device_type: device_class })
+    """
+    import os
+
+    bot_directory = os.path.dirname(os.path.realpath(__file__))
+    dir_path = os.path.join(bot_directory, "devices")
+    if dir_path in _device_type_registries:
+        return _device_type_registries[dir_path]
+
+    module_names = None
+    index_path = os.path.join(bot_directory, "devices.json")
+    if os.path.exists(index_path):
+        try:
+            with open(index_path, "r") as f:
+                module_names = json.load(f)["modules"]
+        except Exception as e:
+            botengine.get_logger(f"{__name__}").warning(
+                "|_get_device_type_registry() Unable to read {}: {}".format(index_path, e)
+            )
+
+    if module_names is None:
+        module_names = _walk_device_modules(dir_path)
+
     available_device_type_classes = []
+    for module_name in module_names:
+        # Import the module
+        try:
+            module = importlib.import_module(module_name)
+        except Exception as e:
+            botengine.get_logger(f"{__name__}").error(
+                "|extract_available_device_type_classes() Failed to import module. module_name={}; error={}".format(
+                    module_name, e
+                )
+            )
+            continue
+
+        # Get all the classes in the module
+        from inspect import isclass
 
+        classes = [x for x in dir(module) if isclass(getattr(module, x))]
+        for class_name in classes:
+            # Extract only classes that conform to the Device class with one or more specified device type
+            class_ = getattr(module, class_name)
+            if (
+                hasattr(class_, "DEVICE_TYPES")
+                and class_ not in available_device_type_classes
+            ):
+                available_device_type_classes.append(class_)
+
+    # The first class to declare a device type wins
+    device_type_classes = {}
+    for class_ in available_device_type_classes:
+        for device_type in class_.DEVICE_TYPES:
+            device_type_classes.setdefault(device_type, class_)
+
+    _device_type_registries[dir_path] = (available_device_type_classes, device_type_classes)
+    return _device_type_registries[dir_path]
+
+
+def _walk_device_modules(dir_path):
+    """
+    Walk through our devices directory to find device modules
+    :param dir_path: Absolute path to the devices directory
+    :return: List of module names like "devices.*.*"
+    """
     import os
     from os import walk
+    from pathlib import Path
 
-    dir_path = os.path.join(os.path.dirname(os.path.realpath(__file__)), "devices")
-
+    module_names = []
     for dirpath, dirnames, filenames in walk(dir_path):
         # Walk through each subdirectory
         for dirname in dirnames:
@@ -957,38 +1011,15 @@ def extract_available_device_type_classes(botengine):
                         continue
 
                     # Form the module name like "devices.*.*.py"
-                    from pathlib import Path
-
                     devices_index = Path(_dirpath).parts.index("devices")
                     module_name = "{}.{}".format(
                         ".".join(Path(_dirpath).parts[devices_index:]),
                         Path(filename).with_suffix(""),
                     )
-                    # Import the module
-                    try:
-                        module = importlib.import_module(module_name)
-                    except Exception as e:
-                        botengine.get_logger(f"{__name__}").error(
-                            "|extract_available_device_type_classes() Failed to import module. path={} filename={} module_name={}; error={}".format(
-                                _dirpath, filename, module_name, e
-                            )
-                        )
-                        continue
-
-                    # Get all the classes in the module
-                    from inspect import isclass
-
-                    classes = [x for x in dir(module) if isclass(getattr(module, x))]
-                    for class_name in classes:
-                        # Extract only classes that conform to the Device class with one or more specified device type
-                        class_ = getattr(module, class_name)
-                        if (
-                            hasattr(class_, "DEVICE_TYPES")
-                            and class_ not in available_device_type_classes
-                        ):
-                            available_device_type_classes.append(class_)
+                    if module_name not in module_names:
+                        module_names.append(module_name)
 
-    return available_device_type_classes
+    return module_names
 
 
 # ===============================================================================
@@ -1019,7 +1050,8 @@ def _location_intelligence_fired(botengine, argument_tuple):
             )
         )
 
-    botengine.save_variable("controller", controller, required_for_each_execution=True)
+    controller.flush_signals(botengine)
+    persistence.save_controller(botengine, controller)
     botengine.get_logger(f"{__name__}").info("<_location_intelligence_fired()")
 
 
@@ -1152,7 +1184,8 @@ def _device_intelligence_fired(botengine, argument_tuple):
 
             time.sleep(2)
 
-    botengine.save_variable("controller", controller, required_for_each_execution=True)
+    controller.flush_signals(botengine)
+    persistence.save_controller(botengine, controller)
     botengine.get_logger(f"{__name__}").info("<_device_intelligence_fired()")
 
 
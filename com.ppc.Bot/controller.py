@@ -314,28 +314,19 @@ class Controller:
                         device_object = None
                         continue
 
-                # Load any available device type class within this bundle
-                device_type_classes = self._extract_available_device_type_classes(
-                    botengine
-                )
-                botengine.get_logger(f"{__name__}.{__class__.__name__}").debug(
-                    "|track_new_and_deleted_devices() Extracted available device type classes"
-                )
-
                 if device_object is None:
                     # Try to find a new device class for this device type
                     new_device_object = None
-                    for device_type_class in device_type_classes:
-                        if device_type in device_type_class.DEVICE_TYPES:
-                            new_device_object = device_type_class(
-                                botengine,
-                                location_object,
-                                device_id,
-                                device_type,
-                                device_desc,
-                                precache_measurements,
-                            )
-                            break
+                    device_type_class = self._get_device_type_class(botengine, device_type)
+                    if device_type_class is not None:
+                        new_device_object = device_type_class(
+                            botengine,
+                            location_object,
+                            device_id,
+                            device_type,
+                            device_desc,
+                            precache_measurements,
+                        )
                     
                     if new_device_object is not None:
                         # We found a new class - migrate the deprecated device to the new one
@@ -659,7 +650,7 @@ class Controller:
         A botengine.request_data() request is ready
         :param botengine: BotEngine environment
         :param reference: Optional reference passed into botengine.request_data(..)
-        :param device_csv_dict: { 'device_id': 'csv data string' }
+        :param device_csv_dict: { device_object: DataRequestContent iterable of CSV rows }
         """
         for location_id in self.locations:
             self.locations[location_id].async_data_request_ready(
@@ -788,6 +779,16 @@ class Controller:
         for location_id in self.locations:
             self.locations[location_id].schedule_fired(botengine, schedule_id)
 
+    def flush_signals(self, botengine):
+        """
+        Deliver the signals each location deferred during this execution
+        :param botengine: BotEngine environment
+        """
+        import signals.bus as bus
+
+        for location_id in self.locations:
+            bus.flush(botengine, self.locations[location_id])
+
     def get_device(self, botengine, device_id):
         """
         Get the device represented by the device ID, if it exists
@@ -919,16 +920,17 @@ class Controller:
         Extract all available device type classes from a module
         :return List of device type classes
         """
-        # Efficiently grab this information once for bot playback
-        if botengine.playback and hasattr(self, "available_device_type_classes"):
-            return self.available_device_type_classes
-
         import bot
 
-        available_device_type_classes = bot.extract_available_device_type_classes(
-            botengine
-        )
+        return bot.extract_available_device_type_classes(botengine)
+
+    def _get_device_type_class(self, botengine, device_type):
+        """
+        Get the device class for a device type from the process-wide device type registry
+        :param botengine: BotEngine environment
+        :param device_type: Device type integer
+        :return: Device class, or None if this bot doesn't support the device type
+        """
+        import bot
 
-        if botengine.playback:
-            self.available_device_type_classes = available_device_type_classes
-        return available_device_type_classes
+        return bot.get_device_type_class(botengine, device_type)
@@ -56,6 +56,17 @@ class BedDevice(Device):
     # Device types
     DEVICE_TYPES = []
 
+    # Running statistics of measurements
+    MEASUREMENT_STATISTICS = dict(
+        Device.MEASUREMENT_STATISTICS,
+        **{
+            MEASUREMENT_NAME_BED_STATUS: [None],
+            MEASUREMENT_NAME_HEART_RATE: [None],
+            MEASUREMENT_NAME_HEART_RATE_RESTING: [None],
+            MEASUREMENT_NAME_HR_VARIABILITY: [None],
+        }
+    )
+
     def __init__(
         self,
         botengine,
@@ -173,22 +184,12 @@ class BedDevice(Device):
         :param botengine: BotEngine environment
         :return: Timestamp in milliseconds when someone last got out of bed, or None if no bed exit found
         """
-        if BedDevice.MEASUREMENT_NAME_BED_STATUS not in self.measurements:
-            return None
-        
-        if len(self.measurements[BedDevice.MEASUREMENT_NAME_BED_STATUS]) == 0:
+        statistics = self.get_measurement_statistics(
+            botengine, BedDevice.MEASUREMENT_NAME_BED_STATUS
+        )
+        if statistics is None:
             return None
-        
-        last_out_of_bed_timestamp = None
-        
-        for measurement in self.measurements[BedDevice.MEASUREMENT_NAME_BED_STATUS]:
-            value, timestamp = measurement[0], measurement[1]
-            # Check if this measurement shows out of bed (value = 0)
-            if value == 0:
-                if last_out_of_bed_timestamp is None or timestamp > last_out_of_bed_timestamp:
-                    last_out_of_bed_timestamp = timestamp
-        
-        return last_out_of_bed_timestamp
+        return statistics.last_timestamp(0)
 
     
     def did_update_breathing_rate(self, botengine):
@@ -230,20 +231,16 @@ class BedDevice(Device):
 
     def get_average_heart_rate(self, botengine):
         """
-        Retrieve the most recent heart_rate value
+        Retrieve the average of the cached heart rate values
         :param botengine:
-        :return:
+        :return: Average heart rate, or None
         """
-        if BedDevice.MEASUREMENT_NAME_HEART_RATE in self.measurements:
-            from statistics import mean
-
-            return mean(
-                [
-                    x[0]
-                    for x in self.measurements[BedDevice.MEASUREMENT_NAME_HEART_RATE]
-                ]
-            )
-        return None
+        statistics = self.get_measurement_statistics(
+            botengine, BedDevice.MEASUREMENT_NAME_HEART_RATE
+        )
+        if statistics is None:
+            return None
+        return statistics.mean()
 
     def did_update_heart_rate_resting(self, botengine):
         """
@@ -269,22 +266,16 @@ class BedDevice(Device):
 
     def get_average_heart_rate_resting(self, botengine):
         """
-        Retrieve the most recent heart rate resting value
+        Retrieve the average of the cached heart rate resting values
         :param botengine:
-        :return:
+        :return: Average heart rate resting, or None
         """
-        if BedDevice.MEASUREMENT_NAME_HEART_RATE_RESTING in self.measurements:
-            from statistics import mean
-
-            return mean(
-                [
-                    x[0]
-                    for x in self.measurements[
-                        BedDevice.MEASUREMENT_NAME_HEART_RATE_RESTING
-                    ]
-                ]
-            )
-        return None
+        statistics = self.get_measurement_statistics(
+            botengine, BedDevice.MEASUREMENT_NAME_HEART_RATE_RESTING
+        )
+        if statistics is None:
+            return None
+        return statistics.mean()
 
 
     def did_change_heart_rate(self, botengine):
@@ -334,20 +325,12 @@ class BedDevice(Device):
         :param botengine:
         :return: hr variability measurement
         """
-        if BedDevice.MEASUREMENT_NAME_HR_VARIABILITY in self.measurements:
-            if len(self.measurements[BedDevice.MEASUREMENT_NAME_HR_VARIABILITY]) > 0:
-                from statistics import mean
-
-                return mean(
-                    [
-                        x[0]
-                        for x in self.measurements[
-                            BedDevice.MEASUREMENT_NAME_HR_VARIABILITY
-                        ]
-                    ]
-                )
-
-        return None
+        statistics = self.get_measurement_statistics(
+            botengine, BedDevice.MEASUREMENT_NAME_HR_VARIABILITY
+        )
+        if statistics is None:
+            return None
+        return statistics.mean()
 
     def update(self, botengine, measures):
         """
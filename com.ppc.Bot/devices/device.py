@@ -7,9 +7,11 @@ file 'LICENSE.txt', which is part of this source code package.
 @author: David Moss
 """
 
+import collections
 import importlib
 
 import index
+import manifest
 import utilities.utilities as utilities
 
 # Maximum number of attempts for any one command
@@ -19,8 +21,18 @@ MAX_ATTEMPTS = 20
 TIME_BETWEEN_ATTEMPTS_SEC = 30
 
 # Reliability variable name so we prevent typos
+# DEPRECATED: The queue moved into the core variables under RELIABILITY_QUEUE_VARIABLE_NAME, this is only read once to migrate it
 RELIABILITY_VARIABLE_NAME = "reliability"
 
+# Name of the core variable holding the reliable command queue
+RELIABILITY_QUEUE_VARIABLE_NAME = "reliability_queue"
+
+# Name of the botengine variable holding the core variables, which are downloaded at the start of every execution
+CORE_VARIABLE_NAME = "-core-"
+
+# Timer reference for reliable delivery attempts
+RELIABILITY_TIMER_REFERENCE = "reliability"
+
 # Minimum number of measurements to maintain in the cache, regardless of the cache duration
 MINIMUM_MEASUREMENTS_TO_CACHE = 1
 
@@ -51,6 +63,350 @@ VALUE = 0
 TIMESTAMP = 1
 
 
+class MeasurementStatistics:
+    """
+    Running statistics of one parameter's measurements, oldest first, optionally limited to a time window.
+
+    Adding a measurement and forgetting the oldest ones are O(1) amortized, so the mean, minimum, maximum, count,
+    and the last timestamp of a value are read without scanning the measurement history.
+    Only numeric values count toward the mean, minimum, and maximum.
+    """
+
+    def __init__(self, window_ms=None):
+        """
+        :param window_ms: Only include measurements within this many milliseconds of the newest one, or None for every measurement
+        """
+        self.window_ms = window_ms
+
+        # Measurements in the order they were added: ( sequence, value, timestamp )
+        self._items = collections.deque()
+
+        # Sequence number of the next measurement, and the number of oldest measurements removed from the history
+        self._sequence = 0
+        self._dropped = 0
+
+        # Sum and number of numeric values
+        self._sum = 0
+        self._numeric = 0
+
+        # Candidates for the minimum and maximum value: ( sequence, value ), the current one first
+        self._minimums = collections.deque()
+        self._maximums = collections.deque()
+
+        # { value: [ count, newest timestamp ] } for hashable values
+        self._values = {}
+
+        self._newest_timestamp_ms = None
+
+    def add(self, value, timestamp):
+        """
+        Add the newest measurement
+        :param value: Measurement value
+        :param timestamp: Measurement timestamp in milliseconds
+        """
+        sequence = self._sequence
+        self._sequence += 1
+        self._items.append((sequence, value, timestamp))
+
+        if _is_number(value):
+            self._sum += value
+            self._numeric += 1
+
+            while len(self._minimums) > 0 and self._minimums[-1][1] >= value:
+                self._minimums.pop()
+            self._minimums.append((sequence, value))
+
+            while len(self._maximums) > 0 and self._maximums[-1][1] <= value:
+                self._maximums.pop()
+            self._maximums.append((sequence, value))
+
+        try:
+            entry = self._values.setdefault(value, [0, timestamp])
+            entry[0] += 1
+            entry[1] = max(entry[1], timestamp)
+        except TypeError:
+            # Unhashable value
+            pass
+
+        if self._newest_timestamp_ms is None or timestamp > self._newest_timestamp_ms:
+            self._newest_timestamp_ms = timestamp
+
+        if self.window_ms is not None:
+            self.expire(self._newest_timestamp_ms)
+
+    def drop(self, count):
+        """
+        Forget measurements that were trimmed from the oldest end of the history
+        :param count: Number of measurements trimmed
+        """
+        self._dropped += count
+        while len(self._items) > 0 and self._items[0][0] < self._dropped:
+            self._forget_oldest()
+
+    def expire(self, timestamp_ms):
+        """
+        Forget measurements that are outside the time window at the given time
+        :param timestamp_ms: Current timestamp in milliseconds
+        """
+        if self.window_ms is None:
+            return
+
+        while len(self._items) > 0 and self._items[0][2] <= timestamp_ms - self.window_ms:
+            self._forget_oldest()
+
+    def count(self):
+        """
+        :return: Number of measurements
+        """
+        return len(self._items)
+
+    def mean(self):
+        """
+        :return: Mean of the numeric values, or None if there are none
+        """
+        if self._numeric == 0:
+            return None
+        return self._sum / self._numeric
+
+    def minimum(self):
+        """
+        :return: Minimum numeric value, or None if there are none
+        """
+        if len(self._minimums) == 0:
+            return None
+        return self._minimums[0][1]
+
+    def maximum(self):
+        """
+        :return: Maximum numeric value, or None if there are none
+        """
+        if len(self._maximums) == 0:
+            return None
+        return self._maximums[0][1]
+
+    def last_timestamp(self, value):
+        """
+        :param value: Measurement value, for example 0 for a bed status that reports being out of bed
+        :return: Newest timestamp in milliseconds of a measurement with this value, or None
+        """
+        try:
+            entry = self._values.get(value)
+        except TypeError:
+            return None
+
+        if entry is None:
+            return None
+        return entry[1]
+
+    def _forget_oldest(self):
+        """
+        Forget the oldest measurement
+        """
+        sequence, value, timestamp = self._items.popleft()
+
+        if _is_number(value):
+            self._numeric -= 1
+            self._sum = self._sum - value if self._numeric > 0 else 0
+
+            if self._minimums[0][0] == sequence:
+                self._minimums.popleft()
+
+            if self._maximums[0][0] == sequence:
+                self._maximums.popleft()
+
+        try:
+            entry = self._values.get(value)
+        except TypeError:
+            return
+
+        entry[0] -= 1
+        if entry[0] == 0:
+            del self._values[value]
+
+        elif entry[1] == timestamp:
+            # Rare: measurements arrived out of order and the newest one with this value was the oldest one added
+            entry[1] = max(t for _, v, t in self._items if v == value)
+
+
+def _is_number(value):
+    """
+    :param value: Measurement value
+    :return: True if the value counts toward the mean, minimum, and maximum
+    """
+    return isinstance(value, (int, float))
+
+
+# Logger of the Device class
+_logger = utilities.LoggerHandle(f"{__name__}.Device")
+
+
+class MeasurementHistory(list):
+    """
+    Measurement history for a single parameter, newest measurements at index 0
+    [ ( newest_value, newest_timestamp ), ( value, timestamp ), ... ]
+
+    This is still a list, so everything that reads self.measurements[name] keeps working.
+    It adds an index of { timestamp: [values] } to detect duplicate measurements without scanning the history,
+    running statistics that are updated as measurements are added and trimmed,
+    and trims old measurements from the oldest end of the list.
+    The index and statistics aren't saved with the bot's variables, they are rebuilt on demand.
+    Any other change to the list, through its list methods or by assigning items, rebuilds them the next time they're used.
+    """
+
+    def __init__(self, measurements=()):
+        list.__init__(self, measurements)
+        self._index = None
+        self._statistics = {}
+        self._statistics_stale = False
+
+    def __reduce__(self):
+        return (self.__class__, (list(self),))
+
+    def __setitem__(self, key, value):
+        list.__setitem__(self, key, value)
+        self._invalidate()
+
+    def __delitem__(self, key):
+        list.__delitem__(self, key)
+        self._invalidate()
+
+    def __iadd__(self, other):
+        list.__iadd__(self, other)
+        self._invalidate()
+        return self
+
+    def __imul__(self, other):
+        list.__imul__(self, other)
+        self._invalidate()
+        return self
+
+    def append(self, item):
+        list.append(self, item)
+        self._invalidate()
+
+    def extend(self, items):
+        list.extend(self, items)
+        self._invalidate()
+
+    def insert(self, position, item):
+        list.insert(self, position, item)
+        self._invalidate()
+
+    def pop(self, position=-1):
+        item = list.pop(self, position)
+        self._invalidate()
+        return item
+
+    def remove(self, item):
+        list.remove(self, item)
+        self._invalidate()
+
+    def clear(self):
+        list.clear(self)
+        self._invalidate()
+
+    def reverse(self):
+        list.reverse(self)
+        self._invalidate()
+
+    def sort(self, *args, **kwargs):
+        list.sort(self, *args, **kwargs)
+        self._invalidate()
+
+    def contains(self, value, timestamp):
+        """
+        :param value: Measurement value
+        :param timestamp: Measurement timestamp in milliseconds
+        :return: True if we already have this measurement
+        """
+        return value in self._timestamps().get(timestamp, ())
+
+    def add(self, value, timestamp):
+        """
+        Add a new measurement as the newest measurement
+        :param value: Measurement value
+        :param timestamp: Measurement timestamp in milliseconds
+        """
+        index = self._timestamps()
+        statistics = self._current_statistics()
+        list.insert(self, 0, (value, timestamp))
+        index.setdefault(timestamp, []).append(value)
+
+        for window_statistics in statistics.values():
+            window_statistics.add(value, timestamp)
+
+    def trim(self, minimum, oldest_timestamp_ms):
+        """
+        Remove measurements older than the given timestamp, starting from the oldest, while keeping a minimum number of measurements
+        :param minimum: Minimum number of measurements to keep
+        :param oldest_timestamp_ms: Measurements at or before this timestamp are removed
+        :return: List of removed measurements
+        """
+        index = self._timestamps()
+        statistics = self._current_statistics()
+        removed = []
+        while len(self) > minimum and self[-1][TIMESTAMP] <= oldest_timestamp_ms:
+            value, timestamp = list.pop(self)
+            values = index[timestamp]
+            values.remove(value)
+            if len(values) == 0:
+                del index[timestamp]
+            removed.append((value, timestamp))
+
+        if len(removed) > 0:
+            for window_statistics in statistics.values():
+                window_statistics.drop(len(removed))
+        return removed
+
+    def statistics(self, window_ms=None):
+        """
+        Running statistics of this history, which are kept up to date from now on as measurements are added and trimmed
+        :param window_ms: Only include measurements within this many milliseconds of the newest one, or None for every measurement
+        :return: MeasurementStatistics
+        """
+        statistics = self._current_statistics()
+        if window_ms not in statistics:
+            statistics[window_ms] = self._build_statistics(window_ms)
+        return statistics[window_ms]
+
+    def _current_statistics(self):
+        """
+        :return: Dictionary of { window_ms: MeasurementStatistics }, rebuilt if the list was modified directly
+        """
+        if self._statistics_stale:
+            for window_ms in self._statistics:
+                self._statistics[window_ms] = self._build_statistics(window_ms)
+            self._statistics_stale = False
+        return self._statistics
+
+    def _build_statistics(self, window_ms):
+        """
+        :param window_ms: Time window in milliseconds, or None
+        :return: MeasurementStatistics of the measurements in this list
+        """
+        statistics = MeasurementStatistics(window_ms)
+        for value, timestamp in reversed(self):
+            statistics.add(value, timestamp)
+        return statistics
+
+    def _timestamps(self):
+        """
+        :return: Index of { timestamp: [values] }, rebuilt if the list was modified directly
+        """
+        if self._index is None:
+            self._index = {}
+            for value, timestamp in self:
+                self._index.setdefault(timestamp, []).append(value)
+        return self._index
+
+    def _invalidate(self):
+        """
+        The list was modified directly, rebuild the index and statistics the next time they're used
+        """
+        self._index = None
+        self._statistics_stale = True
+
+
 class Device:
     """
     This is a base class for each of our devices
@@ -68,6 +424,10 @@ class Device:
     # List of Device Types this class is compatible with - Specify in sub-classes
     DEVICE_TYPES = []
 
+    # Running statistics of measurements, updated as measurements are added - Extend in sub-classes
+    # { param_name: [ window_ms, ... ] }, where a window of None covers every cached measurement of the parameter
+    MEASUREMENT_STATISTICS = {}
+
     def __init__(
         self,
         botengine,
@@ -98,7 +458,7 @@ class Device:
         # Device description
         self.description = device_description.strip()
 
-        # Measurements for each parameter, newest measurements at index 0
+        # Measurements for each parameter as a MeasurementHistory, newest measurements at index 0
         # self.measurements["parameterName"] = [ ( newest_value, newest_timestamp ), ( value, timestamp ), ... ]
         self.measurements = {}
 
@@ -194,6 +554,9 @@ class Device:
         # Every device gets a dictionary of intelligence modules, and can populate these intelligence modules in each device model
         self.intelligence_modules = {}
 
+        # Fingerprint of the declared device microservices this device last synchronized with
+        self.synchronized_fingerprint = None
+
         # User ID associated with this device.  Used for communications and device association. Left empty for anonymous users.
         self.user_id = None
 
@@ -220,7 +583,7 @@ class Device:
 
         :param botengine: BotEngine environment
         """
-        botengine.get_logger(f"{__name__}.{__class__.__name__}").debug(">new_version() device_id={}".format(self.device_id))
+        _logger.get(botengine).debug(">new_version() device_id={}".format(self.device_id))
         
         # Added January 23, 2025
         if not hasattr(self, "minimum_measurements_to_cache_by_parameter_name"):
@@ -248,23 +611,21 @@ class Device:
                     botengine, (time.time() - t) * 1000
                 )
             except Exception as e:
-                botengine.get_logger(f"{__name__}.{__class__.__name__}").warning(
+                _logger.get(botengine).warning(
                     "location.py - Error delivering new_version to device microservice (continuing execution): "
                     + str(e)
                 )
                 import traceback
 
-                botengine.get_logger(f"{__name__}.{__class__.__name__}").error(
-                    traceback.format_exc()
-                )
-        botengine.get_logger(f"{__name__}.{__class__.__name__}").debug("<new_version()")
+                _logger.get(botengine).error(traceback.format_exc())
+        _logger.get(botengine).debug("<new_version()")
 
     def initialize(self, botengine):
         """
         Initialize this object
         :param botengine: BotEngine environment
         """
-        botengine.get_logger(f"{__name__}.{__class__.__name__}").debug(">initialize() device_id={}".format(self.device_id))
+        _logger.get(botengine).debug(">initialize() device_id={}".format(self.device_id))
         # Synchronize device microservices
         self.synchronize_microservices(botengine)
 
@@ -278,7 +639,7 @@ class Device:
             t = time.time()
             microservice_object.initialize(botengine)
             microservice_object.track_statistics(botengine, (time.time() - t) * 1000)
-        botengine.get_logger(f"{__name__}.{__class__.__name__}").debug("<initialize()")
+        _logger.get(botengine).debug("<initialize()")
 
     def destroy(self, botengine):
         """
@@ -300,99 +661,76 @@ class Device:
     
     def synchronize_microservices(self, botengine):
         """
-        Synchronize device microservices
+        Synchronize device microservices.
+        Nothing happens while the microservices declared for this device type still have the fingerprint they had
+        when this device last synchronized with all of them, which is every execution except the first one after a bot upgrade.
         :param botengine: BotEngine environment
         """
-        botengine.get_logger(f"{__name__}.{__class__.__name__}").debug(">synchronize_microservices()")
-        if str(self.device_type) in index.MICROSERVICES.get("DEVICE_MICROSERVICES", {}):
-            # Synchronize microservices
-            changed = False
-
-            module_names = [
-                x["module"]
-                for x in index.MICROSERVICES["DEVICE_MICROSERVICES"][
-                    str(self.device_type)
-                ]
-            ]
-
-            for m in module_names:
-                changed |= m not in self.intelligence_modules
-
-            for m in list(self.intelligence_modules.keys()):
-                changed |= m not in module_names
-
-            if changed:
-                # Remove microservices that no longer exist
-                delete = []
-                for module_name in self.intelligence_modules.keys():
-                    found = False
-                    for intelligence_info in index.MICROSERVICES[
-                        "DEVICE_MICROSERVICES"
-                    ][str(self.device_type)]:
-                        if intelligence_info["module"] == module_name:
-                            found = True
-                            break
-
-                    if not found:
-                        botengine.get_logger(f"{__name__}.{__class__.__name__}").debug(
-                            "|synchronize_microservices() \tDeleting device microservice: " + str(module_name)
+        fingerprint, declared_modules = manifest.device_table(self.device_type)
+        if getattr(self, "synchronized_fingerprint", None) == fingerprint and len(
+            self.intelligence_modules
+        ) == len(declared_modules):
+            return
+
+        _logger.get(botengine).debug(">synchronize_microservices()")
+        if len(declared_modules) == 0:
+            if len(self.intelligence_modules) > 0:
+                # There are no intelligence modules for this device type, and yet we have some intelligence modules locally. Delete everything.
+                _logger.get(botengine).debug(
+                    "|synchronize_microservices()\tDeleting all device microservices"
+                )
+                self.intelligence_modules = {}
+
+        elif len(self.intelligence_modules) != len(declared_modules) or any(
+            module_name not in self.intelligence_modules for module_name in declared_modules
+        ):
+            # Remove microservices that no longer exist
+            for module_name in [m for m in self.intelligence_modules if m not in declared_modules]:
+                _logger.get(botengine).debug(
+                    "|synchronize_microservices() \tDeleting device microservice: " + str(module_name)
+                )
+                del self.intelligence_modules[module_name]
+
+            # Add more microservices
+            for module_name, intelligence_info in declared_modules.items():
+                if module_name not in self.intelligence_modules:
+                    try:
+                        intelligence_module = importlib.import_module(module_name)
+                        class_ = getattr(intelligence_module, intelligence_info["class"])
+                        _logger.get(botengine).debug(
+                            "|synchronize_microservices() \tAdding device microservice: " + str(module_name)
                         )
-                        delete.append(module_name)
-
-                for d in delete:
-                    del self.intelligence_modules[d]
-
-                # Add more microservices
-                for intelligence_info in index.MICROSERVICES["DEVICE_MICROSERVICES"][
-                    str(self.device_type)
-                ]:
-                    botengine.get_logger(f"{__name__}.{__class__.__name__}").debug(
-                        "|synchronize_microservices() \tChecking device microservice: "
-                        + intelligence_info["module"]
-                    )
-                    if intelligence_info["module"] not in self.intelligence_modules:
-                        try:
-                            intelligence_module = importlib.import_module(
-                                intelligence_info["module"]
-                            )
-                            class_ = getattr(
-                                intelligence_module, intelligence_info["class"]
+                        intelligence_object = class_(botengine, self)
+                        self.intelligence_modules[module_name] = intelligence_object
+                    except Exception as e:
+                        import traceback
+
+                        _logger.get(botengine).error(
+                            "|synchronize_microservices() Could not add device microservice: {}: {}; {}".format(
+                                str(intelligence_info),
+                                str(e),
+                                traceback.format_exc(),
                             )
-                            botengine.get_logger(
-                                f"{__name__}.{__class__.__name__}"
-                            ).debug(
-                                "|synchronize_microservices() \tAdding device microservice: "
-                                + str(intelligence_info["module"])
-                            )
-                            intelligence_object = class_(botengine, self)
-                            self.intelligence_modules[intelligence_info["module"]] = (
-                                intelligence_object
-                            )
-                        except Exception as e:
-                            import traceback
-
-                            botengine.get_logger(
-                                f"{__name__}.{__class__.__name__}"
-                            ).error(
-                                "|synchronize_microservices() Could not add device microservice: {}: {}; {}".format(
-                                    str(intelligence_info),
-                                    str(e),
-                                    traceback.format_exc(),
-                                )
-                            )
-                            if botengine.playback:
-                                import time
+                        )
+                        if botengine.playback:
+                            import time
 
-                                time.sleep(10)
+                            time.sleep(10)
 
-        elif len(self.intelligence_modules) > 0:
-            # There are no intelligence modules for this device type, and yet we have some intelligence modules locally. Delete everything.
-            botengine.get_logger(f"{__name__}.{__class__.__name__}").debug(
-                "|synchronize_microservices()\tDeleting all device microservices"
-            )
-            self.intelligence_modules = {}
-        botengine.get_logger(f"{__name__}.{__class__.__name__}").debug("<synchronize_microservices()"
-        )
+        # Microservices that failed to load are tried again on the next execution
+        if len(self.intelligence_modules) == len(declared_modules):
+            self.synchronized_fingerprint = fingerprint
+
+        _logger.get(botengine).debug("<synchronize_microservices()")
+
+    def get_logger(self, botengine):
+        """
+        Logger named after this device's class, resolved once per class instead of on every log line.
+        Use it instead of botengine.get_logger(f"{__name__}.{__class__.__name__}").
+        :param botengine: BotEngine environment
+        :return: Logger handle
+        """
+        return utilities.get_class_logger(botengine, self.__class__)
 
     def get_device_type_name(self):
         """
@@ -485,7 +823,7 @@ class Device:
         :param alert_type: Type of alert
         :param alert_params: Dictionary of alert parameters
         """
-        botengine.get_logger(f"{__name__}.{__class__.__name__}").debug(
+        _logger.get(botengine).debug(
             ">device_alert() device_id={} alert_type={}".format(
                 self.device_id, alert_type
             )
@@ -535,20 +873,20 @@ class Device:
 
         except Exception as e:
             # This can happen because this bot may not have read permissions for this device.
-            botengine.get_logger(f"{__name__}.{__class__.__name__}").info(
+            _logger.get(botengine).info(
                 "Cannot synchronize measurements for device {} '{}': {}".format(
                     self.description, self.device_id, e
                 )
             )
             return
 
-        botengine.get_logger(f"{__name__}.{__class__.__name__}").info(
+        _logger.get(botengine).info(
             "Synchronizing measurements for device: " + str(self.description)
         )
         if "measures" in measurements:
             for measure in measurements["measures"]:
                 if "value" not in measure:
-                    botengine.get_logger(f"{__name__}.{__class__.__name__}").error(
+                    _logger.get(botengine).error(
                         "device.py: Measurement has no value: " + str(measure)
                     )
                     continue
@@ -601,13 +939,13 @@ class Device:
         #                     if 'time' in measure:
         #                         if not measure['updated'] and measure['time'] == self.measurements[param_name][NEWEST_MEASUREMENT][TIMESTAMP]:
         #                             # Nothing to update
-        #                             botengine.get_logger(f"{__name__}.{__class__.__name__}").info(utilities.Color.GREEN + "\tSAME:      {} @ {} = {}".format(param_name, measure['time'], measure['value']) + utilities.Color.END)
+        #                             _logger.get(botengine).info(utilities.Color.GREEN + "\tSAME:      {} @ {} = {}".format(param_name, measure['time'], measure['value']) + utilities.Color.END)
         #                             continue
 
         #             if measure['updated']:
-        #                 botengine.get_logger(f"{__name__}.{__class__.__name__}").info(utilities.Color.GREEN + "\tUPDATED:   {} @ {} = {}".format(param_name, measure['time'], measure['value']) + utilities.Color.END)
+        #                 _logger.get(botengine).info(utilities.Color.GREEN + "\tUPDATED:   {} @ {} = {}".format(param_name, measure['time'], measure['value']) + utilities.Color.END)
         #             else:
-        #                 botengine.get_logger(f"{__name__}.{__class__.__name__}").info(utilities.Color.GREEN + "\tTIME DIFF: {} @ {} = {}".format(param_name, measure['time'], measure['value']) + utilities.Color.END)
+        #                 _logger.get(botengine).info(utilities.Color.GREEN + "\tTIME DIFF: {} @ {} = {}".format(param_name, measure['time'], measure['value']) + utilities.Color.END)
 
         if measures is not None:
             for measure in measures:
@@ -662,7 +1000,7 @@ class Device:
                 updated_devices += d
                 updated_metadata += m
 
-        botengine.get_logger(f"{__name__}.{__class__.__name__}").info(
+        _logger.get(botengine).info(
             "Updated '{}' with params: {}".format(
                 self.description,
                 [
@@ -731,56 +1069,41 @@ class Device:
         :param timestamp: Timestamp in milliseconds
         :return:
         """
-        botengine.get_logger(f"{__name__}.{__class__.__name__}").debug(
-            ">add_measurement()"
-        )
-        botengine.get_logger(f"{__name__}.{__class__.__name__}").debug(
+        _logger.get(botengine).debug(">add_measurement()")
+        _logger.get(botengine).debug(
             "|add_measurement() device_id={} name={} value={} timestamp={}".format(
                 self.device_id, name, value, timestamp
             )
         )
         measurement_updated = False
-        if name not in self.measurements:
-            # Create the measurement
-            self.measurements[name] = []
-
+        history = self.measurements.get(name)
+        if not isinstance(history, MeasurementHistory):
+            # Create the measurement, or upgrade a history saved as a plain list
+            history = MeasurementHistory(history or [])
+            self.measurements[name] = history
+
+        if history.contains(value, timestamp):
+            _logger.get(botengine).debug(
+                "|add_measurement() \tAlready have this measurement: {}".format(
+                    (value, timestamp)
+                )
+            )
+        else:
             measurement_updated = True
             self.measurement_odometer += 1
-            self.measurements[name].insert(0, (value, timestamp))
-        else:
-            is_new_measurement = True
-            for i in range(len(self.measurements[name])):
-                if (
-                    value == self.measurements[name][i][0]
-                    and timestamp == self.measurements[name][i][1]
-                ):
-                    botengine.get_logger(f"{__name__}.{__class__.__name__}").debug(
-                        "|add_measurement() \tAlready have this measurement: {}".format(
-                            self.measurements[name][i]
-                        )
-                    )
-                    is_new_measurement = False
-                    break
-
-            if is_new_measurement:
-                measurement_updated = True
-                self.measurement_odometer += 1
-                self.measurements[name].insert(0, (value, timestamp))
+            history.add(value, timestamp)
+            confirm_reliable_command(botengine, self.device_id, name, value, timestamp)
 
         # Auto garbage-collect
         if self.enforce_cache_size:
-            for param_name in self.measurements:
-                botengine.get_logger(f"{__name__}.{__class__.__name__}").debug("|add_measurement() name={} minimum={}".format(param_name, self.minimum_measurements_to_cache_by_parameter_name.get(param_name, MINIMUM_MEASUREMENTS_TO_CACHE)))
-
-                for measurement in self.measurements[param_name]:
-                    botengine.get_logger(f"{__name__}.{__class__.__name__}").debug("|add_measurement() \tmeasurement={}".format(measurement))
-            while (len(self.measurements[name]) > self.minimum_measurements_to_cache_by_parameter_name.get(name, MINIMUM_MEASUREMENTS_TO_CACHE)) and self.measurements[name][-1][
-                1
-            ] <= botengine.get_timestamp() - TOTAL_DURATION_TO_CACHE_MEASUREMENTS_MS:
-                botengine.get_logger(f"{__name__}.{__class__.__name__}").debug("|add_measurement() \tGarbage collecting measurement: {}".format(self.measurements[name][-1]))
-                del self.measurements[name][-1]
-
-        botengine.get_logger(f"{__name__}.{__class__.__name__}").debug(
+            removed = history.trim(
+                self.minimum_measurements_to_cache_by_parameter_name.get(name, MINIMUM_MEASUREMENTS_TO_CACHE),
+                botengine.get_timestamp() - TOTAL_DURATION_TO_CACHE_MEASUREMENTS_MS,
+            )
+            if len(removed) > 0:
+                _logger.get(botengine).debug("|add_measurement() \tGarbage collected {} measurements: {}".format(len(removed), removed))
+
+        _logger.get(botengine).debug(
             "<add_measurement() updated={}".format(measurement_updated)
         )
         return measurement_updated
@@ -818,6 +1141,36 @@ class Device:
             return self.measurements[param_name]
         return None
 
+    def get_measurement_statistics(self, botengine, param_name, window_ms=None):
+        """
+        Running statistics of the cached measurements of a parameter declared in MEASUREMENT_STATISTICS.
+        They're built the first time they're requested in an execution, then kept up to date by add_measurement().
+        :param botengine: BotEngine environment
+        :param param_name: Parameter name
+        :param window_ms: Only include measurements from the last window_ms milliseconds, or None for every cached measurement
+        :return: MeasurementStatistics, or None if the measurement doesn't exist
+        """
+        if window_ms not in self.MEASUREMENT_STATISTICS.get(param_name, []):
+            raise ValueError(
+                "{} doesn't declare statistics for '{}' with window_ms={}".format(
+                    self.__class__.__name__, param_name, window_ms
+                )
+            )
+
+        history = self.measurements.get(param_name)
+        if history is None:
+            return None
+
+        if not isinstance(history, MeasurementHistory):
+            # Upgrade a history saved as a plain list
+            history = MeasurementHistory(history)
+            self.measurements[param_name] = history
+
+        statistics = history.statistics(window_ms)
+        if window_ms is not None:
+            statistics.expire(botengine.get_timestamp())
+        return statistics
+
     # ===========================================================================
     # Device health
     # ===========================================================================
@@ -939,14 +1292,14 @@ class Device:
             try:
                 space_type = int(space_description_or_type)
             except Exception:
-                botengine.get_logger(f"{__name__}.{__class__.__name__}").error(
+                _logger.get(botengine).error(
                     "device.is_in_space(): Couldn't identify what space type you're talking about - {}".format(
                         space_description_or_type
                     )
                 )
                 return False
 
-        botengine.get_logger(f"{__name__}.{__class__.__name__}").debug(
+        _logger.get(botengine).debug(
             "device.is_in_space(): Checking for space type {} in {}".format(space_type, self.spaces)
         )
         for space in self.spaces:
@@ -975,7 +1328,7 @@ class Device:
                     space_types.append(space_type)
 
                 except Exception:
-                    botengine.get_logger(f"{__name__}.{__class__.__name__}").error(
+                    _logger.get(botengine).error(
                         "device.is_in_spaces(): Couldn't identify what space type you're talking about - {}".format(
                             s
                         )
@@ -1026,7 +1379,7 @@ class Device:
         :param ordered:
         :return:
         """
-        botengine.get_logger(f"{__name__}.{__class__.__name__}").debug(
+        _logger.get(botengine).debug(
             "{}: request_data() - Requesting data from {} to {} for parameters {}".format(
                 self.description,
                 oldest_timestamp_ms,
@@ -1065,18 +1418,96 @@ class Device:
             botengine --download_device <device_id>
             botengine --download_type <device_type>
 
+        The whole .csv string is held in memory. Use write_csv() to export long ranges.
+
         :param botengine: BotEngine environment
         :param oldest_timestamp_ms: oldest timestamp in milliseconds
         :param newest_timestamp_ms: newest timestamp in milliseconds
         :param params: List of parameters
         :return: .csv string, largely matching the .csv data you would receive from the "botengine --download_device [device_id]" command line interface. Or None if this device doesn't have data.
         """
-        if len(self.measurements) == 0:
-            botengine.get_logger(f"{__name__}.{__class__.__name__}").info(
-                "{}: get_csv() - This device has no measurements"
+        import io
+
+        output = io.StringIO(newline="")
+        if (
+            self.write_csv(
+                botengine,
+                output,
+                oldest_timestamp_ms=oldest_timestamp_ms,
+                newest_timestamp_ms=newest_timestamp_ms,
+                params=params,
             )
+            is None
+        ):
             return None
 
+        return output.getvalue()
+
+    def write_csv(
+        self,
+        botengine,
+        sink,
+        oldest_timestamp_ms=None,
+        newest_timestamp_ms=None,
+        params=[],
+        compress=False,
+    ):
+        """
+        Write the same .csv content as get_csv() to a file-like sink, one row at a time as measurements are downloaded
+        :param botengine: BotEngine environment
+        :param sink: Text file-like object opened with newline="", or a binary file-like object when compressing
+        :param oldest_timestamp_ms: oldest timestamp in milliseconds
+        :param newest_timestamp_ms: newest timestamp in milliseconds
+        :param params: List of parameters
+        :param compress: True to write an lz4 frame of the .csv content
+        :return: Number of rows written including the header, or None if this device doesn't have data or the download failed
+        """
+        rows = self.iterate_csv(
+            botengine,
+            oldest_timestamp_ms=oldest_timestamp_ms,
+            newest_timestamp_ms=newest_timestamp_ms,
+            params=params,
+        )
+        header = next(rows, None)
+        if header is None:
+            return None
+
+        import itertools
+
+        try:
+            count = utilities.write_csv(sink, itertools.chain([header], rows), compress=compress)
+
+        except Exception as e:
+            # This can happen because this bot may not have read permissions for this device.
+            _logger.get(botengine).warning(
+                "{}: write_csv() - Cannot download measurements: {}".format(self.description, e)
+            )
+            return None
+
+        _logger.get(botengine).info(
+            "{}: write_csv() - Wrote {} measurements".format(self.description, count - 1)
+        )
+        return count
+
+    def iterate_csv(
+        self, botengine, oldest_timestamp_ms=None, newest_timestamp_ms=None, params=[]
+    ):
+        """
+        Generator of the .csv rows of get_csv(), header first.
+        Measurements are downloaded a calendar month at a time as the rows are consumed, in the order they were
+        measured, and only the last measurement at each timestamp is kept.
+        :param botengine: BotEngine environment
+        :param oldest_timestamp_ms: oldest timestamp in milliseconds
+        :param newest_timestamp_ms: newest timestamp in milliseconds
+        :param params: List of parameters
+        :return: Generator of rows, each a list of values. Nothing is generated if this device doesn't have data.
+        """
+        if len(self.measurements) == 0:
+            _logger.get(botengine).info(
+                "{}: iterate_csv() - This device has no measurements".format(self.description)
+            )
+            return
+
         if params:
             titles = sorted(params)
         else:
@@ -1093,81 +1524,82 @@ class Device:
         # Check to see that all the parameters we're requesting have valid measurements in this device object
         # Remember that an index number will modify the name of the parameter to make it unique, and we need to match against the unique name of each parameter
         if not set(params).issubset(last_measurements.keys()):
-            botengine.get_logger(f"{__name__}.{__class__.__name__}").info(
-                "{}: get_csv() - Not all of the requested parameters exist for this device"
+            _logger.get(botengine).info(
+                "{}: iterate_csv() - Not all of the requested parameters exist for this device".format(
+                    self.description
+                )
             )
-            return None
-
-        output = "device_type,device_id,description,timestamp_ms,timestamp_iso,"
+            return
 
-        for t in titles:
-            output = "{}{},".format(output, t)
+        # Every row ends with a separator, like the botengine --download_device output
+        yield ["device_type", "device_id", "description", "timestamp_ms", "timestamp_iso"] + titles + [""]
 
-        output += "\n"
+        # Rows are generated in chronological order. iterate_measurements() already generates measurements oldest first.
+        if oldest_timestamp_ms is None:
+            measures = botengine.get_measurements(
+                self.device_id,
+                newest_timestamp_ms=newest_timestamp_ms,
+                param_name=params,
+            ).get("measures", [])
 
-        try:
-            measurements = botengine.get_measurements(
+            # The sort is stable, so the last measurement at each timestamp is still the one kept
+            measures.sort(key=lambda measure: int(measure["time"]))
+        else:
+            measures = botengine.iterate_measurements(
                 self.device_id,
-                oldest_timestamp_ms=oldest_timestamp_ms,
+                oldest_timestamp_ms,
                 newest_timestamp_ms=newest_timestamp_ms,
                 param_name=params,
             )
 
-        except Exception:
-            # This can happen because this bot may not have read permissions for this device.
-            # botengine.get_logger(f"{__name__}.{__class__.__name__}").warning("Cannot synchronize measurements for device: " + str(self.description))
-            return None
+        device_id = self.device_id.replace(",", "_")
+        description = self.description.replace(",", "_")
 
-        processed_readings = {}
-        if "measures" in measurements:
-            for measure in measurements["measures"]:
-                if "value" not in measure:
-                    continue
-
-                value = utilities.normalize_measurement(measure["value"])
-                param_name = measure["name"]
-                time = int(measure["time"])
-
-                # If there's an index number, we just augment the parameter name with the index number to make it a unique parameter name.  param_name.index
-                if "index" in measure:
-                    if measure["index"] is not None:
-                        if str(measure["index"]).lower() != "none":
-                            param_name = "{}.{}".format(param_name, measure["index"])
+        # The reading at the timestamp being collected, which a later measurement at the same timestamp replaces
+        pending = None
+        for measure in measures:
+            if "value" not in measure:
+                continue
 
-                processed_readings[time] = (param_name, value)
+            param_name = measure["name"]
+            time = int(measure["time"])
 
-        measurements = None
-        import gc
+            # If there's an index number, we just augment the parameter name with the index number to make it a unique parameter name.  param_name.index
+            if "index" in measure:
+                if measure["index"] is not None:
+                    if str(measure["index"]).lower() != "none":
+                        param_name = "{}.{}".format(param_name, measure["index"])
 
-        gc.collect()
-
-        botengine.get_logger(f"{__name__}.{__class__.__name__}").info(
-            "{}: get_csv() - Processing {} measurements ...".format(
-                self.description, str(len(processed_readings))
-            )
-        )
+            if pending is not None and pending[0] != time:
+                yield self._csv_row(botengine, device_id, description, titles, last_measurements, *pending)
 
-        for timestamp_ms in sorted(processed_readings.keys()):
-            dt = self.location_object.get_local_datetime_from_timestamp(
-                botengine, timestamp_ms
-            )
-            output += "{},{},{},{},{},".format(
-                self.device_type,
-                self.device_id.replace(",", "_"),
-                self.description.replace(",", "_"),
-                timestamp_ms,
-                utilities.iso_format(dt),
-            )
+            pending = (time, param_name, utilities.normalize_measurement(measure["value"]))
 
-            for t in titles:
-                if t == processed_readings[timestamp_ms][0]:
-                    output += "{},".format(processed_readings[timestamp_ms][1])
-                else:
-                    output += "{},".format(last_measurements[t])
+        if pending is not None:
+            yield self._csv_row(botengine, device_id, description, titles, last_measurements, *pending)
 
-            output += "\n"
+    def _csv_row(self, botengine, device_id, description, titles, last_measurements, timestamp_ms, param_name, value):
+        """
+        :param botengine: BotEngine environment
+        :param device_id: Device ID safe for a .csv column
+        :param description: Description safe for a .csv column
+        :param titles: Parameter names of the columns
+        :param last_measurements: { param_name: value } for the columns of other parameters
+        :param timestamp_ms: Timestamp of the reading
+        :param param_name: Parameter name of the reading
+        :param value: Value of the reading
+        :return: .csv row
+        """
+        dt = self.location_object.get_local_datetime_from_timestamp(botengine, timestamp_ms)
+        row = [self.device_type, device_id, description, timestamp_ms, utilities.iso_format(dt)]
+        for t in titles:
+            if t == param_name:
+                row.append(value)
+            else:
+                row.append(last_measurements[t])
 
-        return output
+        row.append("")
+        return row
 
     def sorted_intelligence_modules(self):
         """
@@ -1201,38 +1633,43 @@ class Device:
 
 def send_command_reliably(botengine, device_id, param_name, param_value):
     """
-    Send a command reliably
+    Send a command reliably.
+
+    The command is sent now, then sent again every TIME_BETWEEN_ATTEMPTS_SEC seconds until a measurement from the device
+    confirms it or MAX_ATTEMPTS is reached. Sending the value that is already pending for this parameter does nothing,
+    so repeated writes within an execution are coalesced into one command.
+
     :param botengine: BotEngine
     :param device_id: Device ID to send the command to
     :param param_name: Parameter name
     :param param_value: Parameter value
     """
+    queue = _load_reliability_queue(botengine, create=True)
+
+    # queue[device_id] = {'param_name': ('param_value', attempts, timestamp)}
+    commands = queue.setdefault(device_id, {})
+    if param_name in commands:
+        if commands[param_name][0] == param_value:
+            # Already pending, no need to send it again or update the timestamp
+            return
+
     botengine.get_logger(f"{__name__}").info(
         "{}: Send command reliably".format(device_id)
     )
-    queue = botengine.load_variable(RELIABILITY_VARIABLE_NAME)
-    if queue is None:
-        queue = {}
-
-    if device_id not in queue:
-        queue[device_id] = {}
-
     botengine.send_commands(
         device_id, [botengine.form_command(param_name, param_value)]
     )
-    botengine.cancel_timers(device_id)
-    botengine.start_timer(
-        TIME_BETWEEN_ATTEMPTS_SEC, _attempt_reliable_delivery, None, "reliability"
-    )
 
-    # queue[device_id] = {'param_name': ('param_value', attempts, timestamp)}
-    if param_name in queue[device_id]:
-        if queue[device_id][param_name][0] == param_value:
-            # No need to update the timestamp
-            return
+    commands[param_name] = (param_value, 0, botengine.get_timestamp())
+    _save_reliability_queue(botengine, queue)
 
-    queue[device_id][param_name] = (param_value, 0, botengine.get_timestamp())
-    botengine.save_variable(RELIABILITY_VARIABLE_NAME, queue)
+    if not botengine.is_timer_running(RELIABILITY_TIMER_REFERENCE):
+        botengine.start_timer(
+            TIME_BETWEEN_ATTEMPTS_SEC,
+            _attempt_reliable_delivery,
+            None,
+            RELIABILITY_TIMER_REFERENCE,
+        )
 
 
 def cancel_reliable_command(botengine, device_id, param_name):
@@ -1243,18 +1680,44 @@ def cancel_reliable_command(botengine, device_id, param_name):
     :param param_name: Parameter name to cancel.
     :return:
     """
-    queue = botengine.load_variable(RELIABILITY_VARIABLE_NAME)
-    if queue is None:
+    queue = _load_reliability_queue(botengine)
+    if queue is None or param_name not in queue.get(device_id, {}):
         return
 
-    if device_id in queue:
-        if param_name in queue[device_id]:
-            del queue[device_id][param_name]
+    _remove_reliable_command(queue, device_id, param_name)
+    _save_reliability_queue(botengine, queue)
 
-        if len(queue[device_id]) == 0:
-            del queue[device_id]
 
-    botengine.save_variable(RELIABILITY_VARIABLE_NAME, queue)
+def confirm_reliable_command(botengine, device_id, param_name, param_value, timestamp):
+    """
+    Stop sending a command reliably once a measurement from the device shows it was delivered.
+    Device.add_measurement() calls this for every new measurement, so it only does a few dictionary lookups when the
+    measurement doesn't confirm anything, and nothing at all on bots that never sent a command reliably.
+    :param botengine: BotEngine environment
+    :param device_id: Device ID
+    :param param_name: Parameter name of the measurement
+    :param param_value: Measured value
+    :param timestamp: Measurement timestamp in milliseconds
+    :return: True if the measurement confirmed a queued command
+    """
+    queue = _load_reliability_queue(botengine)
+    if queue is None:
+        return False
+
+    command = queue.get(device_id, {}).get(param_name)
+    if command is None:
+        return False
+
+    (value, attempts, sent_timestamp) = command
+    if timestamp < sent_timestamp or not _is_delivered(value, param_value):
+        return False
+
+    botengine.get_logger(f"{__name__}").debug(
+        "RELIABILITY: {}: {} = {} has been delivered reliably".format(device_id, param_name, value)
+    )
+    _remove_reliable_command(queue, device_id, param_name)
+    _save_reliability_queue(botengine, queue)
+    return True
 
 
 def queued_commands_for_device(botengine, device_id):
@@ -1263,68 +1726,39 @@ def queued_commands_for_device(botengine, device_id):
     Basically if this response isn't empty, then there are commands in the queue that haven't been verified yet.
     :return: Dictionary of commands in the queue, or a blank dictionary {} if there are no commands or the device isn't found
     """
-    queue = botengine.load_variable(RELIABILITY_VARIABLE_NAME)
-
-    if queue is not None:
-        if device_id in queue:
-            return queue[device_id]
+    queue = _load_reliability_queue(botengine)
+    if queue is None:
+        return {}
 
-    return {}
+    return queue.get(device_id, {})
 
 
 def _attempt_reliable_delivery(botengine, args):
     """
     Attempt reliable delivery of everything in our queue
     This is executed by a timer.
-    """
-    botengine.get_logger(f"{__name__}").info(">reliability")
-    queue = botengine.load_variable(RELIABILITY_VARIABLE_NAME)
-    if queue is None:
-        return
 
+    Commands confirmed by measurements that arrived since the last attempt are already gone. Each device with commands
+    left is asked once for the measurements it reported since its oldest pending command, and everything still
+    unconfirmed is sent again in one batch of commands, which the botengine flushes in a single request.
+    """
     logger = botengine.get_logger(f"{__name__}")
+    logger.info(">reliability")
 
-    logger.debug("RELIABILITY: Queue looks like " + str(queue))
-
-    import copy
-
-    for device_id in copy.copy(queue):
-        # Prune out all our successfully delivered commands, and commands that have timed out
-        params_to_remove = []
-
-        for param_name in queue[device_id]:
-            (param_value, attempts, timestamp) = queue[device_id][param_name]
-
-            if attempts < MAX_ATTEMPTS:
-                # Check to see if the last attempt went through
-                measures = None
-                try:
-                    measures = botengine.get_measurements(
-                        device_id, param_name=param_name, oldest_timestamp_ms=timestamp
-                    )
-                except Exception:
-                    # No longer have access to the device
-                    params_to_remove.append(param_name)
-
-                logger.debug(
-                    "RELIABILITY: measurements since "
-                    + str(timestamp)
-                    + ": "
-                    + str(measures)
-                )
+    # The timer may have been started before the queue moved into the core variables, so migrate it now
+    queue = _load_reliability_queue(botengine, create=True)
+    if len(queue) == 0:
+        return
 
-                if measures is not None:
-                    if "measures" in measures:
-                        for m in measures["measures"]:
-                            if m["name"] == param_name and m["value"] == param_value:
-                                # Command had been delivered reliably
-                                logger.debug(
-                                    "RELIABILITY: COMMAND HAS BEEN DELIVERED RELIABLY"
-                                )
-                                params_to_remove.append(param_name)
-                                break
+    logger.debug("RELIABILITY: Queue looks like " + str(queue))
 
-            else:
+    now = botengine.get_timestamp()
+    retries = {}
+    for device_id in list(queue):
+        commands = queue[device_id]
+        for param_name in list(commands):
+            (param_value, attempts, timestamp) = commands[param_name]
+            if attempts >= MAX_ATTEMPTS:
                 # TODO log this error somewhere
                 logger.debug(
                     "RELIABILITY: MAXIMUM ATTEMPTS REACHED FOR DEVICE "
@@ -1334,39 +1768,107 @@ def _attempt_reliable_delivery(botengine, args):
                     + "; PARAM_VALUE="
                     + str(param_value)
                 )
-                params_to_remove.append(param_name)
-
-        for param in params_to_remove:
-            if param in queue[device_id]:
-                del queue[device_id][param]
-
-        if len(queue[device_id]) > 0:
-            botengine.cancel_timers("reliability")
-            botengine.start_timer(
-                TIME_BETWEEN_ATTEMPTS_SEC,
-                _attempt_reliable_delivery,
-                None,
-                "reliability",
-            )
+                _remove_reliable_command(queue, device_id, param_name)
 
-            for param_name in queue[device_id]:
-                # Increment our attempts
-                (param_value, attempts, timestamp) = queue[device_id][param_name]
-                attempts += 1
-                queue[device_id][param_name] = (param_value, attempts, timestamp)
-                logger.debug(
-                    "RELIABILITY: Re-sending command to "
-                    + device_id
-                    + ": "
-                    + str(param_name)
-                    + " = "
-                    + str(param_value)
-                )
-                botengine.send_command(device_id, param_name, param_value)
+        if device_id not in queue:
+            continue
 
-        else:
+        # Check to see if the last attempts went through
+        try:
+            measures = botengine.get_measurements(
+                device_id,
+                param_name=list(commands.keys()),
+                oldest_timestamp_ms=min(command[2] for command in commands.values()),
+            )
+        except Exception:
+            # No longer have access to the device
             del queue[device_id]
+            continue
+
+        for m in measures.get("measures", []):
+            if "value" in m:
+                confirm_reliable_command(
+                    botengine,
+                    device_id,
+                    m["name"],
+                    utilities.normalize_measurement(m["value"]),
+                    int(m["time"]),
+                )
+
+        for param_name in list(commands):
+            (param_value, attempts, timestamp) = commands[param_name]
+            if attempts == 0 and now - timestamp < TIME_BETWEEN_ATTEMPTS_SEC * 1000:
+                # Sent recently, wait for the next attempt
+                continue
+
+            commands[param_name] = (param_value, attempts + 1, timestamp)
+            retries.setdefault(device_id, []).append(botengine.form_command(param_name, param_value))
+
+    for device_id, retry_commands in retries.items():
+        logger.debug("RELIABILITY: Re-sending commands to {}: {}".format(device_id, retry_commands))
+        botengine.send_commands(device_id, retry_commands)
+
+    if len(queue) > 0:
+        botengine.cancel_timers(RELIABILITY_TIMER_REFERENCE)
+        botengine.start_timer(
+            TIME_BETWEEN_ATTEMPTS_SEC,
+            _attempt_reliable_delivery,
+            None,
+            RELIABILITY_TIMER_REFERENCE,
+        )
 
     logger.debug("RELIABILITY: Cleaned queue looks like " + str(queue))
+    _save_reliability_queue(botengine, queue)
 
-    botengine.save_variable(RELIABILITY_VARIABLE_NAME, queue)
+
+def _load_reliability_queue(botengine, create=False):
+    """
+    The reliable command queue lives in the core variables of the botengine, so looking it up never downloads anything.
+    Only sending commands reliably creates it, and the first time it's migrated from the separate
+    RELIABILITY_VARIABLE_NAME variable, so bots that never send commands reliably never save it.
+    :param botengine: BotEngine environment
+    :param create: True to create the queue if it doesn't exist yet
+    :return: { device_id: { param_name: (param_value, attempts, timestamp) } }, or None if there is no queue and create is False
+    """
+    queue = (botengine.variables.get(CORE_VARIABLE_NAME) or {}).get(RELIABILITY_QUEUE_VARIABLE_NAME)
+    if queue is None and create:
+        legacy_queue = botengine.load_variable(RELIABILITY_VARIABLE_NAME)
+        queue = legacy_queue or {}
+        if legacy_queue is not None:
+            _save_reliability_queue(botengine, queue)
+            if not botengine.playback:
+                botengine.delete_variable(RELIABILITY_VARIABLE_NAME)
+
+    return queue
+
+
+def _save_reliability_queue(botengine, queue):
+    """
+    :param botengine: BotEngine environment
+    :param queue: Reliable command queue
+    """
+    botengine.save_variable(RELIABILITY_QUEUE_VARIABLE_NAME, queue, required_for_each_execution=True)
+
+
+def _remove_reliable_command(queue, device_id, param_name):
+    """
+    :param queue: Reliable command queue
+    :param device_id: Device ID
+    :param param_name: Parameter name
+    """
+    commands = queue.get(device_id)
+    if commands is None:
+        return
+
+    commands.pop(param_name, None)
+    if len(commands) == 0:
+        del queue[device_id]
+
+
+def _is_delivered(sent_value, measured_value):
+    """
+    :param sent_value: Value sent in the command
+    :param measured_value: Normalized value of a measurement
+    :return: True if the measurement shows the value that was sent
+    """
+    return sent_value == measured_value or str(sent_value) == str(measured_value)
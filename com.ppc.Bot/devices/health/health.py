@@ -64,6 +64,16 @@ class HealthDevice(Device):
     # Device types
     DEVICE_TYPES = []
 
+    # Running statistics of measurements
+    MEASUREMENT_STATISTICS = dict(
+        Device.MEASUREMENT_STATISTICS,
+        **{
+            MEASUREMENT_NAME_HEART_RATE: [None],
+            MEASUREMENT_NAME_HEART_RATE_RESTING: [None],
+            MEASUREMENT_NAME_HR_VARIABILITY: [None],
+        }
+    )
+
     def __init__(
         self,
         botengine,
@@ -171,20 +181,16 @@ class HealthDevice(Device):
 
     def get_average_heart_rate(self, botengine):
         """
-        Retrieve the most recent heart_rate value
+        Retrieve the average of the cached heart rate values
         :param botengine:
-        :return:
+        :return: Average heart rate, or None
         """
-        if HealthDevice.MEASUREMENT_NAME_HEART_RATE in self.measurements:
-            from statistics import mean
-
-            return mean(
-                [
-                    x[0]
-                    for x in self.measurements[HealthDevice.MEASUREMENT_NAME_HEART_RATE]
-                ]
-            )
-        return None
+        statistics = self.get_measurement_statistics(
+            botengine, HealthDevice.MEASUREMENT_NAME_HEART_RATE
+        )
+        if statistics is None:
+            return None
+        return statistics.mean()
 
     def did_update_heart_rate_resting(self, botengine):
         """
@@ -210,22 +216,16 @@ class HealthDevice(Device):
 
     def get_average_heart_rate_resting(self, botengine):
         """
-        Retrieve the most recent heart rate resting value
+        Retrieve the average of the cached heart rate resting values
         :param botengine:
-        :return:
+        :return: Average heart rate resting, or None
         """
-        if HealthDevice.MEASUREMENT_NAME_HEART_RATE_RESTING in self.measurements:
-            from statistics import mean
-
-            return mean(
-                [
-                    x[0]
-                    for x in self.measurements[
-                        HealthDevice.MEASUREMENT_NAME_HEART_RATE_RESTING
-                    ]
-                ]
-            )
-        return None
+        statistics = self.get_measurement_statistics(
+            botengine, HealthDevice.MEASUREMENT_NAME_HEART_RATE_RESTING
+        )
+        if statistics is None:
+            return None
+        return statistics.mean()
 
     def did_update_steps(self, botengine):
         """
@@ -510,20 +510,12 @@ class HealthDevice(Device):
         :param botengine:
         :return: hr variability measurement
         """
-        if HealthDevice.MEASUREMENT_NAME_HR_VARIABILITY in self.measurements:
-            if len(self.measurements[HealthDevice.MEASUREMENT_NAME_HR_VARIABILITY]) > 0:
-                from statistics import mean
-
-                return mean(
-                    [
-                        x[0]
-                        for x in self.measurements[
-                            HealthDevice.MEASUREMENT_NAME_HR_VARIABILITY
-                        ]
-                    ]
-                )
-
-        return None
+        statistics = self.get_measurement_statistics(
+            botengine, HealthDevice.MEASUREMENT_NAME_HR_VARIABILITY
+        )
+        if statistics is None:
+            return None
+        return statistics.mean()
 
     def get_perfusion_index(self, botengine):
         """
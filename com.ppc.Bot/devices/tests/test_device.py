@@ -1,7 +1,12 @@
-from devices.device import Device, TOTAL_DURATION_TO_CACHE_MEASUREMENTS_MS
+import devices.device as device
+from devices.device import (
+    Device,
+    MeasurementHistory,
+    TOTAL_DURATION_TO_CACHE_MEASUREMENTS_MS,
+)
 from locations.location import Location
 
-from botengine_pytest import BotEnginePyTest
+from botengine_pytest import BotEnginePyTest, CORE_VARIABLE_NAME
 
 
 class TestDevice:
@@ -122,6 +127,166 @@ class TestDevice:
         ]
         assert len(mut.measurements["test"]) == 2
 
+    def test_device_measurements_history(self):
+        import dill
+
+        botengine = BotEnginePyTest({})
+        # Clear out any previous tests
+        botengine.reset()
+
+        # Initialize the location
+        location_object = Location(botengine, 0)
+
+        mut = Device(botengine, location_object, "A", 0, "Test", precache_measurements=False)
+        now = botengine.get_timestamp()
+
+        # Duplicates are detected by value and timestamp
+        assert mut.add_measurement(botengine, "doorStatus", True, now - 2000)
+        assert mut.add_measurement(botengine, "doorStatus", False, now - 1000)
+        assert mut.add_measurement(botengine, "doorStatus", True, now - 1000)
+        assert not mut.add_measurement(botengine, "doorStatus", False, now - 1000)
+        assert not mut.add_measurement(botengine, "doorStatus", True, now - 2000)
+        assert mut.measurement_odometer == 3
+
+        # The history is still a list, newest measurements first
+        assert isinstance(mut.measurements["doorStatus"], MeasurementHistory)
+        assert mut.measurements["doorStatus"] == [(True, now - 1000), (False, now - 1000), (True, now - 2000)]
+
+        # Histories saved as plain lists are upgraded on the next measurement
+        mut.measurements["doorStatus"] = list(mut.measurements["doorStatus"])
+        assert not mut.add_measurement(botengine, "doorStatus", False, now - 1000)
+        assert isinstance(mut.measurements["doorStatus"], MeasurementHistory)
+
+        # The duplicate index isn't pickled, and is rebuilt after loading
+        history = dill.loads(dill.dumps(mut.measurements["doorStatus"]))
+        assert history == mut.measurements["doorStatus"]
+        assert history.contains(True, now - 2000)
+        assert not history.contains(False, now - 2000)
+
+        # Trimmed measurements leave the index
+        mut.enforce_cache_size = True
+        oldest_timestamp_ms = now - TOTAL_DURATION_TO_CACHE_MEASUREMENTS_MS
+        mut.measurements["power"] = MeasurementHistory([(1, oldest_timestamp_ms - 1000), (2, oldest_timestamp_ms - 2000)])
+        assert mut.add_measurement(botengine, "power", 3, now)
+        assert mut.measurements["power"] == [(3, now)]
+        assert not mut.measurements["power"].contains(1, oldest_timestamp_ms - 1000)
+
+        # Replacing or reordering measurements in place rebuilds the index and statistics
+        history = mut.measurements["power"]
+        statistics = history.statistics()
+        history[0] = (4, now)
+        assert history.contains(4, now)
+        assert not history.contains(3, now)
+        assert history.statistics().maximum() == 4
+        assert history.statistics() is not statistics
+
+        history.extend([(5, now - 1000), (6, now - 2000)])
+        history.sort(key=lambda measurement: measurement[1])
+        assert history.contains(6, now - 2000)
+        history.add(7, now + 1000)
+        assert history.statistics().count() == 4
+
+    def test_device_measurement_statistics(self):
+        import dill
+        import pytest
+
+        botengine = BotEnginePyTest({})
+        botengine.reset()
+        location_object = Location(botengine, 0)
+
+        mut = Device(botengine, location_object, "A", 0, "Test", precache_measurements=False)
+        mut.MEASUREMENT_STATISTICS = {"hr": [None, 10000], "bedStatus": [None]}
+        now = botengine.get_timestamp()
+
+        # Only declared statistics are available
+        with pytest.raises(ValueError):
+            mut.get_measurement_statistics(botengine, "hr", window_ms=5000)
+        assert mut.get_measurement_statistics(botengine, "hr") is None
+
+        for value, timestamp in [(60, now - 30000), (80, now - 20000), (70, now - 9000), (64, now - 1000)]:
+            mut.add_measurement(botengine, "hr", value, timestamp)
+
+        statistics = mut.get_measurement_statistics(botengine, "hr")
+        assert (statistics.count(), statistics.mean(), statistics.minimum(), statistics.maximum()) == (4, 68.5, 60, 80)
+
+        # Time-windowed statistics only include recent measurements
+        recent = mut.get_measurement_statistics(botengine, "hr", window_ms=10000)
+        assert (recent.count(), recent.mean(), recent.minimum(), recent.maximum()) == (2, 67, 64, 70)
+
+        # Statistics follow new and trimmed measurements without rescanning the history
+        mut.enforce_cache_size = True
+        mut.minimum_measurements_to_cache_by_parameter_name["hr"] = 2
+        botengine.get_timestamp = lambda: now + TOTAL_DURATION_TO_CACHE_MEASUREMENTS_MS - 15000
+        mut.add_measurement(botengine, "hr", 90, now)
+        assert mut.measurements["hr"] == [(90, now), (64, now - 1000), (70, now - 9000)]
+        assert (statistics.count(), statistics.mean(), statistics.minimum(), statistics.maximum()) == (3, 224 / 3, 64, 90)
+        assert mut.get_measurement_statistics(botengine, "hr") is statistics
+
+        # The last timestamp of a value
+        for value, timestamp in [(1, now - 3000), (0, now - 2000), (1, now - 1000)]:
+            mut.add_measurement(botengine, "bedStatus", value, timestamp)
+        bed_statistics = mut.get_measurement_statistics(botengine, "bedStatus")
+        assert bed_statistics.last_timestamp(0) == now - 2000
+        assert bed_statistics.last_timestamp(2) is None
+
+        # Statistics aren't pickled, and are rebuilt after loading
+        mut.measurements["hr"] = dill.loads(dill.dumps(mut.measurements["hr"]))
+        assert mut.get_measurement_statistics(botengine, "hr") is not statistics
+        assert mut.get_measurement_statistics(botengine, "hr").mean() == statistics.mean()
+
+    def test_device_reliable_commands(self):
+        botengine = BotEnginePyTest({})
+        botengine.reset()
+        location_object = Location(botengine, 0)
+        mut = Device(botengine, location_object, "A", 0, "Test", precache_measurements=False)
+        now = botengine.get_timestamp()
+
+        # Measurements don't create the queue on bots that never sent a command reliably
+        mut.add_measurement(botengine, "power", 1, now)
+        device.cancel_reliable_command(botengine, "B", "power")
+        assert device.queued_commands_for_device(botengine, "B") == {}
+        assert device.RELIABILITY_QUEUE_VARIABLE_NAME not in botengine.variables.get(CORE_VARIABLE_NAME, {})
+        assert len(botengine.variables_to_flush) == 0
+
+        # The legacy queue variable is migrated into the core variables by the next delivery attempt
+        botengine.save_variable(device.RELIABILITY_VARIABLE_NAME, {"B": {"power": (1, 0, now)}})
+        device._attempt_reliable_delivery(botengine, None)
+        assert device.queued_commands_for_device(botengine, "B") == {"power": (1, 0, now)}
+        assert device.RELIABILITY_QUEUE_VARIABLE_NAME in botengine.variables[CORE_VARIABLE_NAME]
+        assert device.RELIABILITY_VARIABLE_NAME not in botengine.variables
+        device.cancel_reliable_command(botengine, "B", "power")
+
+        # Repeated writes of the same value are coalesced
+        device.send_command_reliably(botengine, "A", "coolingSetpoint", 22.0)
+        device.send_command_reliably(botengine, "A", "coolingSetpoint", 22.0)
+        assert len(botengine.commands) == 1
+        assert botengine.is_timer_running(device.RELIABILITY_TIMER_REFERENCE)
+        assert device.queued_commands_for_device(botengine, "A") == {"coolingSetpoint": (22.0, 0, now)}
+
+        # A measurement from the device confirms the command
+        mut.add_measurement(botengine, "coolingSetpoint", 21.0, now)
+        assert "coolingSetpoint" in device.queued_commands_for_device(botengine, "A")
+        mut.add_measurement(botengine, "coolingSetpoint", 22.0, now + 1000)
+        assert device.queued_commands_for_device(botengine, "A") == {}
+
+        # Unconfirmed commands are retried together
+        device.send_command_reliably(botengine, "A", "heatingSetpoint", 18.0)
+        device.send_command_reliably(botengine, "A", "systemMode", 1)
+        botengine.commands.clear()
+        botengine.get_timestamp = lambda: now + device.TIME_BETWEEN_ATTEMPTS_SEC * 1000
+        device._attempt_reliable_delivery(botengine, None)
+        assert len(botengine.commands) == 1
+        assert botengine.commands[0][2] == [
+            {"name": "heatingSetpoint", "value": 18.0},
+            {"name": "systemMode", "value": 1},
+        ]
+        assert device.queued_commands_for_device(botengine, "A")["systemMode"][1] == 1
+
+        # Another execution only sees the queue saved in its own core variables
+        other_botengine = BotEnginePyTest({})
+        other_botengine.reset()
+        assert device.queued_commands_for_device(other_botengine, "A") == {}
+
     def test_device_module_comparison(self):
         import devices.motion.motion as motion
         import devices.motion.develco.motion as motion_develco
@@ -169,4 +334,68 @@ class TestDevice:
         assert _isinstance(1, (int,))
         assert not _isinstance(1, (bool,))
         assert _isinstance(mut, (DevelcoMotionDevice,))
-        assert _isinstance(mut, (MotionDevice,))
\ No newline at end of file
+        assert _isinstance(mut, (MotionDevice,))
+
+    def test_device_csv(self):
+        import io
+
+        import lz4.frame
+
+        botengine = BotEnginePyTest({})
+        botengine.reset()
+        location_object = Location(botengine, 0)
+        mut = Device(botengine, location_object, "A,1", 0, "Test")
+
+        # No measurements to export
+        assert mut.get_csv(botengine, oldest_timestamp_ms=0) is None
+
+        mut.add_measurement(botengine, "temperature", 21.0, 0)
+        mut.add_measurement(botengine, "humidity", 40, 0)
+
+        def iterate_measurements(device_id, oldest_timestamp_ms, newest_timestamp_ms=None, param_name=None, **kwargs):
+            yield {"name": "temperature", "value": "20.5", "time": 1000}
+            yield {"name": "humidity", "value": "35", "time": 1000}
+            yield {"name": "humidity", "value": "36", "index": "1", "time": 2000}
+            yield {"name": "temperature", "time": 3000}
+
+        botengine.iterate_measurements = iterate_measurements
+        location_object.get_local_datetime_from_timestamp = lambda botengine, timestamp_ms: timestamp_ms
+
+        import utilities.utilities as utilities
+
+        iso_format, utilities.iso_format = utilities.iso_format, str
+        try:
+            # The last measurement at each timestamp is kept, and every row ends with a separator
+            csv_text = mut.get_csv(botengine, oldest_timestamp_ms=0)
+            assert csv_text == (
+                "device_type,device_id,description,timestamp_ms,timestamp_iso,humidity,temperature,\n"
+                "0,A_1,Test,1000,1000,35,21.0,\n"
+                "0,A_1,Test,2000,2000,40,21.0,\n"
+            )
+
+            assert list(mut.iterate_csv(botengine, oldest_timestamp_ms=0, params=["temperature"])) == [
+                ["device_type", "device_id", "description", "timestamp_ms", "timestamp_iso", "temperature", ""],
+                [0, "A_1", "Test", 1000, "1000", 21.0, ""],
+                [0, "A_1", "Test", 2000, "2000", 21.0, ""],
+            ]
+
+            # Compressed output to a binary sink
+            sink = io.BytesIO()
+            assert mut.write_csv(botengine, sink, oldest_timestamp_ms=0, compress=True) == 3
+            assert not sink.closed
+            assert lz4.frame.decompress(sink.getvalue()).decode("utf-8") == csv_text
+
+            # Without an oldest timestamp, the measurements are sorted before the rows are generated
+            botengine.get_measurements = lambda device_id, **kwargs: {
+                "measures": [
+                    {"name": "humidity", "value": "36", "index": "1", "time": 2000},
+                    {"name": "temperature", "value": "20.5", "time": 1000},
+                    {"name": "humidity", "value": "35", "time": 1000},
+                ]
+            }
+            assert mut.get_csv(botengine) == csv_text
+
+            # Requested parameters that this device doesn't have
+            assert mut.get_csv(botengine, oldest_timestamp_ms=0, params=["missing"]) is None
+        finally:
+            utilities.iso_format = iso_format
@@ -86,3 +86,18 @@ class TestHealthDevice:
         for i in mut.intelligence_modules:
             assert mut.intelligence_modules[i].intelligence_id is not None
             assert mut.intelligence_modules[i].parent == mut
+
+    def test_device_health_averages(self):
+        botengine = BotEnginePyTest({})
+        botengine.reset()
+        location_object = Location(botengine, 0)
+        mut = HealthDevice(botengine, location_object, "A", 0, "Test", precache_measurements=False)
+        now = botengine.get_timestamp()
+
+        assert mut.get_average_heart_rate(botengine) is None
+        for value, timestamp in [(60, now - 2000), (70, now - 1000)]:
+            mut.add_measurement(botengine, HealthDevice.MEASUREMENT_NAME_HEART_RATE, value, timestamp)
+        assert mut.get_average_heart_rate(botengine) == 65
+
+        mut.add_measurement(botengine, HealthDevice.MEASUREMENT_NAME_HEART_RATE, 80, now)
+        assert mut.get_average_heart_rate(botengine) == 70
@@ -175,7 +175,7 @@ class Filter:
 
         :param botengine: BotEngine environment
         :param reference: Optional reference passed into botengine.request_data(..)
-        :param csv_dict: { device_object: 'csv data string' }
+        :param csv_dict: { device_object: DataRequestContent iterable of CSV rows }
         """
         return
 
@@ -244,11 +244,13 @@ class Intelligence:
 
         CSV Data Structure:
         The csv_dict parameter contains device measurement data in the following format:
-        { device_object: 'csv data string' }
+        { device_object: DataRequestContent }
 
-        Each CSV string contains:
-        - First line: Headers (parameter names)
-        - Subsequent lines: Measurement data with columns:
+        Iterating over a DataRequestContent parses its CSV rows one at a time, without holding the whole file as one
+        string. It can be iterated again by every microservice. Call text() only if you need the raw CSV string.
+        The downloaded file is released once no microservice holds a reference to it.
+        - First row: Headers (parameter names)
+        - Subsequent rows: Measurement data with columns:
           * measure_time: Timestamp of the measurement
           * index: Measurement index (defaults to '0' if empty)
           * group: Measurement group identifier
@@ -258,18 +260,18 @@ class Intelligence:
         { param_name: [[measure_time, index, param_value], ...] }
 
         Common processing pattern:
-        1. Split CSV string into lines
-        2. Extract headers from first line
-        3. Parse each subsequent line into measurement data
+        1. Iterate over the rows
+        2. Extract headers from the first row
+        3. Parse each subsequent row into measurement data
         4. Organize data by parameter name for analysis
 
         :param botengine: BotEngine environment
         :param reference: Optional reference passed into botengine.request_data(..). Use this to identify
                          which specific data request is being processed.
-        :param csv_dict: Dictionary mapping device objects to CSV data strings. Format:
-                        { device_object: 'csv data string' } where device_object is typically a device
-                        instance, and csv_data is either bytes or string containing measurement
-                        data with headers in the first line and comma-separated values in subsequent lines.
+        :param csv_dict: Dictionary mapping device objects to CSV data. Format:
+                        { device_object: DataRequestContent } where device_object is typically a device
+                        instance, and each DataRequestContent is an iterable of CSV rows with headers in the
+                        first row.
         """
         # For backwards compatibility, call the deprecated data_request_ready method if it exists
         if hasattr(self, 'data_request_ready'):
@@ -279,6 +281,18 @@ class Intelligence:
 
 
 
+    # ===============================================================================
+    # Built-in logging methods.
+    # ===============================================================================
+    def get_logger(self, botengine):
+        """
+        Logger named after this microservice's class, resolved once per class instead of on every log line.
+        Use it instead of botengine.get_logger(f"{__name__}.{__class__.__name__}").
+        :param botengine: BotEngine environment
+        :return: Logger handle
+        """
+        return utilities.get_class_logger(botengine, self.__class__)
+
     # ===============================================================================
     # Built-in statistics methods.
     # ===============================================================================
@@ -481,7 +495,7 @@ class Intelligence:
         
         :param botengine: BotEngine environment
         :param reference: Optional reference passed into botengine.request_data(..)
-        :param csv_dict: { device_object: 'csv data string' }
+        :param csv_dict: { device_object: DataRequestContent iterable of CSV rows }
         """
         return
 
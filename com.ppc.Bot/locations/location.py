@@ -12,6 +12,7 @@ import importlib
 import json
 
 import index
+import manifest
 import properties
 import pytz
 import utilities.utilities as utilities
@@ -21,6 +22,9 @@ from utilities.narrative import (
     NARRATIVE_TYPE_OBSERVATION,
 )
 
+# Logger of the Location class
+_logger = utilities.LoggerHandle(f"{__name__}.Location")
+
 
 class Location:
     """
@@ -113,6 +117,26 @@ class Location:
         # Location sub type
         self.sub_type = sub_type
 
+        # Fingerprints of the declared modules this location last synchronized with, { manifest_key: fingerprint }
+        self.synchronized_fingerprints = {}
+
+        # Cached dispatch tables, rebuilt when modules are added, removed, or reprioritized. Never saved.
+        self._dispatch_tables = {}
+
+        # Deferred signals delivered at the end of this execution by signals.bus.flush(). Never saved.
+        self._pending_signals = {}
+
+    def __getstate__(self):
+        """
+        Dispatch tables and deferred signals hold bound methods and objects of the live execution,
+        so they're left out when the location is saved.
+        :return: Dictionary of attributes to save
+        """
+        state = self.__dict__.copy()
+        state.pop("_dispatch_tables", None)
+        state.pop("_pending_signals", None)
+        return state
+
     def new_version(self, botengine):
         """
         New bot version - runs one time when we are executing a new bot version
@@ -124,9 +148,7 @@ class Location:
 
         :param botengine: BotEngine environment
         """
-        botengine.get_logger(f"{__name__}.{__class__.__name__}").info(
-            ">new_version() New bot version detected"
-        )
+        _logger.get(botengine).info(">new_version() New bot version detected")
 
         # Added January 13th, 2023
         if not hasattr(self, "deviceless_trends"):
@@ -147,9 +169,12 @@ class Location:
             time_diff_hours = int((current_time - self.born_on) / (1000 * 60 * 60))
             self.odometer_hours = time_diff_hours
 
+        # Execution priorities may have changed with this version
+        self.invalidate_dispatch_tables()
+
         # Log device information when running locally
         if botengine.local:
-            logger = botengine.get_logger(f"{__name__}.{__class__.__name__}")
+            logger = _logger.get(botengine)
             logger.info("=== DEVICE TRACKING INFORMATION ===")
             if self.devices:
                 for device_id, device_object in self.devices.items():
@@ -162,23 +187,15 @@ class Location:
 
         if self.sub_type not in [None, 0]:
             # Services for sub type locations run on the parent location
-            botengine.get_logger(f"{__name__}.{__class__.__name__}").info(
+            _logger.get(botengine).info(
                 "<new_version() Skipping microservice synchronization for sub-type location"
             )
             return
         # Synchronize all microservices
-        self._sync_modules(
-            botengine,
-            self.intelligence_modules,
-            index.MICROSERVICES.get("LOCATION_MICROSERVICES", []),
-        )
+        self._sync_modules(botengine, self.intelligence_modules, manifest.LOCATION_MICROSERVICES)
 
         # Synchronize all data filters
-        self._sync_modules(
-            botengine,
-            self.filters,
-            index.MICROSERVICES.get("DATA_FILTER_MICROSERVICES", []),
-        )
+        self._sync_modules(botengine, self.filters, manifest.DATA_FILTER_MICROSERVICES)
 
         # Tell all device objects and their device microservices we're running a new version
         for device_object in self.devices.values():
@@ -187,7 +204,7 @@ class Location:
             except Exception as e:
                 import traceback
 
-                botengine.get_logger(f"{__name__}.{__class__.__name__}").error(
+                _logger.get(botengine).error(
                     "|new_version() - Error delivering new_version to device object (continuing execution): {}exception={} trace={}{}".format(
                         utilities.Color.RED,
                         e,
@@ -209,7 +226,7 @@ class Location:
             except Exception as e:
                 import traceback
 
-                botengine.get_logger(f"{__name__}.{__class__.__name__}").error(
+                _logger.get(botengine).error(
                     "|new_version() - Error delivering new_version to data filter (continuing execution): {}exception={} trace={}{}".format(
                         utilities.Color.RED,
                         e,
@@ -236,7 +253,7 @@ class Location:
             except Exception as e:
                 import traceback
 
-                botengine.get_logger(f"{__name__}.{__class__.__name__}").error(
+                _logger.get(botengine).error(
                     "|new_version() - Error delivering new_version to device microservice (continuing execution): {}exception={} trace={}{}".format(
                         utilities.Color.RED,
                         e,
@@ -249,33 +266,25 @@ class Location:
                     import time
 
                     time.sleep(2)
-        botengine.get_logger(f"{__name__}.{__class__.__name__}").info("<new_version()")
+        _logger.get(botengine).info("<new_version()")
 
     def initialize(self, botengine):
         """
         Initialize - runs on every execution of the bot
         :param botengine: BotEngine environment
         """
-        botengine.get_logger(f"{__name__}.{__class__.__name__}").info(">initialize()")
+        _logger.get(botengine).info(">initialize()")
         if self.sub_type not in [None, 0]:
             # Services for sub type locations run on the parent location
-            botengine.get_logger(f"{__name__}.{__class__.__name__}").info(
+            _logger.get(botengine).info(
                 "<initialize() Skipping microservice synchronization for sub-type location"
             )
             return
         # Synchronize all microservices
-        self._sync_modules(
-            botengine,
-            self.intelligence_modules,
-            index.MICROSERVICES.get("LOCATION_MICROSERVICES", []),
-        )
+        self._sync_modules(botengine, self.intelligence_modules, manifest.LOCATION_MICROSERVICES)
 
         # Synchronize all data filters
-        self._sync_modules(
-            botengine,
-            self.filters,
-            index.MICROSERVICES.get("DATA_FILTER_MICROSERVICES", []),
-        )
+        self._sync_modules(botengine, self.filters, manifest.DATA_FILTER_MICROSERVICES)
 
         for filter_object in self.sorted_filters(botengine).values():
             try:
@@ -283,7 +292,7 @@ class Location:
             except Exception as e:
                 import traceback
 
-                botengine.get_logger(f"{__name__}.{__class__.__name__}").error(
+                _logger.get(botengine).error(
                     "location.py - Error initializing data filter (continuing execution): {}exception={} trace={}{}".format(
                         utilities.Color.RED,
                         e,
@@ -303,7 +312,7 @@ class Location:
             except Exception as e:
                 import traceback
 
-                botengine.get_logger(f"{__name__}.{__class__.__name__}").error(
+                _logger.get(botengine).error(
                     "|new_version() - Error initializing device microservice (continuing execution): {}exception={} trace={}{}".format(
                         utilities.Color.RED,
                         e,
@@ -323,7 +332,7 @@ class Location:
             except Exception as e:
                 import traceback
 
-                botengine.get_logger(f"{__name__}.{__class__.__name__}").error(
+                _logger.get(botengine).error(
                     "|new_version() - Error initializing user (continuing execution): {}exception={} trace={}{}".format(
                         utilities.Color.RED,
                         e,
@@ -353,7 +362,7 @@ class Location:
             except Exception as e:
                 import traceback
 
-                botengine.get_logger(f"{__name__}.{__class__.__name__}").error(
+                _logger.get(botengine).error(
                     "|new_version() - Error initializing microservice (continuing execution): {}exception={} trace={}{}".format(
                         utilities.Color.RED,
                         e,
@@ -371,7 +380,7 @@ class Location:
         if self.language != botengine.get_language():
             self.language = botengine.get_language()
             self.language_updated(botengine, self.language)
-        botengine.get_logger(f"{__name__}.{__class__.__name__}").info("<initialize()")
+        _logger.get(botengine).info("<initialize()")
 
     def add_device(self, botengine, device_object):
         """
@@ -390,7 +399,7 @@ class Location:
                 except Exception as e:
                     import traceback
 
-                    botengine.get_logger(f"{__name__}.{__class__.__name__}").error(
+                    _logger.get(botengine).error(
                         "|add_device() - Error delivering add_device to device microservice (continuing execution): {}device_object={} exception={} trace={}{}".format(
                             utilities.Color.RED,
                             device_object,
@@ -412,7 +421,7 @@ class Location:
             except Exception as e:
                 import traceback
 
-                botengine.get_logger(f"{__name__}.{__class__.__name__}").error(
+                _logger.get(botengine).error(
                     "|add_device() - Error delivering add_device to location microservice (continuing execution): {}device_object={} exception={} trace={}{}".format(
                         utilities.Color.RED,
                         device_object,
@@ -426,23 +435,21 @@ class Location:
             try:
                 filter_object.device_added(botengine, device_object)
             except Exception as e:
-                botengine.get_logger(f"{__name__}.{__class__.__name__}").error(
+                _logger.get(botengine).error(
                     "|add_device() - Error delivering add_device to filter (continuing execution): "
                     + str(e)
                 )
                 import traceback
 
-                botengine.get_logger(f"{__name__}.{__class__.__name__}").error(
-                    traceback.format_exc()
-                )
-        botengine.get_logger(f"{__name__}.{__class__.__name__}").info("<add_device()")
+                _logger.get(botengine).error(traceback.format_exc())
+        _logger.get(botengine).info("<add_device()")
 
     def delete_device(self, botengine, device_id):
         """
         Delete the given device ID
         :param device_id: Device ID to delete
         """
-        botengine.get_logger(f"{__name__}.{__class__.__name__}").debug(
+        _logger.get(botengine).debug(
             ">delete_device() Deleting device_id={}".format(device_id)
         )
         if device_id in self.devices:
@@ -457,7 +464,7 @@ class Location:
                     except Exception as e:
                         import traceback
 
-                        botengine.get_logger(f"{__name__}.{__class__.__name__}").error(
+                        _logger.get(botengine).error(
                             "|delete_device() Exception destroying device intelligence module. {}device_id={} exception={} trace={}{}".format(
                                 utilities.Color.RED,
                                 device_object.device_id,
@@ -472,7 +479,7 @@ class Location:
             except Exception as e:
                 import traceback
 
-                botengine.get_logger(f"{__name__}.{__class__.__name__}").error(
+                _logger.get(botengine).error(
                     "|delete_device() Exception destroying device. {}device_id={} exception={} trace={}{}".format(
                         utilities.Color.RED,
                         device_object.device_id,
@@ -498,7 +505,7 @@ class Location:
                 except Exception as e:
                     import traceback
 
-                    botengine.get_logger(f"{__name__}.{__class__.__name__}").error(
+                    _logger.get(botengine).error(
                         "|delete_device() - Error delivering delete_device to location microservice (continuing execution): {}device_id={} exception={} trace={}{}".format(
                             utilities.Color.RED,
                             device_object.device_id,
@@ -514,7 +521,7 @@ class Location:
                 except Exception as e:
                     import traceback
 
-                    botengine.get_logger(f"{__name__}.{__class__.__name__}").error(
+                    _logger.get(botengine).error(
                         "|delete_device() - Error delivering delete_device to filter (continuing execution): {}device_id={} exception={} trace={}{}".format(
                             utilities.Color.RED,
                             device_object.device_id,
@@ -534,7 +541,7 @@ class Location:
         :param new_device_object: The new device object that will replace it
         """
         device_id = old_device_object.device_id
-        botengine.get_logger(f"{__name__}.{__class__.__name__}").info(
+        _logger.get(botengine).info(
             ">migrate_device_object() Migrating device {} from {} to {}".format(
                 device_id, old_device_object, new_device_object
             )
@@ -544,7 +551,7 @@ class Location:
             if hasattr(new_device_object, attr_name):
                 if hasattr(new_device_object, attr_name):
                     setattr(new_device_object, attr_name, attr_value)
-                    botengine.get_logger(f"{__name__}.{__class__.__name__}").debug(
+                    _logger.get(botengine).debug(
                         f"|migrate_device_object() Migrated attribute {attr_name}: {getattr(new_device_object, attr_name)}"
                     )
 
@@ -554,7 +561,7 @@ class Location:
         except Exception as e:
             import traceback
 
-            botengine.get_logger(f"{__name__}.{__class__.__name__}").error(
+            _logger.get(botengine).error(
                 "|migrate_device_object() Exception destroying old device object. {}device_id={} exception={} trace={}{}".format(
                     utilities.Color.RED,
                     device_id,
@@ -567,7 +574,7 @@ class Location:
         # Replace the device object in our devices dictionary
         self.devices[device_id] = new_device_object
 
-        botengine.get_logger(f"{__name__}.{__class__.__name__}").info(
+        _logger.get(botengine).info(
             "<migrate_device_object() Successfully migrated device {} from {} to {}".format(
                 device_id,
                 type(old_device_object).__name__,
@@ -579,25 +586,23 @@ class Location:
         """
         Update this location's mode
         """
-        botengine.get_logger(f"{__name__}.{__class__.__name__}").info(
-            ">mode_updated() mode={}".format(mode)
-        )
+        _logger.get(botengine).info(">mode_updated() mode={}".format(mode))
         self.mode = mode.upper()
 
         # Location microservices
-        for microservice_object in self.sorted_intelligence_modules(botengine).values():
+        for handler in self.microservice_handlers(botengine, "mode_updated"):
             try:
                 import time
 
                 t = time.time()
-                microservice_object.mode_updated(botengine, mode)
-                microservice_object.track_statistics(
+                handler(botengine, mode)
+                handler.__self__.track_statistics(
                     botengine, (time.time() - t) * 1000
                 )
             except Exception as e:
                 import traceback
 
-                botengine.get_logger(f"{__name__}.{__class__.__name__}").error(
+                _logger.get(botengine).error(
                     "|mode_updated() - Error delivering mode_updated to location microservice (continuing execution): {}mode={} exception={} trace={}{}".format(
                         utilities.Color.RED,
                         mode,
@@ -623,7 +628,7 @@ class Location:
                     except Exception as e:
                         import traceback
 
-                        botengine.get_logger(f"{__name__}.{__class__.__name__}").error(
+                        _logger.get(botengine).error(
                             "|mode_updated() - Error delivering mode_updated to device microservice (continuing execution). {}mode={} exception={} trace={}{}".format(
                                 utilities.Color.RED,
                                 mode,
@@ -639,13 +644,13 @@ class Location:
                             time.sleep(2)
 
         # Filters
-        for filter_object in self.sorted_filters(botengine).values():
+        for handler in self.filter_handlers(botengine, "mode_updated"):
             try:
-                filter_object.mode_updated(botengine, mode)
+                handler(botengine, mode)
             except Exception as e:
                 import traceback
 
-                botengine.get_logger(f"{__name__}.{__class__.__name__}").warning(
+                _logger.get(botengine).warning(
                     "|mode_updated() - Error delivering mode_updated to filter (continuing execution). {}mode={} exception={} trace={}{}".format(
                         utilities.Color.RED,
                         mode,
@@ -668,15 +673,13 @@ class Location:
         :param measurements: Measurements dictionary we're about to trigger off of, which is modified in place.
         :return: Nothing, because the measurements dictionary should be directly modified to correct the data.
         """
-        for filter_object in self.sorted_filters(botengine).values():
+        for handler in self.filter_handlers(botengine, "filter_measurements"):
             try:
-                filter_object.filter_measurements(
-                    botengine, device_object, measurements
-                )
+                handler(botengine, device_object, measurements)
             except Exception as e:
                 import traceback
 
-                botengine.get_logger(f"{__name__}.{__class__.__name__}").error(
+                _logger.get(botengine).error(
                     "|filter_measurements() - Error delivering filter_measurements to filter (continuing execution). {}measurements={} exception={} trace={}{}".format(
                         utilities.Color.RED,
                         measurements,
@@ -697,21 +700,21 @@ class Location:
         :param botengine: BotEngine environment
         :param device_object: Device object that was updated
         """
-        for microservice_object in self.sorted_intelligence_modules(botengine).values():
+        for handler in self.microservice_handlers(botengine, "device_measurements_updated"):
             try:
                 import time
 
                 t = time.time()
-                microservice_object.device_measurements_updated(
+                handler(
                     botengine, device_object
                 )
-                microservice_object.track_statistics(
+                handler.__self__.track_statistics(
                     botengine, (time.time() - t) * 1000
                 )
             except Exception as e:
                 import traceback
 
-                botengine.get_logger(f"{__name__}.{__class__.__name__}").error(
+                _logger.get(botengine).error(
                     "|device_measurements_updated() - Error delivering device_measurements_updated to location microservice (continuing execution). {}device_object={} exception={} trace={}{}".format(
                         utilities.Color.RED,
                         device_object,
@@ -732,19 +735,19 @@ class Location:
         :param botengine: BotEngine environment
         :param device_object: Device object that was updated
         """
-        for microservice_object in self.sorted_intelligence_modules(botengine).values():
+        for handler in self.microservice_handlers(botengine, "device_metadata_updated"):
             try:
                 import time
 
                 t = time.time()
-                microservice_object.device_metadata_updated(botengine, device_object)
-                microservice_object.track_statistics(
+                handler(botengine, device_object)
+                handler.__self__.track_statistics(
                     botengine, (time.time() - t) * 1000
                 )
             except Exception as e:
                 import traceback
 
-                botengine.get_logger(f"{__name__}.{__class__.__name__}").error(
+                _logger.get(botengine).error(
                     "|device_metadata_updated() - Error delivering device_metadata_updated to location microservice (continuing execution). {}device_object={} exception={} trace={}{}".format(
                         utilities.Color.RED,
                         device_object,
@@ -767,26 +770,26 @@ class Location:
         :param alert_type: Type of alert
         :param alert_params: Alert parameters
         """
-        botengine.get_logger(f"{__name__}.{__class__.__name__}").debug(
+        _logger.get(botengine).debug(
             ">device_alert() device_id={} alert_type={}".format(
                 device_object.device_id, alert_type
             )
         )
-        for microservice_object in self.sorted_intelligence_modules(botengine).values():
+        for handler in self.microservice_handlers(botengine, "device_alert"):
             try:
                 import time
 
                 t = time.time()
-                microservice_object.device_alert(
+                handler(
                     botengine, device_object, alert_type, alert_params
                 )
-                microservice_object.track_statistics(
+                handler.__self__.track_statistics(
                     botengine, (time.time() - t) * 1000
                 )
             except Exception as e:
                 import traceback
 
-                botengine.get_logger(f"{__name__}.{__class__.__name__}").error(
+                _logger.get(botengine).error(
                     "|device_alert() - Error delivering device_alert to location microservice (continuing execution). {}alert_type={} alert_params={} exception={} trace={}{}".format(
                         utilities.Color.RED,
                         alert_type,
@@ -821,7 +824,7 @@ class Location:
             except Exception as e:
                 import traceback
 
-                botengine.get_logger(f"{__name__}.{__class__.__name__}").error(
+                _logger.get(botengine).error(
                     "|question_answered() - Error delivering question_answered to location microservice (continuing execution). {}question={} exception={} trace={}{}".format(
                         utilities.Color.RED,
                         question,
@@ -842,7 +845,7 @@ class Location:
                     except Exception as e:
                         import traceback
 
-                        botengine.get_logger(f"{__name__}.{__class__.__name__}").error(
+                        _logger.get(botengine).error(
                             "|question_answered() - Error delivering question_answered to device microservice (continuing execution). {}question={} exception={} trace={}{}".format(
                                 utilities.Color.RED,
                                 question,
@@ -859,7 +862,7 @@ class Location:
             except Exception as e:
                 import traceback
 
-                botengine.get_logger(f"{__name__}.{__class__.__name__}").error(
+                _logger.get(botengine).error(
                     "location.py - Error delivering question_answered to filter (continuing execution). {}question={} exception={} trace={}{}".format(
                         utilities.Color.RED,
                         question,
@@ -875,29 +878,20 @@ class Location:
         :param botengine: BotEngine environment
         :param messages: Message objects
         """
-        botengine.get_logger(f"{__name__}.{__class__.__name__}").info(
-            ">messages_updated()"
-        )
+        _logger.get(botengine).info(">messages_updated()")
         # Microservices
-        for microservice_object in self.sorted_intelligence_modules(botengine).values():
-            botengine.get_logger(f"{__name__}.{__class__.__name__}").debug(
+        for handler in self.microservice_handlers(botengine, "messages_updated"):
+            _logger.get(botengine).debug(
                 "|messages_updated() - Delivering messages_updated to location microservice: {}".format(
-                    microservice_object
+                    handler.__self__
                 )
             )
-            if not hasattr(microservice_object, "messages_updated"):
-                botengine.get_logger(f"{__name__}.{__class__.__name__}").debug(
-                    "|messages_updated() - No messages_updated() method in location microservice: {}".format(
-                        microservice_object
-                    )
-                )
-                continue
             try:
                 import time
 
                 t = time.time()
-                microservice_object.messages_updated(botengine, messages)
-                microservice_object.track_statistics(
+                handler(botengine, messages)
+                handler.__self__.track_statistics(
                     botengine, (time.time() - t) * 1000
                 )
             except Exception as e:
@@ -938,11 +932,9 @@ class Location:
                         )
 
         # Filters
-        for filter_object in self.filters.values():
-            if not hasattr(filter_object, "messages_updated"):
-                continue
+        for handler in self.filter_handlers(botengine, "messages_updated"):
             try:
-                filter_object.messages_updated(botengine, messages)
+                handler(botengine, messages)
             except Exception as e:
                 import traceback
 
@@ -955,9 +947,7 @@ class Location:
                         utilities.Color.END,
                     )
                 )
-        botengine.get_logger(f"{__name__}.{__class__.__name__}").info(
-            ">messages_updated()"
-        )
+        _logger.get(botengine).info(">messages_updated()")
 
     def datastream_updated(self, botengine, address, content, raise_exceptions=False):
         """
@@ -967,33 +957,31 @@ class Location:
         :param content: Data Stream content
         """
         # Top priority - Location microservices
-        botengine.get_logger(f"{__name__}.{__class__.__name__}").debug(
-            ">datastream_updated()"
-        )
-        botengine.get_logger(f"{__name__}.{__class__.__name__}").debug(
+        _logger.get(botengine).debug(">datastream_updated()")
+        _logger.get(botengine).debug(
             "|datastream_updated() raise_exceptions={}".format(raise_exceptions)
         )
         # Raise exceptions if requested
         exceptions = []  # (Exception, traceback) tuples
-        for microservice_object in self.sorted_intelligence_modules(botengine).values():
-            if not hasattr(microservice_object, "datastream_updated"):
-                continue
+        for handler in self.microservice_handlers(
+            botengine, "datastream_updated", address
+        ):
             try:
                 import time
 
                 t = time.time()
-                microservice_object.datastream_updated(
+                handler(
                     botengine,
                     address,
                     content.copy() if isinstance(content, dict) else content,
                 )
-                microservice_object.track_statistics(
+                handler.__self__.track_statistics(
                     botengine, (time.time() - t) * 1000
                 )
             except Exception as e:
                 import traceback
 
-                botengine.get_logger(f"{__name__}.{__class__.__name__}").error(
+                _logger.get(botengine).error(
                     "|datastream_updated() - Error delivering datastream message '{}' to location microservice (continuing execution). {}content={} exception={} trace={}{}".format(
                         address,
                         utilities.Color.RED,
@@ -1012,14 +1000,14 @@ class Location:
 
         # Second priority - Device microservices
         for device_object in self.devices.values():
-            botengine.get_logger(f"{__name__}.{__class__.__name__}").debug(
+            _logger.get(botengine).debug(
                 "|datastream_updated() - Delivering datastream message '{}' to device microservice: {}".format(
                     address, device_object
                 )
             )
             if hasattr(device_object, "intelligence_modules"):
                 for intelligence_id in device_object.intelligence_modules:
-                    botengine.get_logger(f"{__name__}.{__class__.__name__}").debug(
+                    _logger.get(botengine).debug(
                         "|datastream_updated() - Delivering datastream message '{}' to device microservice: {}".format(
                             address, device_object.intelligence_modules[intelligence_id]
                         )
@@ -1035,7 +1023,7 @@ class Location:
                     except Exception as e:
                         import traceback
 
-                        botengine.get_logger(f"{__name__}.{__class__.__name__}").error(
+                        _logger.get(botengine).error(
                             "|datastream_updated() - Error delivering datastream message '{}' to device microservice (continuing execution). {}content={} exception={} trace={}{}".format(
                                 address,
                                 utilities.Color.RED,
@@ -1053,9 +1041,9 @@ class Location:
                             time.sleep(2)
 
         # Lowest priority - filters
-        for filter_object in self.sorted_filters(botengine).values():
+        for handler in self.filter_handlers(botengine, "datastream_updated", address):
             try:
-                filter_object.datastream_updated(
+                handler(
                     botengine,
                     address,
                     content.copy() if isinstance(content, dict) else content,
@@ -1063,7 +1051,7 @@ class Location:
             except Exception as e:
                 import traceback
 
-                botengine.get_logger(f"{__name__}.{__class__.__name__}").error(
+                _logger.get(botengine).error(
                     "|datastream_updated() - Error delivering datastream message '{}' to filter (continuing execution). {}content={} exception={} trace={}{}".format(
                         address,
                         utilities.Color.RED,
@@ -1086,9 +1074,7 @@ class Location:
                 + utilities.Color.END,
                 exceptions,
             )
-        botengine.get_logger(f"{__name__}.{__class__.__name__}").debug(
-            "<datastream_updated()"
-        )
+        _logger.get(botengine).debug("<datastream_updated()")
 
     def schedule_fired(self, botengine, schedule_id):
         """
@@ -1106,7 +1092,7 @@ class Location:
             except Exception as e:
                 import traceback
 
-                botengine.get_logger(f"{__name__}.{__class__.__name__}").error(
+                _logger.get(botengine).error(
                     "|schedule_fired() - Error delivering schedule_fired to device object (continuing execution). {}schedule_id={} exception={} trace={}{}".format(
                         utilities.Color.RED,
                         schedule_id,
@@ -1129,7 +1115,7 @@ class Location:
             except Exception as e:
                 import traceback
 
-                botengine.get_logger(f"{__name__}.{__class__.__name__}").error(
+                _logger.get(botengine).error(
                     "|schedule_fired() - Error delivering schedule_fired to filter (continuing execution). {}schedule_id={} exception={} trace={}{}".format(
                         utilities.Color.RED,
                         schedule_id,
@@ -1157,7 +1143,7 @@ class Location:
             except Exception as e:
                 import traceback
 
-                botengine.get_logger(f"{__name__}.{__class__.__name__}").error(
+                _logger.get(botengine).error(
                     "|schedule_fired() - Error delivering schedule_fired to location microservice (continuing execution). {}schedule_id={} exception={} trace={}{}".format(
                         utilities.Color.RED,
                         schedule_id,
@@ -1183,7 +1169,7 @@ class Location:
                     except Exception as e:
                         import traceback
 
-                        botengine.get_logger(f"{__name__}.{__class__.__name__}").error(
+                        _logger.get(botengine).error(
                             "|schedule_fired() - Error delivering schedule_fired to device microservice (continuing execution). {}schedule_id={} exception={} trace={}{}".format(
                                 utilities.Color.RED,
                                 schedule_id,
@@ -1208,7 +1194,7 @@ class Location:
 
             if any_device_connected:
                 self.odometer_hours += 1
-                botengine.get_logger(f"{__name__}.{__class__.__name__}").info(
+                _logger.get(botengine).info(
                     f"|schedule_fired() Running live for {self.odometer_hours} hours"
                 )
 
@@ -1233,7 +1219,7 @@ class Location:
                 except Exception as e:
                     import traceback
 
-                    botengine.get_logger(f"{__name__}.{__class__.__name__}").error(
+                    _logger.get(botengine).error(
                         "|timer_fired() - Error triggering timer_fired in location microservice (continuing execution). {}argument={} exception={} trace={}{}".format(
                             utilities.Color.RED,
                             argument,
@@ -1257,7 +1243,7 @@ class Location:
                 except Exception as e:
                     import traceback
 
-                    botengine.get_logger(f"{__name__}.{__class__.__name__}").error(
+                    _logger.get(botengine).error(
                         "|timer_fired() - Error triggering timer_fired in filter (continuing execution). {}exception={} trace={}{}".format(
                             utilities.Color.RED,
                             e,
@@ -1309,7 +1295,7 @@ class Location:
             except Exception as e:
                 import traceback
 
-                botengine.get_logger(f"{__name__}.{__class__.__name__}").error(
+                _logger.get(botengine).error(
                     "|file_uploaded() - Error delivering file_uploaded to location microservice (continuing execution). {}device_object={} file_id={} exception={} trace={}{}".format(
                         utilities.Color.RED,
                         device_object,
@@ -1358,7 +1344,7 @@ class Location:
             except Exception as e:
                 import traceback
 
-                botengine.get_logger(f"{__name__}.{__class__.__name__}").error(
+                _logger.get(botengine).error(
                     "|user_role_updated() - Error delivering user_role_updated to user object (continuing execution). {}user_id={} exception={} trace={}{}".format(
                         utilities.Color.RED,
                         user_id,
@@ -1388,7 +1374,7 @@ class Location:
                 )
             except Exception as e:
                 import traceback
-                botengine.get_logger(f"{__name__}.{__class__.__name__}").error(
+                _logger.get(botengine).error(
                     "|user_role_updated() - Error delivering user_role_updated to location microservice (continuing execution): {}; user_id={} exception={} trace={}{}".format(
                         utilities.Color.RED,
                         user_id,
@@ -1399,9 +1385,7 @@ class Location:
                 )
                 import traceback
 
-                botengine.get_logger(f"{__name__}.{__class__.__name__}").error(
-                    traceback.format_exc()
-                )
+                _logger.get(botengine).error(traceback.format_exc())
 
         # Device intelligence modules
         for device_object in self.devices.values():
@@ -1422,7 +1406,7 @@ class Location:
                     except Exception as e:
                         import traceback
 
-                        botengine.get_logger(f"{__name__}.{__class__.__name__}").error(
+                        _logger.get(botengine).error(
                             "|user_role_updated() - Error delivering user_role_updated to device microservice (continuing execution). {}user_id={} exception={} trace={}{}".format(
                                 utilities.Color.RED,
                                 user_id,
@@ -1452,7 +1436,7 @@ class Location:
             except Exception as e:
                 import traceback
 
-                botengine.get_logger(f"{__name__}.{__class__.__name__}").error(
+                _logger.get(botengine).error(
                     "|call_center_updated() - Error delivering call_center_updated to location microservice (continuing execution). {}user_id={} exception={} trace={}{}".format(
                         utilities.Color.RED,
                         user_id,
@@ -1473,7 +1457,7 @@ class Location:
                     except Exception as e:
                         import traceback
 
-                        botengine.get_logger(f"{__name__}.{__class__.__name__}").error(
+                        _logger.get(botengine).error(
                             "|call_center_updated() - Error delivering call_center_updated to device microservice (continuing execution). {}user_id={} exception={} trace={}{}".format(
                                 utilities.Color.RED,
                                 user_id,
@@ -1488,7 +1472,7 @@ class Location:
         A botengine.request_data() asynchronous request for CSV data is ready.
         :param botengine: BotEngine environment
         :param reference: Optional reference passed into botengine.request_data(..)
-        :param device_csv_dict: { 'device_id': 'csv data string' }
+        :param device_csv_dict: { device_object: DataRequestContent iterable of CSV rows }
         """
         # Filters to correct data before passing to other microservices
         # Edit the device_csv_dict in place inside the filter
@@ -1500,7 +1484,7 @@ class Location:
             except Exception as e:
                 import traceback
 
-                botengine.get_logger(f"{__name__}.{__class__.__name__}").error(
+                _logger.get(botengine).error(
                     "|async_data_request_ready() - Error delivering async_data_request_ready to filter (continuing execution). {}reference={} exception={} trace={}{}".format(
                         utilities.Color.RED,
                         reference,
@@ -1525,7 +1509,7 @@ class Location:
             except Exception as e:
                 import traceback
 
-                botengine.get_logger(f"{__name__}.{__class__.__name__}").error(
+                _logger.get(botengine).error(
                     "|async_data_request_ready() - Error delivering async_data_request_ready to location microservice (continuing execution). {}reference={} exception={} trace={}{}".format(
                         utilities.Color.RED,
                         reference,
@@ -1546,7 +1530,7 @@ class Location:
                             botengine, reference, device_csv_dict
                         )
                     except Exception as e:
-                        botengine.get_logger(f"{__name__}.{__class__.__name__}").error(
+                        _logger.get(botengine).error(
                             "|async_data_request_ready() - Error delivering async_data_request_ready to device microservice (continuing execution). {}reference={} exception={} trace={}{}".format(
                                 utilities.Color.RED,
                                 reference,
@@ -1557,9 +1541,7 @@ class Location:
                         )
                         import traceback
 
-                        botengine.get_logger(f"{__name__}.{__class__.__name__}").error(
-                            traceback.format_exc()
-                        )
+                        _logger.get(botengine).error(traceback.format_exc())
 
     def update_coordinates(self, botengine, latitude, longitude):
         """
@@ -1593,7 +1575,7 @@ class Location:
                 except Exception as e:
                     import traceback
 
-                    botengine.get_logger(f"{__name__}.{__class__.__name__}").error(
+                    _logger.get(botengine).error(
                         "|update_coordinates() - Error delivering coordinates_updated to location microservice (continuing execution). {}exception={} trace={}{}".format(
                             utilities.Color.RED,
                             e,
@@ -1614,7 +1596,7 @@ class Location:
             except Exception as e:
                 import traceback
 
-                botengine.get_logger(f"{__name__}.{__class__.__name__}").error(
+                _logger.get(botengine).error(
                     "|language_updated() - Error delivering language_updated to filter (continuing execution). {}exception={} trace={}{}".format(
                         utilities.Color.RED,
                         e,
@@ -1634,7 +1616,7 @@ class Location:
                     botengine, (time.time() - t) * 1000
                 )
             except Exception as e:
-                botengine.get_logger(f"{__name__}.{__class__.__name__}").error(
+                _logger.get(botengine).error(
                     "|language_updated() - Error delivering language_updated to location microservice (continuing execution). {}exception={} trace={}{}".format(
                         utilities.Color.RED,
                         e,
@@ -1644,9 +1626,7 @@ class Location:
                 )
                 import traceback
 
-                botengine.get_logger(f"{__name__}.{__class__.__name__}").error(
-                    traceback.format_exc()
-                )
+                _logger.get(botengine).error(traceback.format_exc())
 
         # Device microservices
         for device_object in self.devices.values():
@@ -1659,7 +1639,7 @@ class Location:
                     except Exception as e:
                         import traceback
 
-                        botengine.get_logger(f"{__name__}.{__class__.__name__}").error(
+                        _logger.get(botengine).error(
                             "|language_updated() - Error delivering language_updated to device microservice (continuing execution). {}exception={} trace={}{}".format(
                                 utilities.Color.RED,
                                 e,
@@ -1869,7 +1849,7 @@ class Location:
         try:
             return properties.get_property(botengine, "USER_FACING_MODES", False)[mode]
         except Exception:
-            botengine.get_logger(f"{__name__}.{__class__.__name__}").info(
+            _logger.get(botengine).info(
                 "|get_user_facing_mode() Mode '{}' not found in domain.USER_FACING_MODES".format(
                     mode
                 )
@@ -2107,7 +2087,7 @@ class Location:
             serialized = str(additional_property_json)
             size_bytes = len(serialized)
 
-        botengine.get_logger(f"{__name__}.{__class__.__name__}").debug(
+        _logger.get(botengine).debug(
             "|set_location_property_separately() Queued state save: name='{}' overwrite={} timestamp_ms={} track={} sub_location={} size={} bytes content={}".format(
                 additional_property_name,
                 overwrite,
@@ -2156,10 +2136,8 @@ class Location:
         :param external: True to deliver this message externally to any other bot that's listening (default)
         :param raise_exceptions: True to raise an exception if an error occurs when distributing internally, False to log the error and continue
         """
-        botengine.get_logger(f"{__name__}.{__class__.__name__}").debug(
-            ">distribute_datastream_message()"
-        )
-        botengine.get_logger(f"{__name__}.{__class__.__name__}").debug(
+        _logger.get(botengine).debug(">distribute_datastream_message()")
+        _logger.get(botengine).debug(
             "|distribute_datastream_message() - address={} content={} internal={} external={} raise_exceptions={}".format(
                 address, content, internal, external, raise_exceptions
             )
@@ -2580,7 +2558,7 @@ class Location:
         weekday = int(weekday)
 
         reference = self.get_local_datetime(botengine)
-        botengine.get_logger(f"{__name__}.{__class__.__name__}").debug(
+        _logger.get(botengine).debug(
             "|local_timestamp_ms_from_relative_hours() reference={}".format(reference)
         )
         hour, minute = divmod(hours, 1)
@@ -2588,7 +2566,7 @@ class Location:
         if minute >= 60:
             minute -= 60
         days = reference.weekday() - weekday
-        botengine.get_logger(f"{__name__}.{__class__.__name__}").debug(
+        _logger.get(botengine).debug(
             "|local_timestamp_ms_from_relative_hours() days={} hour={} minute={}".format(
                 days, hour, minute
             )
@@ -2596,7 +2574,7 @@ class Location:
         target_dt = (reference - timedelta(days=days)).replace(
             hour=int(hour), minute=int(minute), second=0, microsecond=0
         )
-        botengine.get_logger(f"{__name__}.{__class__.__name__}").debug(
+        _logger.get(botengine).debug(
             "|local_timestamp_ms_from_relative_hours() target_dt={}".format(target_dt)
         )
         timestamp_ms = self.timezone_aware_datetime_to_unix_timestamp(
@@ -2606,7 +2584,7 @@ class Location:
         if future:
             if timestamp_ms <= botengine.get_timestamp():
                 timestamp_ms += utilities.ONE_WEEK_MS
-                botengine.get_logger(f"{__name__}.{__class__.__name__}").debug(
+                _logger.get(botengine).debug(
                     "|local_timestamp_ms_from_relative_hours() adjusted target_dt={}".format(
                         target_dt + timedelta(days=7)
                     )
@@ -2621,19 +2599,19 @@ class Location:
         :param dt: Datetime to convert to unix timestamp
         :return: timestamp in milliseconds
         """
-        botengine.get_logger(f"{__name__}.{__class__.__name__}").debug(
+        _logger.get(botengine).debug(
             ">timezone_aware_datetime_to_unix_timestamp() dt={}".format(dt)
         )
         tz = pytz.timezone(self.get_local_timezone_string(botengine))
-        botengine.get_logger(f"{__name__}.{__class__.__name__}").debug(
+        _logger.get(botengine).debug(
             "|timezone_aware_datetime_to_unix_timestamp() tz={}".format(tz)
         )
         local_dt = dt.astimezone(tz)
-        botengine.get_logger(f"{__name__}.{__class__.__name__}").debug(
+        _logger.get(botengine).debug(
             "|timezone_aware_datetime_to_unix_timestamp() local_dt={}".format(local_dt)
         )
         timestamp = int((local_dt).timestamp()) * 1000
-        botengine.get_logger(f"{__name__}.{__class__.__name__}").debug(
+        _logger.get(botengine).debug(
             "<timezone_aware_datetime_to_unix_timestamp() timestamp={}".format(
                 timestamp
             )
@@ -2731,63 +2709,56 @@ class Location:
     # ===========================================================================
     # Synchronize local modules
     # ===========================================================================
-    def _sync_modules(self, botengine, modules, desired_modules_dict):
+    def _sync_modules(self, botengine, modules, manifest_key):
         """
-        Synchronize the modules declared in our index.py file with this local class
+        Synchronize the modules declared in our index.py file with this local class.
+        Nothing happens while the declared modules still have the fingerprint they had when this location last
+        synchronized with all of them, which is every execution except the first one after a bot upgrade.
         :param botengine: BotEngine environment
         :param modules: Dictionary of local modules { 'module_id': module_object }
-        :param desired_modules_dict: Dictionary of desired modules, typically loaded from an index.py file
+        :param manifest_key: manifest.LOCATION_MICROSERVICES or manifest.DATA_FILTER_MICROSERVICES
         """
-        botengine.get_logger(f"{__name__}.{__class__.__name__}").debug(
-            ">_sync_modules()"
-        )
-        module_names = [x["module"] for x in desired_modules_dict]
+        fingerprint, declared_modules = manifest.location_table(manifest_key)
+        if not hasattr(self, "synchronized_fingerprints"):
+            self.synchronized_fingerprints = {}
 
-        changed = False
-        for m in module_names:
-            changed |= m not in modules
+        if self.synchronized_fingerprints.get(manifest_key) == fingerprint and len(
+            modules
+        ) == len(declared_modules):
+            return
 
-        for m in list(modules.keys()):
-            changed |= m not in module_names
+        _logger.get(botengine).debug(">_sync_modules() {}".format(manifest_key))
+        if len(modules) != len(declared_modules) or any(
+            module_name not in modules for module_name in declared_modules
+        ):
+            self.invalidate_dispatch_tables()
 
-        if changed:
             # Remove modules that no longer exist
-            for module_name in dict(modules).keys():
-                found = False
-                for intelligence_info in desired_modules_dict:
-                    if intelligence_info["module"] == module_name:
-                        found = True
-                        break
-
-                if not found:
-                    botengine.get_logger(f"{__name__}.{__class__.__name__}").debug(
-                        "|_sync_modules() Deleting module {}".format(module_name)
-                    )
-                    modules[module_name].destroy(botengine)
-                    del modules[module_name]
+            for module_name in [m for m in modules if m not in declared_modules]:
+                _logger.get(botengine).debug(
+                    "|_sync_modules() Deleting module {}".format(module_name)
+                )
+                modules[module_name].destroy(botengine)
+                del modules[module_name]
 
             # Add more modules
-            for intelligence_info in desired_modules_dict:
-                if intelligence_info["module"] not in modules:
+            for module_name, intelligence_info in declared_modules.items():
+                if module_name not in modules:
                     try:
-                        intelligence_module = importlib.import_module(
-                            intelligence_info["module"]
-                        )
+                        intelligence_module = importlib.import_module(module_name)
                         class_ = getattr(
                             intelligence_module, intelligence_info["class"]
                         )
-                        botengine.get_logger(f"{__name__}.{__class__.__name__}").debug(
-                            "|_sync_modules() Adding module {}".format(
-                                str(intelligence_info["module"])
-                            )
+                        _logger.get(botengine).debug(
+                            "|_sync_modules() Adding module {}".format(module_name)
                         )
                         intelligence_object = class_(botengine, self)
-                        modules[intelligence_info["module"]] = intelligence_object
+                        modules[module_name] = intelligence_object
 
                     except Exception as e:
                         import traceback
 
-                        botengine.get_logger(f"{__name__}.{__class__.__name__}").error(
+                        _logger.get(botengine).error(
                             "|_sync_modules() Could not add module {}. exception={} trace={}".format(
                                 str(intelligence_info), str(e), traceback.format_exc()
                             )
@@ -2796,9 +2767,12 @@ class Location:
                             import time
 
                             time.sleep(5)
-        botengine.get_logger(f"{__name__}.{__class__.__name__}").debug(
-            "<_sync_modules()"
-        )
+
+        # Modules that failed to load are tried again on the next execution
+        if len(modules) == len(declared_modules):
+            self.synchronized_fingerprints[manifest_key] = fingerprint
+
+        _logger.get(botengine).debug("<_sync_modules()")
 
     # ===========================================================================
     # CSV methods for machine learning algorithm integrations
@@ -2811,10 +2785,62 @@ class Location:
         :param newest_timestamp_ms: newest timestamp in milliseconds
         :return: .csv string, largely matching the .csv data you would receive from the "botengine --download_device [device_id]" command line interface. Or None if this device doesn't have data.
         """
-        output = "location_id,timestamp_ms,timestamp_iso,event,source_type\n"
+        import io
+
+        output = io.StringIO(newline="")
+        if (
+            self.write_csv(
+                botengine,
+                output,
+                oldest_timestamp_ms=oldest_timestamp_ms,
+                newest_timestamp_ms=newest_timestamp_ms,
+            )
+            is None
+        ):
+            return None
 
+        return output.getvalue()
+
+    def write_csv(
+        self,
+        botengine,
+        sink,
+        oldest_timestamp_ms=None,
+        newest_timestamp_ms=None,
+        compress=False,
+    ):
+        """
+        Write the same .csv content as get_csv() to a file-like sink, one row at a time
+        :param botengine: BotEngine environment
+        :param sink: Text file-like object opened with newline="", or a binary file-like object when compressing
+        :param oldest_timestamp_ms: oldest timestamp in milliseconds
+        :param newest_timestamp_ms: newest timestamp in milliseconds
+        :param compress: True to write an lz4 frame of the .csv content
+        :return: Number of rows written including the header, or None if the mode history isn't available
+        """
+        rows = self.iterate_csv(
+            botengine,
+            oldest_timestamp_ms=oldest_timestamp_ms,
+            newest_timestamp_ms=newest_timestamp_ms,
+        )
+        header = next(rows, None)
+        if header is None:
+            return None
+
+        import itertools
+
+        return utilities.write_csv(sink, itertools.chain([header], rows), compress=compress)
+
+    def iterate_csv(self, botengine, oldest_timestamp_ms=None, newest_timestamp_ms=None):
+        """
+        Generator of the .csv rows of get_csv(), header first
+        :param botengine: BotEngine environment
+        :param oldest_timestamp_ms: oldest timestamp in milliseconds
+        :param newest_timestamp_ms: newest timestamp in milliseconds
+        :return: Generator of rows, each a list of values. Nothing is generated if the mode history isn't available.
+        """
         # This number happens to be the oldest timestamp
-        if oldest_timestamp_ms < 1262304000000:
+        if oldest_timestamp_ms is None or oldest_timestamp_ms < 1262304000000:
             oldest_timestamp_ms = 1262304000000
 
         try:
@@ -2826,84 +2852,238 @@ class Location:
         except Exception as e:
             # This can happen because this bot may not have read permissions for this device.
 
-            botengine.get_logger(f"{__name__}.{__class__.__name__}").error(
-                "|get_csv() Could not download modes history for location {}: {}".format(
+            _logger.get(botengine).error(
+                "|iterate_csv() Could not download modes history for location {}: {}".format(
                     self.location_id,
                     str(e),
                 )
             )
-            return None
+            return
 
         if "events" not in modes:
-            return None
+            return
 
-        botengine.get_logger(f"{__name__}.{__class__.__name__}").info(
-            "|get_csv() {} mode changes captured".format(len(modes["events"]))
+        _logger.get(botengine).info(
+            "|iterate_csv() {} mode changes captured".format(len(modes["events"]))
         )
 
+        yield ["location_id", "timestamp_ms", "timestamp_iso", "event", "source_type"]
+
         for event in modes["events"]:
             timestamp_ms = event["eventDateMs"]
             dt = self.get_local_datetime_from_timestamp(botengine, timestamp_ms)
 
-            event_name = event["event"].replace(",", ".")
-
-            output += "{},{},{},{},{}".format(
+            yield [
                 self.location_id,
                 timestamp_ms,
                 utilities.iso_format(dt),
-                event_name,
+                event["event"].replace(",", "."),
                 event["sourceType"],
-            )
-            output += "\n"
-
-        return output
+            ]
 
     def sorted_intelligence_modules(self, botengine):
         """
         Order intelligence modules alphabetically then by execution priority
         :param botengine: BotEngine environment
-        :return: List of intelligence modules sorted by execution priority
+        :return: Dictionary of intelligence modules sorted by execution priority. Don't modify it.
+        """
+        return self._dispatch_table(
+            botengine, "intelligence_modules", "LOCATION_MICROSERVICES"
+        )["modules"]
+
+    def sorted_filters(self, botengine):
         """
-        # Order intelligence modules alphabetically then by execution priority
-        modules = dict(
-            sorted(self.intelligence_modules.items(), key=lambda module: module[0])
+        Order filters modules alphabetically then by execution priority
+        :param botengine: BotEngine environment
+        :return: Dictionary of filters modules sorted by execution priority. Don't modify it.
+        """
+        return self._dispatch_table(botengine, "filters", "DATA_FILTER_MICROSERVICES")[
+            "modules"
+        ]
+
+    def microservice_handlers(self, botengine, event_name, address=None):
+        """
+        Bound methods of the location microservices that handle an event, in execution priority order.
+        Microservices that inherit a method that does nothing are left out.
+        :param botengine: BotEngine environment
+        :param event_name: Name of the event method, for example 'device_measurements_updated'
+        :param address: Data stream address, only for the 'datastream_updated' event
+        :return: List of bound methods. Don't modify it.
+        """
+        return self._handlers(
+            botengine,
+            "intelligence_modules",
+            "LOCATION_MICROSERVICES",
+            event_name,
+            address,
         )
-        execution_priorities = {}
-        for intelligence_info in index.MICROSERVICES.get("LOCATION_MICROSERVICES", []):
-            execution_priorities[intelligence_info["module"]] = intelligence_info.get(
-                "execution_priority", 0
-            )
 
-        return dict(
-            sorted(
-                modules.items(),
-                key=lambda module: execution_priorities.get(module[0], 0),
-                reverse=True,
-            )
+    def filter_handlers(self, botengine, event_name, address=None):
+        """
+        Bound methods of the filters that handle an event, in execution priority order.
+        Filters that inherit a method that does nothing are left out.
+        :param botengine: BotEngine environment
+        :param event_name: Name of the event method, for example 'mode_updated'
+        :param address: Data stream address, only for the 'datastream_updated' event
+        :return: List of bound methods. Don't modify it.
+        """
+        return self._handlers(
+            botengine, "filters", "DATA_FILTER_MICROSERVICES", event_name, address
         )
 
-    def sorted_filters(self, botengine):
+    def device_microservice_handlers(self, botengine, event_name):
         """
-        Order filters modules alphabetically then by execution priority
+        Bound methods of the device microservices that handle an event, device by device, each device's
+        microservices in execution priority order.
+        :param botengine: BotEngine environment
+        :param event_name: Name of the event method
+        :return: List of bound methods. Don't modify it.
+        """
+        signature = tuple(
+            (device_id, _module_identities(device_object.intelligence_modules))
+            for device_id, device_object in self.devices.items()
+            if hasattr(device_object, "intelligence_modules")
+        )
+
+        if not hasattr(self, "_dispatch_tables"):
+            self._dispatch_tables = {}
+
+        table = self._dispatch_tables.get("devices")
+        if table is None or table["signature"] != signature:
+            table = {
+                "signature": signature,
+                "modules": [
+                    list(device_object.intelligence_modules.values())
+                    for device_object in self.devices.values()
+                    if hasattr(device_object, "intelligence_modules")
+                ],
+                "handlers": {},
+            }
+            self._dispatch_tables["devices"] = table
+
+        if event_name not in table["handlers"]:
+            table["handlers"][event_name] = [
+                getattr(microservice_object, event_name)
+                for device_object in self.devices.values()
+                if hasattr(device_object, "intelligence_modules")
+                for microservice_object in device_object.sorted_intelligence_modules().values()
+                if _handles(microservice_object, event_name)
+            ]
+        return table["handlers"][event_name]
+
+    def get_logger(self, botengine):
+        """
+        Logger named after this location's class, resolved once per class instead of on every log line.
+        Use it instead of botengine.get_logger(f"{__name__}.{__class__.__name__}").
         :param botengine: BotEngine environment
-        :return: List of filters modules sorted by execution priority
+        :return: Logger handle
+        """
+        return utilities.get_class_logger(botengine, self.__class__)
+
+    def invalidate_dispatch_tables(self):
         """
-        # Order intelligence modules alphabetically then by execution priority
-        if not hasattr(self, "filters"):
-            return {}
-        modules = dict(sorted(self.filters.items(), key=lambda module: module[0]))
+        Rebuild the dispatch tables the next time an event is delivered.
+        Call this after adding, removing, or reprioritizing modules anywhere other than _sync_modules().
+        """
+        self._dispatch_tables = {}
+
+    def _dispatch_table(self, botengine, modules_attribute, microservices_key):
+        """
+        Dispatch table for one kind of module.
+        The table is kept until a module is added, removed, or replaced, the declared execution priorities are
+        replaced, or invalidate_dispatch_tables() is called.
+        :param botengine: BotEngine environment
+        :param modules_attribute: Name of the attribute holding the modules, 'intelligence_modules' or 'filters'
+        :param microservices_key: Key of the index.MICROSERVICES list declaring their execution priorities
+        :return: { "signature": tuple, "modules": { module_name: module_object }, "handlers": { (event_name, address): [bound_method] } }
+        """
+        modules = getattr(self, modules_attribute, {})
+        declared = index.MICROSERVICES.get(microservices_key, [])
+        signature = (_module_identities(modules), id(declared))
+
+        if not hasattr(self, "_dispatch_tables"):
+            self._dispatch_tables = {}
+
+        table = self._dispatch_tables.get(modules_attribute)
+        if table is not None and table["signature"] == signature:
+            return table
+
+        # Order modules alphabetically then by execution priority
         execution_priorities = {}
-        for intelligence_info in index.MICROSERVICES.get(
-            "DATA_FILTER_MICROSERVICES", []
-        ):
+        for intelligence_info in declared:
             execution_priorities[intelligence_info["module"]] = intelligence_info.get(
                 "execution_priority", 0
             )
 
-        return dict(
-            sorted(
-                modules.items(),
-                key=lambda module: execution_priorities.get(module[0], 0),
-                reverse=True,
-            )
-        )
+        table = {
+            "signature": signature,
+            "modules": dict(
+                sorted(
+                    sorted(modules.items(), key=lambda module: module[0]),
+                    key=lambda module: execution_priorities.get(module[0], 0),
+                    reverse=True,
+                )
+            ),
+            "handlers": {},
+        }
+        self._dispatch_tables[modules_attribute] = table
+        return table
+
+    def _handlers(
+        self, botengine, modules_attribute, microservices_key, event_name, address=None
+    ):
+        """
+        Bound methods of the modules that handle an event, looked up once per dispatch table
+        :param botengine: BotEngine environment
+        :param modules_attribute: Name of the attribute holding the modules, 'intelligence_modules' or 'filters'
+        :param microservices_key: Key of the index.MICROSERVICES list declaring their execution priorities
+        :param event_name: Name of the event method
+        :param address: Data stream address, only for the 'datastream_updated' event
+        :return: List of bound methods
+        """
+        table = self._dispatch_table(botengine, modules_attribute, microservices_key)
+        key = (event_name, address)
+        if key not in table["handlers"]:
+            table["handlers"][key] = [
+                getattr(module_object, event_name)
+                for module_object in table["modules"].values()
+                if _handles(module_object, event_name, address)
+            ]
+        return table["handlers"][key]
+
+
+def _module_identities(modules):
+    """
+    The dispatch tables keep every module they were built from, so the identities of those modules can't be reused
+    by other objects while the table exists.
+    :param modules: Dictionary of { module_name: module_object }
+    :return: Tuple identifying every module in the dictionary
+    """
+    return tuple((module_name, id(module_object)) for module_name, module_object in modules.items())
+
+
+def _handles(module_object, event_name, address=None):
+    """
+    Determine whether delivering an event to a module does anything.
+    The event methods of the Intelligence and Filter base classes do nothing, except datastream_updated(), which calls
+    the method named after the address. Any method a module overrides is delivered.
+    :param module_object: Microservice or filter object
+    :param event_name: Name of the event method
+    :param address: Data stream address, only for the 'datastream_updated' event
+    :return: True if the module overrides the event method
+    """
+    from filters.filter import Filter
+    from intelligence.intelligence import Intelligence
+
+    method = getattr(module_object, event_name, None)
+    if method is None:
+        return False
+
+    function = getattr(method, "__func__", None)
+    for base_class in (Intelligence, Filter):
+        if function is not None and function is getattr(base_class, event_name, None):
+            if event_name == "datastream_updated":
+                return address is None or hasattr(module_object, address)
+            return False
+
+    return True
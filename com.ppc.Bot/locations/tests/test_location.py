@@ -248,3 +248,64 @@ class TestLocation(unittest.TestCase):
         for attr_name, attr_value in old_device_object.__dict__.items():
             if not attr_name.startswith("_"):
                 assert getattr(new_device_object, attr_name) == attr_value
+
+    def test_location_dispatch_tables(self):
+        from intelligence.intelligence import Intelligence
+
+        class Listener(Intelligence):
+            def __init__(self, botengine, parent):
+                Intelligence.__init__(self, botengine, parent)
+                self._init_statistics()
+                self.received = []
+
+            def device_measurements_updated(self, botengine, device_object):
+                self.received.append(device_object)
+
+            def test_address(self, botengine, content):
+                self.received.append(content)
+
+            def mode_updated(self, botengine, current_mode):
+                """
+                Handlers that only return a constant are still delivered
+                """
+                return True
+
+        botengine = BotEnginePyTest({})
+        botengine.reset()
+        mut = Location(botengine, 0)
+        mut.new_version(botengine)
+
+        # The ordering is only computed once
+        modules = mut.sorted_intelligence_modules(botengine)
+        assert mut.sorted_intelligence_modules(botengine) is modules
+        handlers = mut.microservice_handlers(botengine, "device_measurements_updated")
+        assert mut.microservice_handlers(botengine, "device_measurements_updated") is handlers
+        order = list(modules.values())
+        assert [order.index(handler.__self__) for handler in handlers] == sorted(order.index(handler.__self__) for handler in handlers)
+
+        # Adding a module rebuilds the table, and modules that inherit empty event methods are skipped
+        listener = Listener(botengine, mut)
+        mut.intelligence_modules["test.listener"] = listener
+        handlers = mut.microservice_handlers(botengine, "device_measurements_updated")
+        assert listener.device_measurements_updated in handlers
+        assert listener not in [handler.__self__ for handler in mut.microservice_handlers(botengine, "question_answered")]
+        assert listener.mode_updated in mut.microservice_handlers(botengine, "mode_updated")
+
+        # Data stream messages only reach the modules that handle their address
+        mut.datastream_updated(botengine, "test_address", {"value": 1})
+        assert listener.received == [{"value": 1}]
+        assert listener not in [handler.__self__ for handler in mut.microservice_handlers(botengine, "datastream_updated", "other_address")]
+
+        mut.device_measurements_updated(botengine, "device")
+        assert listener.received == [{"value": 1}, "device"]
+
+        # Replacing a module under the same name rebuilds the table
+        replacement = Listener(botengine, mut)
+        mut.intelligence_modules["test.listener"] = replacement
+        handlers = mut.microservice_handlers(botengine, "device_measurements_updated")
+        assert replacement.device_measurements_updated in handlers
+        assert listener not in [handler.__self__ for handler in handlers]
+
+        # The dispatch tables are never saved with the location
+        assert "_dispatch_tables" in mut.__dict__
+        assert "_dispatch_tables" not in mut.__getstate__()
@@ -0,0 +1,84 @@
+"""
+Created on October 18, 2026
+
+This file is subject to the terms and conditions defined in the
+file 'LICENSE.txt', which is part of this source code package.
+
+Microservice manifest.
+
+The merged index.MICROSERVICES declares which microservices belong to each location and each device type.
+It only changes when a new version of the bot is deployed, so it is compiled once per process into lookup tables:
+    * LOCATION_MICROSERVICES: { module_name: intelligence_info }
+    * DATA_FILTER_MICROSERVICES: { module_name: intelligence_info }
+    * DEVICE_MICROSERVICES for each device type: { module_name: intelligence_info }
+
+Each table has a fingerprint of its content. Locations and devices remember the fingerprint of the table they last
+synchronized their microservices against, so synchronization is skipped until the table changes.
+"""
+
+import hashlib
+import json
+
+import index
+
+# Table keys
+LOCATION_MICROSERVICES = "LOCATION_MICROSERVICES"
+DATA_FILTER_MICROSERVICES = "DATA_FILTER_MICROSERVICES"
+DEVICE_MICROSERVICES = "DEVICE_MICROSERVICES"
+
+# (index.MICROSERVICES, { table_key: (fingerprint, table) }) compiled from the index.MICROSERVICES of this process
+_compiled = None
+
+
+def location_table(key):
+    """
+    Location microservices or data filters declared in index.MICROSERVICES
+    :param key: LOCATION_MICROSERVICES or DATA_FILTER_MICROSERVICES
+    :return: (fingerprint, { module_name: intelligence_info }) in declaration order. Don't modify it.
+    """
+    tables = _tables()
+    return tables.get(key, tables[None])
+
+
+def device_table(device_type):
+    """
+    Device microservices declared in index.MICROSERVICES for a device type
+    :param device_type: Device type
+    :return: (fingerprint, { module_name: intelligence_info }) in declaration order. Don't modify it.
+    """
+    tables = _tables()
+    return tables.get((DEVICE_MICROSERVICES, str(device_type)), tables[None])
+
+
+def _tables():
+    """
+    Compile index.MICROSERVICES the first time it's used, and again if it's replaced
+    :return: { table_key: (fingerprint, table) }, where the None key holds the empty table
+    """
+    global _compiled
+    if _compiled is None or _compiled[0] is not index.MICROSERVICES:
+        tables = {None: _table([])}
+        for key in [LOCATION_MICROSERVICES, DATA_FILTER_MICROSERVICES]:
+            tables[key] = _table(index.MICROSERVICES.get(key, []))
+
+        for device_type, intelligence_infos in index.MICROSERVICES.get(DEVICE_MICROSERVICES, {}).items():
+            tables[(DEVICE_MICROSERVICES, str(device_type))] = _table(intelligence_infos)
+
+        _compiled = (index.MICROSERVICES, tables)
+
+    return _compiled[1]
+
+
+def _table(intelligence_infos):
+    """
+    :param intelligence_infos: List of { "module": ..., "class": ... } dictionaries from index.MICROSERVICES
+    :return: (fingerprint, { module_name: intelligence_info })
+    """
+    table = {}
+    for intelligence_info in intelligence_infos:
+        table[intelligence_info["module"]] = intelligence_info
+
+    fingerprint = hashlib.md5(
+        json.dumps(intelligence_infos, sort_keys=True, default=str).encode("utf-8")
+    ).hexdigest()
+    return fingerprint, table
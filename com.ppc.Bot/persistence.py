@@ -0,0 +1,369 @@
+"""
+Created on October 18, 2026
+
+This file is subject to the terms and conditions defined in the
+file 'LICENSE.txt', which is part of this source code package.
+
+Sharded persistence for the Controller.
+
+The Controller used to be saved as one large core variable, which meant every execution re-pickled and re-uploaded
+every location, microservice, and device measurement cache even when only one device changed.
+
+Instead, the Controller is split into shards:
+    * One shard for the Controller itself
+    * One shard for each Location, including its devices and microservices
+    * One shard for each device's measurement cache
+
+Each shard is serialized to bytes and hashed. Only shards whose bytes changed since the last execution are saved.
+A small manifest describing the shards and their hashes is stored in the core variables, and all shards are
+brought back with a single load_variables() call.
+
+Every shard is checked against the hash in the manifest when it's loaded. A bot migrating from the legacy single
+controller variable keeps that variable until the shards have been loaded back once, so a save that never made it
+to the server still leaves a controller to fall back on. After that, a manifest whose shards can't be loaded raises
+ControllerLoadError instead of quietly starting over with a new Controller.
+
+A warm Lambda container keeps the live Controller of each location it recently saved. When the manifest at the
+server still holds the hashes of that save, the next execution reuses the live Controller instead of downloading
+and unpickling the shards. Any other manifest means another execution saved since, and the shards are loaded.
+"""
+
+import collections
+import hashlib
+import io
+
+import dill
+from locations.location import Location
+
+# Name of the core variable holding the shard manifest
+MANIFEST_VARIABLE_NAME = "controller_manifest"
+
+# Name of the legacy core variable holding the entire Controller
+LEGACY_VARIABLE_NAME = "controller"
+
+# Shard variable name prefixes
+CONTROLLER_SHARD_NAME = "controller.root"
+LOCATION_SHARD_PREFIX = "controller.location."
+MEASUREMENTS_SHARD_PREFIX = "controller.measurements."
+
+# Persistent reference types
+REFERENCE_LOCATION = "location"
+REFERENCE_MEASUREMENTS = "measurements"
+
+# Maximum total size in bytes of the serialized controllers kept alive across executions of a warm container.
+# Set to 0 to always load the controller from its shards.
+CONTROLLER_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+# Controllers saved by previous executions of this process, least recently saved first
+# { (bundle_id, location_id): (hashes, controller, size_bytes) }
+_controller_cache = collections.OrderedDict()
+
+
+class ControllerLoadError(Exception):
+    """
+    The shard manifest exists, but the controller it describes could not be loaded
+    """
+
+    pass
+
+
+def save_controller(botengine, controller):
+    """
+    Save the controller as a set of shards, only saving the shards that changed since the last execution
+    :param botengine: BotEngine environment
+    :param controller: Controller object
+    """
+    botengine.get_logger(f"{__name__}").debug(">save_controller()")
+    previous = botengine.load_variable(MANIFEST_VARIABLE_NAME) or {}
+    previous_hashes = previous.get("hashes", {})
+
+    shards = _serialize(controller)
+
+    hashes = {}
+    changed = {}
+    for name, content in shards.items():
+        hashes[name] = hashlib.md5(content).hexdigest()
+        if previous_hashes.get(name) != hashes[name]:
+            changed[name] = content
+
+    if len(changed) > 0:
+        # The shards are already serialized, so they're saved as they are
+        botengine.save_serialized_variables(changed)
+
+    for name in previous_hashes:
+        if name not in hashes and not botengine.playback:
+            try:
+                botengine.delete_variable(name)
+            except Exception as e:
+                botengine.get_logger(f"{__name__}").warning(
+                    "|save_controller() Unable to delete stale shard {}: {}".format(name, e)
+                )
+
+    if previous.get("hashes") is None:
+        # First sharded save. Keep the legacy controller until the shards have been loaded back.
+        legacy = botengine.load_variable(LEGACY_VARIABLE_NAME) is not None
+    else:
+        legacy = previous.get("legacy", False)
+
+    manifest = {
+        "locations": [location_id for location_id in controller.locations],
+        "devices": _measurement_devices(controller),
+        "hashes": hashes,
+        "legacy": legacy,
+    }
+    botengine.save_variable(MANIFEST_VARIABLE_NAME, manifest, required_for_each_execution=True)
+
+    _cache_controller(botengine, controller, hashes, sum(len(content) for content in shards.values()))
+
+    botengine.get_logger(f"{__name__}").debug(
+        "<save_controller() shards={} changed={}".format(len(shards), list(changed.keys()))
+    )
+
+
+def load_controller(botengine):
+    """
+    Load the controller from its shards, falling back to the legacy single controller variable
+    :param botengine: BotEngine environment
+    :return: Controller object, or None if it doesn't exist yet
+    :raises ControllerLoadError: if the shards can't be loaded and there is no legacy controller to fall back on
+    """
+    botengine.get_logger(f"{__name__}").debug(">load_controller()")
+    manifest = botengine.load_variable(MANIFEST_VARIABLE_NAME)
+    if manifest is not None:
+        controller = _cached_controller(botengine, manifest)
+        if controller is not None:
+            botengine.get_logger(f"{__name__}").debug("<load_controller() cached")
+            return controller
+
+        try:
+            controller = _deserialize(botengine, manifest)
+
+        except Exception as e:
+            import traceback
+
+            if not manifest.get("legacy", False) or botengine.load_variable(LEGACY_VARIABLE_NAME) is None:
+                botengine.get_logger(f"{__name__}").error(
+                    "<load_controller() Unable to load the sharded controller: {}; {}".format(
+                        str(e), traceback.format_exc()
+                    )
+                )
+                raise ControllerLoadError(str(e)) from e
+
+            botengine.get_logger(f"{__name__}").warning(
+                "|load_controller() Unable to load the sharded controller, falling back to the legacy controller: "
+                "{}; {}".format(str(e), traceback.format_exc())
+            )
+
+        else:
+            if manifest.get("legacy", False):
+                # The shards made it to the server, stop carrying the legacy controller inside the core variables
+                botengine.save_variable(
+                    MANIFEST_VARIABLE_NAME, dict(manifest, legacy=False), required_for_each_execution=True
+                )
+                botengine.save_variable(LEGACY_VARIABLE_NAME, None, required_for_each_execution=True)
+
+            botengine.get_logger(f"{__name__}").debug("<load_controller() sharded")
+            return controller
+
+    botengine.get_logger(f"{__name__}").debug("<load_controller() legacy")
+    return botengine.load_variable(LEGACY_VARIABLE_NAME)
+
+
+def clear_controller_cache():
+    """
+    Forget every controller kept alive across executions
+    """
+    _controller_cache.clear()
+
+
+def location_shard_name(location_id):
+    """
+    :param location_id: Location ID
+    :return: Variable name of the shard for the given location
+    """
+    return "{}{}".format(LOCATION_SHARD_PREFIX, location_id)
+
+
+def measurements_shard_name(device_id):
+    """
+    Device IDs may contain characters that are not safe in a variable name, so the shard is named by a digest.
+    :param device_id: Device ID
+    :return: Variable name of the shard for the given device's measurement cache
+    """
+    return "{}{}".format(MEASUREMENTS_SHARD_PREFIX, hashlib.md5(str(device_id).encode("utf-8")).hexdigest())
+
+
+def _controller_cache_key(botengine):
+    """
+    :param botengine: BotEngine environment
+    :return: Key of this bot and location in the controller cache
+    """
+    return (botengine.get_bundle_id(), botengine.get_location_id())
+
+
+def _cache_controller(botengine, controller, hashes, size_bytes):
+    """
+    Keep the live controller that was just saved, so the next execution in this process can skip loading it.
+    Playback imports the bot modules again before every execution, so nothing is kept during playback.
+    :param botengine: BotEngine environment
+    :param controller: Controller object that was just saved
+    :param hashes: Shard hashes of the saved manifest
+    :param size_bytes: Total size of the serialized shards
+    """
+    if botengine.playback or size_bytes > CONTROLLER_CACHE_MAX_BYTES:
+        return
+
+    key = _controller_cache_key(botengine)
+    _controller_cache.pop(key, None)
+    _controller_cache[key] = (hashes, controller, size_bytes)
+
+    total_bytes = sum(entry[2] for entry in _controller_cache.values())
+    while total_bytes > CONTROLLER_CACHE_MAX_BYTES:
+        _, (_, _, evicted_bytes) = _controller_cache.popitem(last=False)
+        total_bytes -= evicted_bytes
+
+
+def _cached_controller(botengine, manifest):
+    """
+    Take the live controller kept by a previous execution, if the manifest at the server still describes it.
+    The controller leaves the cache until it's saved again, so an execution that changes it without saving it
+    (a data request, or an exception) never hands a stale controller to the next execution.
+    While the legacy controller is kept, the shards are always loaded to prove they made it to the server.
+    :param botengine: BotEngine environment
+    :param manifest: Shard manifest loaded from the server
+    :return: Controller object, or None
+    """
+    if botengine.playback or len(_controller_cache) == 0:
+        return None
+
+    entry = _controller_cache.pop(_controller_cache_key(botengine), None)
+    if entry is None or entry[0] != manifest.get("hashes") or manifest.get("legacy", False):
+        return None
+
+    return entry[1]
+
+
+def _measurement_devices(controller):
+    """
+    :param controller: Controller object
+    :return: List of device IDs whose measurement caches are stored in their own shards
+    """
+    device_ids = []
+    for location_id in controller.locations:
+        for device_id, device_object in controller.locations[location_id].devices.items():
+            if isinstance(getattr(device_object, "measurements", None), dict):
+                device_ids.append(device_id)
+    return device_ids
+
+
+def _serialize(controller):
+    """
+    Serialize the controller into shards.
+    Every reference to a Location or to a device's measurement cache is replaced with a persistent reference,
+    so each shard only contains the objects it owns.
+    :param controller: Controller object
+    :return: Dictionary of { shard_name: bytes }
+    """
+    measurements = {}
+    shards = {}
+    for location_id in controller.locations:
+        for device_id, device_object in controller.locations[location_id].devices.items():
+            if isinstance(getattr(device_object, "measurements", None), dict):
+                measurements[id(device_object.measurements)] = device_id
+                shards[measurements_shard_name(device_id)] = dill.dumps(device_object.measurements)
+
+    for location_id, location_object in controller.locations.items():
+        # The class is stored ahead of the state so every location can be allocated before any state is restored
+        shards[location_shard_name(location_id)] = dill.dumps(location_object.__class__) + _dumps(
+            location_object.__getstate__(), measurements
+        )
+
+    shards[CONTROLLER_SHARD_NAME] = _dumps(controller, measurements)
+    return shards
+
+
+def _deserialize(botengine, manifest):
+    """
+    Rebuild the controller from its shards
+    :param botengine: BotEngine environment
+    :param manifest: Shard manifest
+    :return: Controller object
+    :raises ValueError: if a shard is missing, or isn't the one the manifest was saved with
+    """
+    names = list(manifest["hashes"].keys())
+    shards = botengine.load_variables(names)
+    for name in names:
+        if shards.get(name) is None:
+            raise ValueError("Missing controller shard {}".format(name))
+
+        if hashlib.md5(shards[name]).hexdigest() != manifest["hashes"][name]:
+            raise ValueError("Controller shard {} does not match the manifest".format(name))
+
+    measurements = {}
+    for device_id in manifest["devices"]:
+        measurements[device_id] = dill.loads(shards[measurements_shard_name(device_id)])
+
+    locations = {}
+    states = {}
+    for location_id in manifest["locations"]:
+        stream = io.BytesIO(shards[location_shard_name(location_id)])
+        class_ = dill.load(stream)
+        locations[location_id] = class_.__new__(class_)
+        states[location_id] = stream
+
+    for location_id, stream in states.items():
+        locations[location_id].__dict__.update(_ShardUnpickler(stream, locations, measurements).load())
+
+    return _ShardUnpickler(io.BytesIO(shards[CONTROLLER_SHARD_NAME]), locations, measurements).load()
+
+
+def _dumps(obj, measurements):
+    """
+    Pickle an object, replacing locations and measurement caches with persistent references
+    :param obj: Object to pickle
+    :param measurements: Dictionary of { id(measurements): device_id }
+    :return: bytes
+    """
+    stream = io.BytesIO()
+    _ShardPickler(stream, measurements).dump(obj)
+    return stream.getvalue()
+
+
+class _ShardPickler(dill.Pickler):
+    """
+    Pickler that leaves locations and measurement caches to their own shards
+    """
+
+    def __init__(self, stream, measurements):
+        dill.Pickler.__init__(self, stream)
+        self.measurements = measurements
+
+    def persistent_id(self, obj):
+        if isinstance(obj, Location):
+            return (REFERENCE_LOCATION, obj.location_id)
+
+        if isinstance(obj, dict) and id(obj) in self.measurements:
+            return (REFERENCE_MEASUREMENTS, self.measurements[id(obj)])
+
+        return None
+
+
+class _ShardUnpickler(dill.Unpickler):
+    """
+    Unpickler that resolves persistent references to locations and measurement caches
+    """
+
+    def __init__(self, stream, locations, measurements):
+        dill.Unpickler.__init__(self, stream)
+        self.locations = locations
+        self.measurements = measurements
+
+    def persistent_load(self, pid):
+        reference_type, key = pid
+        if reference_type == REFERENCE_LOCATION:
+            return self.locations[key]
+
+        if reference_type == REFERENCE_MEASUREMENTS:
+            return self.measurements[key]
+
+        raise ValueError("Unknown persistent reference {}".format(pid))
@@ -62,7 +62,9 @@ def track(
         external=False,
     )
 
-    botengine.get_logger(f"{__name__}").debug("|track() O properties={}".format(json.dumps(properties)))
+    botengine.get_logger(f"{__name__}").debug(
+        utilities.LazyString("|track() O properties={}".format, utilities.LazyString(json.dumps, properties))
+    )
 
 
 def track_and_notify(
@@ -32,6 +32,8 @@ Guidance
   information to knowledge based on domain-specific thresholds and corroboration.
 """
 
+import signals.bus as bus
+
 # Your microservices can implement the following events:
 # def knowledge_did_arrive_bed(self, botengine, device_object, unique_id, context_id, name)
 # def knowledge_did_leave_bed(self, botengine, device_object, unique_id, context_id, name)
@@ -40,7 +42,7 @@ Guidance
 
 
 
-def knowledge_did_arrive_bed(botengine, location_object, device_object, unique_id=None, context_id=None, name=None):
+def knowledge_did_arrive_bed(botengine, location_object, device_object, unique_id=None, context_id=None, name=None, defer=False):
     """
     Knowledge: Higher-confidence signal that an occupant has arrived in bed.
 
@@ -54,37 +56,15 @@ def knowledge_did_arrive_bed(botengine, location_object, device_object, unique_i
     - unique_id: Optional subregion unique ID
     - context_id: Optional context ID
     - name: Optional subregion name; defaults to the device description
+    - defer: True to deliver this signal once at the end of the execution, coalescing identical signals
     """
     if name is None:
         name = device_object.description
 
-    # Location microservices
-    for microservice in location_object.intelligence_modules:
-        if hasattr(location_object.intelligence_modules[microservice], 'knowledge_did_arrive_bed'):
-            try:
-                import time
-                t = time.time()
-                location_object.intelligence_modules[microservice].knowledge_did_arrive_bed(botengine, device_object, unique_id, context_id, name)
-                location_object.intelligence_modules[microservice].track_statistics(botengine, (time.time() - t) * 1000)
-            except Exception as e:
-                botengine.get_logger().warning("location.py - Error delivering 'knowledge_did_arrive_bed' to location microservice (continuing execution): " + str(e))
-                import traceback
-                botengine.get_logger().error(traceback.format_exc())
-
-    # Device microservices
-    for device_id in location_object.devices:
-        if hasattr(location_object.devices[device_id], "intelligence_modules"):
-            for microservice in location_object.devices[device_id].intelligence_modules:
-                if hasattr(location_object.devices[device_id].intelligence_modules[microservice], 'knowledge_did_arrive_bed'):
-                    try:
-                        location_object.devices[device_id].intelligence_modules[microservice].knowledge_did_arrive_bed(botengine, device_object, unique_id, context_id, name)
-                    except Exception as e:
-                        botengine.get_logger().warning("location.py - Error delivering 'knowledge_did_arrive_bed' message to device microservice (continuing execution): " + str(e))
-                        import traceback
-                        botengine.get_logger().error(traceback.format_exc())
-
-
-def knowledge_did_leave_bed(botengine, location_object, device_object, unique_id=None, context_id=None, name=None):
+    bus.send(botengine, location_object, "knowledge_did_arrive_bed", device_object, unique_id, context_id, name, defer=defer)
+
+
+def knowledge_did_leave_bed(botengine, location_object, device_object, unique_id=None, context_id=None, name=None, defer=False):
     """
     Knowledge: Higher-confidence signal that an occupant has left the bed.
 
@@ -98,37 +78,15 @@ def knowledge_did_leave_bed(botengine, location_object, device_object, unique_id
     - unique_id: Optional subregion unique ID
     - context_id: Optional context ID
     - name: Optional subregion name; defaults to the device description
+    - defer: True to deliver this signal once at the end of the execution, coalescing identical signals
     """
     if name is None:
         name = device_object.description
 
-    # Location microservices
-    for microservice in location_object.intelligence_modules:
-        if hasattr(location_object.intelligence_modules[microservice], 'knowledge_did_leave_bed'):
-            try:
-                import time
-                t = time.time()
-                location_object.intelligence_modules[microservice].knowledge_did_leave_bed(botengine, device_object, unique_id, context_id, name)
-                location_object.intelligence_modules[microservice].track_statistics(botengine, (time.time() - t) * 1000)
-            except Exception as e:
-                botengine.get_logger().warning("location.py - Error delivering 'knowledge_did_leave_bed' to location microservice (continuing execution): " + str(e))
-                import traceback
-                botengine.get_logger().error(traceback.format_exc())
-
-    # Device microservices
-    for device_id in location_object.devices:
-        if hasattr(location_object.devices[device_id], "intelligence_modules"):
-            for microservice in location_object.devices[device_id].intelligence_modules:
-                if hasattr(location_object.devices[device_id].intelligence_modules[microservice], 'knowledge_did_leave_bed'):
-                    try:
-                        location_object.devices[device_id].intelligence_modules[microservice].knowledge_did_leave_bed(botengine, device_object, unique_id, context_id, name)
-                    except Exception as e:
-                        botengine.get_logger().warning("location.py - Error delivering 'knowledge_did_leave_bed' message to device microservice (continuing execution): " + str(e))
-                        import traceback
-                        botengine.get_logger().error(traceback.format_exc())
-
-
-def information_did_arrive_bed(botengine, location_object, device_object, unique_id=None, context_id=None, name=None):
+    bus.send(botengine, location_object, "knowledge_did_leave_bed", device_object, unique_id, context_id, name, defer=defer)
+
+
+def information_did_arrive_bed(botengine, location_object, device_object, unique_id=None, context_id=None, name=None, defer=False):
     """
     Information: Immediate, device-level indication that an occupant may have arrived in bed.
 
@@ -143,41 +101,15 @@ def information_did_arrive_bed(botengine, location_object, device_object, unique
     - unique_id: Optional subregion unique ID
     - context_id: Optional context ID
     - name: Optional subregion name; defaults to the device description
+    - defer: True to deliver this signal once at the end of the execution, coalescing identical signals
     """
     if name is None:
         name = device_object.description
 
-    # Location microservices
-    for microservice in location_object.intelligence_modules:
-        if hasattr(location_object.intelligence_modules[microservice], 'information_did_arrive_bed'):
-            try:
-                import time
-                t = time.time()
-                location_object.intelligence_modules[microservice].information_did_arrive_bed(
-                    botengine, device_object, unique_id, context_id, name
-                )
-                location_object.intelligence_modules[microservice].track_statistics(botengine, (time.time() - t) * 1000)
-            except Exception as e:
-                botengine.get_logger().warning("location.py - Error delivering 'information_did_arrive_bed' to location microservice (continuing execution): " + str(e))
-                import traceback
-                botengine.get_logger().error(traceback.format_exc())
-
-    # Device microservices
-    for device_id in location_object.devices:
-        if hasattr(location_object.devices[device_id], "intelligence_modules"):
-            for microservice in location_object.devices[device_id].intelligence_modules:
-                if hasattr(location_object.devices[device_id].intelligence_modules[microservice], 'information_did_arrive_bed'):
-                    try:
-                        location_object.devices[device_id].intelligence_modules[microservice].information_did_arrive_bed(
-                            botengine, device_object, unique_id, context_id, name
-                        )
-                    except Exception as e:
-                        botengine.get_logger().warning("location.py - Error delivering 'information_did_arrive_bed' message to device microservice (continuing execution): " + str(e))
-                        import traceback
-                        botengine.get_logger().error(traceback.format_exc())
-
-
-def information_did_leave_bed(botengine, location_object, device_object, unique_id=None, context_id=None, name=None):
+    bus.send(botengine, location_object, "information_did_arrive_bed", device_object, unique_id, context_id, name, defer=defer)
+
+
+def information_did_leave_bed(botengine, location_object, device_object, unique_id=None, context_id=None, name=None, defer=False):
     """
     Information: Immediate, device-level indication that an occupant may have left the bed.
 
@@ -191,35 +123,9 @@ def information_did_leave_bed(botengine, location_object, device_object, unique_
     - unique_id: Optional subregion unique ID
     - context_id: Optional context ID
     - name: Optional subregion name; defaults to the device description
+    - defer: True to deliver this signal once at the end of the execution, coalescing identical signals
     """
     if name is None:
         name = device_object.description
 
-    # Location microservices
-    for microservice in location_object.intelligence_modules:
-        if hasattr(location_object.intelligence_modules[microservice], 'information_did_leave_bed'):
-            try:
-                import time
-                t = time.time()
-                location_object.intelligence_modules[microservice].information_did_leave_bed(
-                    botengine, device_object, unique_id, context_id, name
-                )
-                location_object.intelligence_modules[microservice].track_statistics(botengine, (time.time() - t) * 1000)
-            except Exception as e:
-                botengine.get_logger().warning("location.py - Error delivering 'information_did_leave_bed' to location microservice (continuing execution): " + str(e))
-                import traceback
-                botengine.get_logger().error(traceback.format_exc())
-
-    # Device microservices
-    for device_id in location_object.devices:
-        if hasattr(location_object.devices[device_id], "intelligence_modules"):
-            for microservice in location_object.devices[device_id].intelligence_modules:
-                if hasattr(location_object.devices[device_id].intelligence_modules[microservice], 'information_did_leave_bed'):
-                    try:
-                        location_object.devices[device_id].intelligence_modules[microservice].information_did_leave_bed(
-                            botengine, device_object, unique_id, context_id, name
-                        )
-                    except Exception as e:
-                        botengine.get_logger().warning("location.py - Error delivering 'information_did_leave_bed' message to device microservice (continuing execution): " + str(e))
-                        import traceback
-                        botengine.get_logger().error(traceback.format_exc())
+    bus.send(botengine, location_object, "information_did_leave_bed", device_object, unique_id, context_id, name, defer=defer)
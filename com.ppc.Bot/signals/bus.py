@@ -0,0 +1,139 @@
+"""
+Created on October 18, 2026
+
+This file is subject to the terms and conditions defined in the
+file 'LICENSE.txt', which is part of this source code package.
+
+Signal bus
+
+A signal is delivered by calling the method named after the signal on every location microservice and then every
+device microservice that implements it, in execution priority order. The location keeps a dispatch table of the
+microservices that implement each signal, so sending a signal doesn't have to look at every microservice.
+
+Signals that fire many times per execution can be deferred. Deferred signals are delivered once at the end of the
+execution, and a burst of identical deferred signals becomes a single call.
+"""
+
+import utilities.utilities as utilities
+
+# Maximum number of times flush() delivers signals that were deferred while flushing, before giving up
+MAX_FLUSH_PASSES = 10
+
+# Logger of this module
+_logger = utilities.LoggerHandle(__name__)
+
+
+def send(botengine, location_object, signal_name, *args, defer=False, key=None):
+    """
+    Send a signal to every location microservice and device microservice that implements it
+    :param botengine: BotEngine environment
+    :param location_object: Location object
+    :param signal_name: Name of the microservice method to call, for example 'information_did_update_targets'
+    :param args: Arguments passed to the microservice method after botengine
+    :param defer: True to deliver the signal once at the end of this execution instead of right now
+    :param key: Deferred signals with the same name and key are coalesced, and the last arguments sent are delivered.
+                The default key is the arguments themselves, so only identical signals are coalesced.
+    """
+    if not defer:
+        _deliver(botengine, location_object, signal_name, args)
+        return
+
+    if not hasattr(location_object, "_pending_signals"):
+        location_object._pending_signals = {}
+
+    if key is None:
+        key = _coalescing_key(args)
+
+    # A coalesced signal keeps the position of the first one sent
+    location_object._pending_signals[(signal_name, key)] = (signal_name, args)
+
+
+def flush(botengine, location_object):
+    """
+    Deliver the signals deferred at this location, in the order they were first sent.
+    Signals deferred while flushing are delivered too.
+    :param botengine: BotEngine environment
+    :param location_object: Location object
+    """
+    for _ in range(MAX_FLUSH_PASSES):
+        pending = getattr(location_object, "_pending_signals", None)
+        if not pending:
+            return
+
+        location_object._pending_signals = {}
+        _logger.get(botengine).debug(
+            "|flush() Delivering {} deferred signals".format(len(pending))
+        )
+        for signal_name, args in pending.values():
+            _deliver(botengine, location_object, signal_name, args)
+
+    _logger.get(botengine).warning(
+        "|flush() Signals are still being deferred after {} passes, dropping {} signals".format(
+            MAX_FLUSH_PASSES, len(location_object._pending_signals)
+        )
+    )
+    location_object._pending_signals = {}
+
+
+def _deliver(botengine, location_object, signal_name, args):
+    """
+    Deliver a signal right now
+    :param botengine: BotEngine environment
+    :param location_object: Location object
+    :param signal_name: Name of the microservice method to call
+    :param args: Tuple of arguments passed to the microservice method after botengine
+    """
+    # Location microservices
+    for handler in location_object.microservice_handlers(botengine, signal_name):
+        try:
+            import time
+
+            t = time.time()
+            handler(botengine, *args)
+            handler.__self__.track_statistics(botengine, (time.time() - t) * 1000)
+        except Exception as e:
+            _logger.get(botengine).warning(
+                "location.py - Error delivering '{}' to location microservice (continuing execution): {}".format(
+                    signal_name, str(e)
+                )
+            )
+            import traceback
+
+            _logger.get(botengine).error(traceback.format_exc())
+
+    # Device microservices
+    for handler in location_object.device_microservice_handlers(botengine, signal_name):
+        try:
+            handler(botengine, *args)
+        except Exception as e:
+            _logger.get(botengine).warning(
+                "location.py - Error delivering '{}' message to device microservice (continuing execution): {}".format(
+                    signal_name, str(e)
+                )
+            )
+            import traceback
+
+            _logger.get(botengine).error(traceback.format_exc())
+
+
+def _coalescing_key(value):
+    """
+    Hashable key that is equal for identical signal arguments.
+    Dictionaries, lists, and sets are compared by their contents, and other unhashable objects by identity.
+    :param value: Signal arguments
+    :return: Hashable key
+    """
+    if isinstance(value, dict):
+        return (dict, tuple((_coalescing_key(k), _coalescing_key(v)) for k, v in value.items()))
+
+    if isinstance(value, (list, tuple)):
+        return (type(value), tuple(_coalescing_key(v) for v in value))
+
+    if isinstance(value, (set, frozenset)):
+        return (frozenset, frozenset(_coalescing_key(v) for v in value))
+
+    try:
+        hash(value)
+        return value
+    except TypeError:
+        return (id, id(value))
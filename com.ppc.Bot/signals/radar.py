@@ -21,6 +21,8 @@ Note: Bed-related information delegators are provided at the bottom of this file
 backwards compatibility. Prefer calling `com.ppc.Bot.signals.bed` directly.
 """
 
+import signals.bus as bus
+
 # Your microservices can implement the following events:
 #
 # def did_set_subregion(self, botengine, device_object, unique_id, context_id, name)
@@ -493,7 +495,7 @@ def _enforce_name(name, context_id):
     return context_to_name(context_id)
 
 
-def did_set_subregion(botengine, location_object, device_object, unique_id, context_id, name):
+def did_set_subregion(botengine, location_object, device_object, unique_id, context_id, name, defer=False):
     """
     Subregion defined
     :param botengine:
@@ -501,38 +503,16 @@ def did_set_subregion(botengine, location_object, device_object, unique_id, cont
     :param unique_id:
     :param context_id:
     :param name:
+    :param defer: True to deliver this signal once at the end of the execution, coalescing identical signals
     :return:
     """
     name = _enforce_name(name, context_id)
 
-    # Location microservices
-    for microservice in location_object.intelligence_modules:
-        if hasattr(location_object.intelligence_modules[microservice], 'did_set_subregion'):
-            try:
-                import time
-                t = time.time()
-                location_object.intelligence_modules[microservice].did_set_subregion(botengine, device_object, unique_id, context_id, name)
-                location_object.intelligence_modules[microservice].track_statistics(botengine, (time.time() - t) * 1000)
-            except Exception as e:
-                botengine.get_logger().warning("location.py - Error delivering 'did_set_subregion' to location microservice (continuing execution): " + str(e))
-                import traceback
-                botengine.get_logger().error(traceback.format_exc())
-
-    # Device microservices
-    for device_id in location_object.devices:
-        if hasattr(location_object.devices[device_id], "intelligence_modules"):
-            for microservice in location_object.devices[device_id].intelligence_modules:
-                if hasattr(location_object.devices[device_id].intelligence_modules[microservice], 'did_set_subregion'):
-                    try:
-                        location_object.devices[device_id].intelligence_modules[microservice].did_set_subregion(botengine, device_object, unique_id, context_id, name)
-                    except Exception as e:
-                        botengine.get_logger().warning("location.py - Error delivering 'did_set_subregion' message to device microservice (continuing execution): " + str(e))
-                        import traceback
-                        botengine.get_logger().error(traceback.format_exc())
+    bus.send(botengine, location_object, "did_set_subregion", device_object, unique_id, context_id, name, defer=defer)
     return
 
 
-def did_delete_subregion(botengine, location_object, device_object, unique_id):
+def did_delete_subregion(botengine, location_object, device_object, unique_id, defer=False):
     """
     Subregion deleted
     Triggers the event: did_delete_subregion(botengine, device_object, unique_id)
@@ -541,137 +521,49 @@ def did_delete_subregion(botengine, location_object, device_object, unique_id):
     :param botengine:
     :param device_object:
     :param unique_id:
+    :param defer: True to deliver this signal once at the end of the execution, coalescing identical signals
     :return:
     """
-    # Location microservices
-    for microservice in location_object.intelligence_modules:
-        if hasattr(location_object.intelligence_modules[microservice], 'did_delete_subregion'):
-            try:
-                import time
-                t = time.time()
-                location_object.intelligence_modules[microservice].did_delete_subregion(botengine, device_object, unique_id)
-                location_object.intelligence_modules[microservice].track_statistics(botengine, (time.time() - t) * 1000)
-            except Exception as e:
-                botengine.get_logger().warning("location.py - Error delivering 'did_delete_subregion' to location microservice (continuing execution): " + str(e))
-                import traceback
-                botengine.get_logger().error(traceback.format_exc())
-
-    # Device microservices
-    for device_id in location_object.devices:
-        if hasattr(location_object.devices[device_id], "intelligence_modules"):
-            for microservice in location_object.devices[device_id].intelligence_modules:
-                if hasattr(location_object.devices[device_id].intelligence_modules[microservice], 'did_delete_subregion'):
-                    try:
-                        location_object.devices[device_id].intelligence_modules[microservice].did_delete_subregion(botengine, device_object, unique_id)
-                    except Exception as e:
-                        botengine.get_logger().warning("location.py - Error delivering 'did_delete_subregion' message to device microservice (continuing execution): " + str(e))
-                        import traceback
-                        botengine.get_logger().error(traceback.format_exc())
+    bus.send(botengine, location_object, "did_delete_subregion", device_object, unique_id, defer=defer)
     return
 
-def information_did_update_targets(botengine, location_object, device_object, targets):
+def information_did_update_targets(botengine, location_object, device_object, targets, defer=False):
     """
     Signal that these targets passed through our filters.
     :param botengine: BotEngine
     :param location_object: Location Object
     :param device_object: Device Object
     :param targets: Targets that passed through all filters and ignorable subregions, in the form { 'target_id': { 'x': x, 'y': y, 'z': z } }
+    :param defer: True to deliver this signal once at the end of the execution, coalescing identical signals
     """
-    # Location microservices
-    for microservice in location_object.intelligence_modules:
-        if hasattr(location_object.intelligence_modules[microservice], 'information_did_update_targets'):
-            try:
-                import time
-                t = time.time()
-                location_object.intelligence_modules[microservice].information_did_update_targets(botengine, device_object, targets)
-                location_object.intelligence_modules[microservice].track_statistics(botengine, (time.time() - t) * 1000)
-            except Exception as e:
-                botengine.get_logger().warning("location.py - Error delivering 'information_did_update_targets' to location microservice (continuing execution): " + str(e))
-                import traceback
-                botengine.get_logger().error(traceback.format_exc())
-
-    # Device microservices
-    for device_id in location_object.devices:
-        if hasattr(location_object.devices[device_id], "intelligence_modules"):
-            for microservice in location_object.devices[device_id].intelligence_modules:
-                if hasattr(location_object.devices[device_id].intelligence_modules[microservice], 'information_did_update_targets'):
-                    try:
-                        location_object.devices[device_id].intelligence_modules[microservice].information_did_update_targets(botengine, device_object, targets)
-                    except Exception as e:
-                        botengine.get_logger().warning("location.py - Error delivering 'information_did_update_targets' message to device microservice (continuing execution): " + str(e))
-                        import traceback
-                        botengine.get_logger().error(traceback.format_exc())
-
-
-def information_did_update_radar_occupants(botengine, location_object, device_object, total_occupants):
+    bus.send(botengine, location_object, "information_did_update_targets", device_object, targets, defer=defer)
+
+
+def information_did_update_radar_occupants(botengine, location_object, device_object, total_occupants, defer=False):
     """
     Captured instantaneous information about the occupants observed near this Radar device
     :param botengine: BotEngine environment
     :param location_object: Location object
     :param device_object: Device object
     :param total_occupants: Information about total occupants observed at this Radar
+    :param defer: True to deliver this signal once at the end of the execution, coalescing identical signals
     """
-    # Location microservices
-    for microservice in location_object.intelligence_modules:
-        if hasattr(location_object.intelligence_modules[microservice], 'information_did_update_radar_occupants'):
-            try:
-                import time
-                t = time.time()
-                location_object.intelligence_modules[microservice].information_did_update_radar_occupants(botengine, device_object, total_occupants)
-                location_object.intelligence_modules[microservice].track_statistics(botengine, (time.time() - t) * 1000)
-            except Exception as e:
-                botengine.get_logger().warning("location.py - Error delivering 'information_did_update_radar_occupants' to location microservice (continuing execution): " + str(e))
-                import traceback
-                botengine.get_logger().error(traceback.format_exc())
-
-    # Device microservices
-    for device_id in location_object.devices:
-        if hasattr(location_object.devices[device_id], "intelligence_modules"):
-            for microservice in location_object.devices[device_id].intelligence_modules:
-                if hasattr(location_object.devices[device_id].intelligence_modules[microservice], 'information_did_update_radar_occupants'):
-                    try:
-                        location_object.devices[device_id].intelligence_modules[microservice].information_did_update_radar_occupants(botengine, device_object, total_occupants)
-                    except Exception as e:
-                        botengine.get_logger().warning("location.py - Error delivering 'information_did_update_radar_occupants' message to device microservice (continuing execution): " + str(e))
-                        import traceback
-                        botengine.get_logger().error(traceback.format_exc())
-
-
-def knowledge_did_update_radar_occupants(botengine, location_object, device_object, total_occupants):
+    bus.send(botengine, location_object, "information_did_update_radar_occupants", device_object, total_occupants, defer=defer)
+
+
+def knowledge_did_update_radar_occupants(botengine, location_object, device_object, total_occupants, defer=False):
     """
     Gained more refined knowledge over time of the occupants observed near this Radar device
     :param botengine: BotEngine environment
     :param location_object: Location object
     :param device_object: Device object
     :param total_occupants: Knowledge of total occupants observed at this Radar device
+    :param defer: True to deliver this signal once at the end of the execution, coalescing identical signals
     """
-    # Location microservices
-    for microservice in location_object.intelligence_modules:
-        if hasattr(location_object.intelligence_modules[microservice], 'knowledge_did_update_radar_occupants'):
-            try:
-                import time
-                t = time.time()
-                location_object.intelligence_modules[microservice].knowledge_did_update_radar_occupants(botengine, device_object, total_occupants)
-                location_object.intelligence_modules[microservice].track_statistics(botengine, (time.time() - t) * 1000)
-            except Exception as e:
-                botengine.get_logger().warning("location.py - Error delivering 'knowledge_did_update_radar_occupants' to location microservice (continuing execution): " + str(e))
-                import traceback
-                botengine.get_logger().error(traceback.format_exc())
-
-    # Device microservices
-    for device_id in location_object.devices:
-        if hasattr(location_object.devices[device_id], "intelligence_modules"):
-            for microservice in location_object.devices[device_id].intelligence_modules:
-                if hasattr(location_object.devices[device_id].intelligence_modules[microservice], 'knowledge_did_update_radar_occupants'):
-                    try:
-                        location_object.devices[device_id].intelligence_modules[microservice].knowledge_did_update_radar_occupants(botengine, device_object, total_occupants)
-                    except Exception as e:
-                        botengine.get_logger().warning("location.py - Error delivering 'knowledge_did_update_radar_occupants' message to device microservice (continuing execution): " + str(e))
-                        import traceback
-                        botengine.get_logger().error(traceback.format_exc())
-
-
-def information_fall_status_updated(botengine, location_object, device_object, targets, fall_status):
+    bus.send(botengine, location_object, "knowledge_did_update_radar_occupants", device_object, total_occupants, defer=defer)
+
+
+def information_fall_status_updated(botengine, location_object, device_object, targets, fall_status, defer=False):
     """
     Detected a fall status change for the given targets
 
@@ -682,34 +574,12 @@ def information_fall_status_updated(botengine, location_object, device_object, t
     :param device_object: Device object
     :param targets: Dictionary of targets that meet the qualifications for a fall detect
     :param fall_status: Radar fall status
+    :param defer: True to deliver this signal once at the end of the execution, coalescing identical signals
     """
-    # Location microservices
-    for microservice in location_object.intelligence_modules:
-        if hasattr(location_object.intelligence_modules[microservice], 'information_fall_status_updated'):
-            try:
-                import time
-                t = time.time()
-                location_object.intelligence_modules[microservice].information_fall_status_updated(botengine, device_object, targets, fall_status)
-                location_object.intelligence_modules[microservice].track_statistics(botengine, (time.time() - t) * 1000)
-            except Exception as e:
-                botengine.get_logger().warning("location.py - Error delivering 'information_fall_status_updated' to location microservice (continuing execution): " + str(e))
-                import traceback
-                botengine.get_logger().error(traceback.format_exc())
-
-    # Device microservices
-    for device_id in location_object.devices:
-        if hasattr(location_object.devices[device_id], "intelligence_modules"):
-            for microservice in location_object.devices[device_id].intelligence_modules:
-                if hasattr(location_object.devices[device_id].intelligence_modules[microservice], 'information_fall_status_updated'):
-                    try:
-                        location_object.devices[device_id].intelligence_modules[microservice].information_fall_status_updated(botengine, device_object, targets, fall_status)
-                    except Exception as e:
-                        botengine.get_logger().warning("location.py - Error delivering 'information_fall_status_updated' message to device microservice (continuing execution): " + str(e))
-                        import traceback
-                        botengine.get_logger().error(traceback.format_exc())
-
-
-def information_did_arrive_bed(botengine, location_object, device_object, unique_id, context_id, name):
+    bus.send(botengine, location_object, "information_fall_status_updated", device_object, targets, fall_status, defer=defer)
+
+
+def information_did_arrive_bed(botengine, location_object, device_object, unique_id, context_id, name, defer=False):
     """
     Information: Signal throughout all microservices that an occupant was seen entering this subregion
     :param botengine: BotEngine
@@ -718,36 +588,14 @@ def information_did_arrive_bed(botengine, location_object, device_object, unique
     :param subregion_id: Subregion ID
     :param context_id: Context ID
     :param name: Name of the subregion, None if not given
+    :param defer: True to deliver this signal once at the end of the execution, coalescing identical signals
     """
     name = _enforce_name(name, context_id)
 
-    # Location microservices
-    for microservice in location_object.intelligence_modules:
-        if hasattr(location_object.intelligence_modules[microservice], 'information_did_arrive_bed'):
-            try:
-                import time
-                t = time.time()
-                location_object.intelligence_modules[microservice].information_did_arrive_bed(botengine, device_object, unique_id, context_id, name)
-                location_object.intelligence_modules[microservice].track_statistics(botengine, (time.time() - t) * 1000)
-            except Exception as e:
-                botengine.get_logger().warning("location.py - Error delivering 'information_did_arrive_bed' to location microservice (continuing execution): " + str(e))
-                import traceback
-                botengine.get_logger().error(traceback.format_exc())
-
-    # Device microservices
-    for device_id in location_object.devices:
-        if hasattr(location_object.devices[device_id], "intelligence_modules"):
-            for microservice in location_object.devices[device_id].intelligence_modules:
-                if hasattr(location_object.devices[device_id].intelligence_modules[microservice], 'information_did_arrive_bed'):
-                    try:
-                        location_object.devices[device_id].intelligence_modules[microservice].information_did_arrive_bed(botengine, device_object, unique_id, context_id, name)
-                    except Exception as e:
-                        botengine.get_logger().warning("location.py - Error delivering 'information_did_arrive_bed' message to device microservice (continuing execution): " + str(e))
-                        import traceback
-                        botengine.get_logger().error(traceback.format_exc())
-
-
-def information_did_leave_bed(botengine, location_object, device_object, unique_id, context_id, name):
+    bus.send(botengine, location_object, "information_did_arrive_bed", device_object, unique_id, context_id, name, defer=defer)
+
+
+def information_did_leave_bed(botengine, location_object, device_object, unique_id, context_id, name, defer=False):
     """
     Information: Signal throughout all microservices that an occupant was seen leaving this subregion
     :param botengine: BotEngine
@@ -755,33 +603,11 @@ def information_did_leave_bed(botengine, location_object, device_object, unique_
     :param device_object: Device object
     :param context_id: Context ID
     :param name: Name of the subregion, None if not given
+    :param defer: True to deliver this signal once at the end of the execution, coalescing identical signals
     """
     name = _enforce_name(name, context_id)
 
-    # Location microservices
-    for microservice in location_object.intelligence_modules:
-        if hasattr(location_object.intelligence_modules[microservice], 'information_did_leave_bed'):
-            try:
-                import time
-                t = time.time()
-                location_object.intelligence_modules[microservice].information_did_leave_bed(botengine, device_object, unique_id, context_id, name)
-                location_object.intelligence_modules[microservice].track_statistics(botengine, (time.time() - t) * 1000)
-            except Exception as e:
-                botengine.get_logger().warning("location.py - Error delivering 'information_did_leave_bed' to location microservice (continuing execution): " + str(e))
-                import traceback
-                botengine.get_logger().error(traceback.format_exc())
-
-    # Device microservices
-    for device_id in location_object.devices:
-        if hasattr(location_object.devices[device_id], "intelligence_modules"):
-            for microservice in location_object.devices[device_id].intelligence_modules:
-                if hasattr(location_object.devices[device_id].intelligence_modules[microservice], 'information_did_leave_bed'):
-                    try:
-                        location_object.devices[device_id].intelligence_modules[microservice].information_did_leave_bed(botengine, device_object, unique_id, context_id, name)
-                    except Exception as e:
-                        botengine.get_logger().warning("location.py - Error delivering 'information_did_leave_bed' message to device microservice (continuing execution): " + str(e))
-                        import traceback
-                        botengine.get_logger().error(traceback.format_exc())
+    bus.send(botengine, location_object, "information_did_leave_bed", device_object, unique_id, context_id, name, defer=defer)
 
 
 def knowledge_did_arrive_bed(botengine, location_object, device_object, unique_id=None, context_id=None, name=None):
@@ -818,7 +644,7 @@ def knowledge_did_leave_bed(botengine, location_object, device_object, unique_id
     bed.knowledge_did_leave_bed(botengine, location_object, device_object, unique_id, context_id, name)
 
 
-def information_did_arrive_toilet(botengine, location_object, device_object, unique_id, context_id, name):
+def information_did_arrive_toilet(botengine, location_object, device_object, unique_id, context_id, name, defer=False):
     """
     Signal throughout all microservices that an occupant was seen entering this region
     :param botengine: BotEngine
@@ -827,36 +653,14 @@ def information_did_arrive_toilet(botengine, location_object, device_object, uni
     :param subregion_id: Subregion ID
     :param context_id: Context ID
     :param name: Name of the subregion, None if not given
+    :param defer: True to deliver this signal once at the end of the execution, coalescing identical signals
     """
     name = _enforce_name(name, context_id)
 
-    # Location microservices
-    for microservice in location_object.intelligence_modules:
-        if hasattr(location_object.intelligence_modules[microservice], 'information_did_arrive_toilet'):
-            try:
-                import time
-                t = time.time()
-                location_object.intelligence_modules[microservice].information_did_arrive_toilet(botengine, device_object, unique_id, context_id, name)
-                location_object.intelligence_modules[microservice].track_statistics(botengine, (time.time() - t) * 1000)
-            except Exception as e:
-                botengine.get_logger().warning("location.py - Error delivering 'information_did_arrive_toilet' to location microservice (continuing execution): " + str(e))
-                import traceback
-                botengine.get_logger().error(traceback.format_exc())
-
-    # Device microservices
-    for device_id in location_object.devices:
-        if hasattr(location_object.devices[device_id], "intelligence_modules"):
-            for microservice in location_object.devices[device_id].intelligence_modules:
-                if hasattr(location_object.devices[device_id].intelligence_modules[microservice], 'information_did_arrive_toilet'):
-                    try:
-                        location_object.devices[device_id].intelligence_modules[microservice].information_did_arrive_toilet(botengine, device_object, unique_id, context_id, name)
-                    except Exception as e:
-                        botengine.get_logger().warning("location.py - Error delivering 'information_did_arrive_toilet' message to device microservice (continuing execution): " + str(e))
-                        import traceback
-                        botengine.get_logger().error(traceback.format_exc())
-
-
-def information_did_leave_toilet(botengine, location_object, device_object, unique_id, context_id, name):
+    bus.send(botengine, location_object, "information_did_arrive_toilet", device_object, unique_id, context_id, name, defer=defer)
+
+
+def information_did_leave_toilet(botengine, location_object, device_object, unique_id, context_id, name, defer=False):
     """
     Signal throughout all microservices that an occupant was seen leaving this region
     :param botengine: BotEngine
@@ -865,36 +669,14 @@ def information_did_leave_toilet(botengine, location_object, device_object, uniq
     :param subregion_id: Subregion ID
     :param context_id: Context ID
     :param name: Name of the subregion, None if not given
+    :param defer: True to deliver this signal once at the end of the execution, coalescing identical signals
     """
     name = _enforce_name(name, context_id)
 
-    # Location microservices
-    for microservice in location_object.intelligence_modules:
-        if hasattr(location_object.intelligence_modules[microservice], 'information_did_leave_toilet'):
-            try:
-                import time
-                t = time.time()
-                location_object.intelligence_modules[microservice].information_did_leave_toilet(botengine, device_object, unique_id, context_id, name)
-                location_object.intelligence_modules[microservice].track_statistics(botengine, (time.time() - t) * 1000)
-            except Exception as e:
-                botengine.get_logger().warning("location.py - Error delivering 'information_did_leave_toilet' to location microservice (continuing execution): " + str(e))
-                import traceback
-                botengine.get_logger().error(traceback.format_exc())
-
-    # Device microservices
-    for device_id in location_object.devices:
-        if hasattr(location_object.devices[device_id], "intelligence_modules"):
-            for microservice in location_object.devices[device_id].intelligence_modules:
-                if hasattr(location_object.devices[device_id].intelligence_modules[microservice], 'information_did_leave_toilet'):
-                    try:
-                        location_object.devices[device_id].intelligence_modules[microservice].information_did_leave_toilet(botengine, device_object, unique_id, context_id, name)
-                    except Exception as e:
-                        botengine.get_logger().warning("location.py - Error delivering 'information_did_leave_toilet' message to device microservice (continuing execution): " + str(e))
-                        import traceback
-                        botengine.get_logger().error(traceback.format_exc())
-
-
-def knowledge_did_arrive_shower(botengine, location_object, device_object, unique_id, context_id, name):
+    bus.send(botengine, location_object, "information_did_leave_toilet", device_object, unique_id, context_id, name, defer=defer)
+
+
+def knowledge_did_arrive_shower(botengine, location_object, device_object, unique_id, context_id, name, defer=False):
     """
     Knowledge: Signal throughout all microservices that an occupant was seen entering the shower recently
     :param botengine: BotEngine
@@ -903,36 +685,14 @@ def knowledge_did_arrive_shower(botengine, location_object, device_object, uniqu
     :param subregion_id: Subregion ID
     :param context_id: Context ID
     :param name: Name of the subregion, None if not given
+    :param defer: True to deliver this signal once at the end of the execution, coalescing identical signals
     """
     name = _enforce_name(name, context_id)
 
-    # Location microservices
-    for microservice in location_object.intelligence_modules:
-        if hasattr(location_object.intelligence_modules[microservice], 'knowledge_did_arrive_shower'):
-            try:
-                import time
-                t = time.time()
-                location_object.intelligence_modules[microservice].knowledge_did_arrive_shower(botengine, device_object, unique_id, context_id, name)
-                location_object.intelligence_modules[microservice].track_statistics(botengine, (time.time() - t) * 1000)
-            except Exception as e:
-                botengine.get_logger().warning("location.py - Error delivering 'knowledge_did_arrive_shower' to location microservice (continuing execution): " + str(e))
-                import traceback
-                botengine.get_logger().error(traceback.format_exc())
-
-    # Device microservices
-    for device_id in location_object.devices:
-        if hasattr(location_object.devices[device_id], "intelligence_modules"):
-            for microservice in location_object.devices[device_id].intelligence_modules:
-                if hasattr(location_object.devices[device_id].intelligence_modules[microservice], 'knowledge_did_arrive_shower'):
-                    try:
-                        location_object.devices[device_id].intelligence_modules[microservice].knowledge_did_arrive_shower(botengine, device_object, unique_id, context_id, name)
-                    except Exception as e:
-                        botengine.get_logger().warning("location.py - Error delivering 'knowledge_did_arrive_shower' message to device microservice (continuing execution): " + str(e))
-                        import traceback
-                        botengine.get_logger().error(traceback.format_exc())
-
-
-def knowledge_did_leave_shower(botengine, location_object, device_object, unique_id, context_id, name):
+    bus.send(botengine, location_object, "knowledge_did_arrive_shower", device_object, unique_id, context_id, name, defer=defer)
+
+
+def knowledge_did_leave_shower(botengine, location_object, device_object, unique_id, context_id, name, defer=False):
     """
     Knowledge: Signal throughout all microservices that an occupant was seen leaving the shower recently
     :param botengine: BotEngine
@@ -941,36 +701,14 @@ def knowledge_did_leave_shower(botengine, location_object, device_object, unique
     :param subregion_id: Subregion ID
     :param context_id: Context ID
     :param name: Name of the subregion, None if not given
+    :param defer: True to deliver this signal once at the end of the execution, coalescing identical signals
     """
     name = _enforce_name(name, context_id)
 
-    # Location microservices
-    for microservice in location_object.intelligence_modules:
-        if hasattr(location_object.intelligence_modules[microservice], 'knowledge_did_leave_shower'):
-            try:
-                import time
-                t = time.time()
-                location_object.intelligence_modules[microservice].knowledge_did_leave_shower(botengine, device_object, unique_id, context_id, name)
-                location_object.intelligence_modules[microservice].track_statistics(botengine, (time.time() - t) * 1000)
-            except Exception as e:
-                botengine.get_logger().warning("location.py - Error delivering 'knowledge_did_leave_shower' to location microservice (continuing execution): " + str(e))
-                import traceback
-                botengine.get_logger().error(traceback.format_exc())
-
-    # Device microservices
-    for device_id in location_object.devices:
-        if hasattr(location_object.devices[device_id], "intelligence_modules"):
-            for microservice in location_object.devices[device_id].intelligence_modules:
-                if hasattr(location_object.devices[device_id].intelligence_modules[microservice], 'knowledge_did_leave_shower'):
-                    try:
-                        location_object.devices[device_id].intelligence_modules[microservice].knowledge_did_leave_shower(botengine, device_object, unique_id, context_id, name)
-                    except Exception as e:
-                        botengine.get_logger().warning("location.py - Error delivering 'knowledge_did_leave_shower' message to device microservice (continuing execution): " + str(e))
-                        import traceback
-                        botengine.get_logger().error(traceback.format_exc())
-
-
-def information_did_arrive_shower(botengine, location_object, device_object, unique_id, context_id, name):
+    bus.send(botengine, location_object, "knowledge_did_leave_shower", device_object, unique_id, context_id, name, defer=defer)
+
+
+def information_did_arrive_shower(botengine, location_object, device_object, unique_id, context_id, name, defer=False):
     """
     Signal throughout all microservices that an occupant was seen entering this region
     :param botengine: BotEngine
@@ -979,36 +717,14 @@ def information_did_arrive_shower(botengine, location_object, device_object, uni
     :param subregion_id: Subregion ID
     :param context_id: Context ID
     :param name: Name of the subregion, None if not given
+    :param defer: True to deliver this signal once at the end of the execution, coalescing identical signals
     """
     name = _enforce_name(name, context_id)
 
-    # Location microservices
-    for microservice in location_object.intelligence_modules:
-        if hasattr(location_object.intelligence_modules[microservice], 'information_did_arrive_shower'):
-            try:
-                import time
-                t = time.time()
-                location_object.intelligence_modules[microservice].information_did_arrive_shower(botengine, device_object, unique_id, context_id, name)
-                location_object.intelligence_modules[microservice].track_statistics(botengine, (time.time() - t) * 1000)
-            except Exception as e:
-                botengine.get_logger().warning("location.py - Error delivering 'information_did_arrive_shower' to location microservice (continuing execution): " + str(e))
-                import traceback
-                botengine.get_logger().error(traceback.format_exc())
-
-    # Device microservices
-    for device_id in location_object.devices:
-        if hasattr(location_object.devices[device_id], "intelligence_modules"):
-            for microservice in location_object.devices[device_id].intelligence_modules:
-                if hasattr(location_object.devices[device_id].intelligence_modules[microservice], 'information_did_arrive_shower'):
-                    try:
-                        location_object.devices[device_id].intelligence_modules[microservice].information_did_arrive_shower(botengine, device_object, unique_id, context_id, name)
-                    except Exception as e:
-                        botengine.get_logger().warning("location.py - Error delivering 'information_did_arrive_shower' message to device microservice (continuing execution): " + str(e))
-                        import traceback
-                        botengine.get_logger().error(traceback.format_exc())
-
-
-def information_did_leave_shower(botengine, location_object, device_object, unique_id, context_id, name):
+    bus.send(botengine, location_object, "information_did_arrive_shower", device_object, unique_id, context_id, name, defer=defer)
+
+
+def information_did_leave_shower(botengine, location_object, device_object, unique_id, context_id, name, defer=False):
     """
     Signal throughout all microservices that an occupant was seen leaving this region
     :param botengine: BotEngine
@@ -1017,36 +733,14 @@ def information_did_leave_shower(botengine, location_object, device_object, uniq
     :param subregion_id: Subregion ID
     :param context_id: Context ID
     :param name: Name of the subregion, None if not given
+    :param defer: True to deliver this signal once at the end of the execution, coalescing identical signals
     """
     name = _enforce_name(name, context_id)
 
-    # Location microservices
-    for microservice in location_object.intelligence_modules:
-        if hasattr(location_object.intelligence_modules[microservice], 'information_did_leave_shower'):
-            try:
-                import time
-                t = time.time()
-                location_object.intelligence_modules[microservice].information_did_leave_shower(botengine, device_object, unique_id, context_id, name)
-                location_object.intelligence_modules[microservice].track_statistics(botengine, (time.time() - t) * 1000)
-            except Exception as e:
-                botengine.get_logger().warning("location.py - Error delivering 'information_did_leave_shower' to location microservice (continuing execution): " + str(e))
-                import traceback
-                botengine.get_logger().error(traceback.format_exc())
-
-    # Device microservices
-    for device_id in location_object.devices:
-        if hasattr(location_object.devices[device_id], "intelligence_modules"):
-            for microservice in location_object.devices[device_id].intelligence_modules:
-                if hasattr(location_object.devices[device_id].intelligence_modules[microservice], 'information_did_leave_shower'):
-                    try:
-                        location_object.devices[device_id].intelligence_modules[microservice].information_did_leave_shower(botengine, device_object, unique_id, context_id, name)
-                    except Exception as e:
-                        botengine.get_logger().warning("location.py - Error delivering 'information_did_leave_shower' message to device microservice (continuing execution): " + str(e))
-                        import traceback
-                        botengine.get_logger().error(traceback.format_exc())
-
-
-def knowledge_did_arrive_chair(botengine, location_object, device_object, unique_id, context_id, name):
+    bus.send(botengine, location_object, "information_did_leave_shower", device_object, unique_id, context_id, name, defer=defer)
+
+
+def knowledge_did_arrive_chair(botengine, location_object, device_object, unique_id, context_id, name, defer=False):
     """
     Knowledge: Signal throughout all microservices that an occupant was seen entering the chair recently
     :param botengine: BotEngine
@@ -1055,36 +749,14 @@ def knowledge_did_arrive_chair(botengine, location_object, device_object, unique
     :param subregion_id: Subregion ID
     :param context_id: Context ID
     :param name: Name of the subregion, None if not given
+    :param defer: True to deliver this signal once at the end of the execution, coalescing identical signals
     """
     name = _enforce_name(name, context_id)
 
-    # Location microservices
-    for microservice in location_object.intelligence_modules:
-        if hasattr(location_object.intelligence_modules[microservice], 'knowledge_did_arrive_chair'):
-            try:
-                import time
-                t = time.time()
-                location_object.intelligence_modules[microservice].knowledge_did_arrive_chair(botengine, device_object, unique_id, context_id, name)
-                location_object.intelligence_modules[microservice].track_statistics(botengine, (time.time() - t) * 1000)
-            except Exception as e:
-                botengine.get_logger().warning("location.py - Error delivering 'knowledge_did_arrive_chair' to location microservice (continuing execution): " + str(e))
-                import traceback
-                botengine.get_logger().error(traceback.format_exc())
-
-    # Device microservices
-    for device_id in location_object.devices:
-        if hasattr(location_object.devices[device_id], "intelligence_modules"):
-            for microservice in location_object.devices[device_id].intelligence_modules:
-                if hasattr(location_object.devices[device_id].intelligence_modules[microservice], 'knowledge_did_arrive_chair'):
-                    try:
-                        location_object.devices[device_id].intelligence_modules[microservice].knowledge_did_arrive_chair(botengine, device_object, unique_id, context_id, name)
-                    except Exception as e:
-                        botengine.get_logger().warning("location.py - Error delivering 'knowledge_did_arrive_chair' message to device microservice (continuing execution): " + str(e))
-                        import traceback
-                        botengine.get_logger().error(traceback.format_exc())
-
-
-def knowledge_did_leave_chair(botengine, location_object, device_object, unique_id, context_id, name):
+    bus.send(botengine, location_object, "knowledge_did_arrive_chair", device_object, unique_id, context_id, name, defer=defer)
+
+
+def knowledge_did_leave_chair(botengine, location_object, device_object, unique_id, context_id, name, defer=False):
     """
     Knowledge: Signal throughout all microservices that an occupant was seen leaving the chair recently
     :param botengine: BotEngine
@@ -1093,36 +765,14 @@ def knowledge_did_leave_chair(botengine, location_object, device_object, unique_
     :param subregion_id: Subregion ID
     :param context_id: Context ID
     :param name: Name of the subregion, None if not given
+    :param defer: True to deliver this signal once at the end of the execution, coalescing identical signals
     """
     name = _enforce_name(name, context_id)
 
-    # Location microservices
-    for microservice in location_object.intelligence_modules:
-        if hasattr(location_object.intelligence_modules[microservice], 'knowledge_did_leave_chair'):
-            try:
-                import time
-                t = time.time()
-                location_object.intelligence_modules[microservice].knowledge_did_leave_chair(botengine, device_object, unique_id, context_id, name)
-                location_object.intelligence_modules[microservice].track_statistics(botengine, (time.time() - t) * 1000)
-            except Exception as e:
-                botengine.get_logger().warning("location.py - Error delivering 'knowledge_did_leave_chair' to location microservice (continuing execution): " + str(e))
-                import traceback
-                botengine.get_logger().error(traceback.format_exc())
-
-    # Device microservices
-    for device_id in location_object.devices:
-        if hasattr(location_object.devices[device_id], "intelligence_modules"):
-            for microservice in location_object.devices[device_id].intelligence_modules:
-                if hasattr(location_object.devices[device_id].intelligence_modules[microservice], 'knowledge_did_leave_chair'):
-                    try:
-                        location_object.devices[device_id].intelligence_modules[microservice].knowledge_did_leave_chair(botengine, device_object, unique_id, context_id, name)
-                    except Exception as e:
-                        botengine.get_logger().warning("location.py - Error delivering 'knowledge_did_leave_chair' message to device microservice (continuing execution): " + str(e))
-                        import traceback
-                        botengine.get_logger().error(traceback.format_exc())
-
-
-def information_did_arrive_chair(botengine, location_object, device_object, unique_id, context_id, name):
+    bus.send(botengine, location_object, "knowledge_did_leave_chair", device_object, unique_id, context_id, name, defer=defer)
+
+
+def information_did_arrive_chair(botengine, location_object, device_object, unique_id, context_id, name, defer=False):
     """
     Signal throughout all microservices that an occupant was seen entering this region
     :param botengine: BotEngine
@@ -1131,36 +781,14 @@ def information_did_arrive_chair(botengine, location_object, device_object, uniq
     :param subregion_id: Subregion ID
     :param context_id: Context ID
     :param name: Name of the subregion, None if not given
+    :param defer: True to deliver this signal once at the end of the execution, coalescing identical signals
     """
     name = _enforce_name(name, context_id)
 
-    # Location microservices
-    for microservice in location_object.intelligence_modules:
-        if hasattr(location_object.intelligence_modules[microservice], 'information_did_arrive_chair'):
-            try:
-                import time
-                t = time.time()
-                location_object.intelligence_modules[microservice].information_did_arrive_chair(botengine, device_object, unique_id, context_id, name)
-                location_object.intelligence_modules[microservice].track_statistics(botengine, (time.time() - t) * 1000)
-            except Exception as e:
-                botengine.get_logger().warning("location.py - Error delivering 'information_did_arrive_chair' to location microservice (continuing execution): " + str(e))
-                import traceback
-                botengine.get_logger().error(traceback.format_exc())
-
-    # Device microservices
-    for device_id in location_object.devices:
-        if hasattr(location_object.devices[device_id], "intelligence_modules"):
-            for microservice in location_object.devices[device_id].intelligence_modules:
-                if hasattr(location_object.devices[device_id].intelligence_modules[microservice], 'information_did_arrive_chair'):
-                    try:
-                        location_object.devices[device_id].intelligence_modules[microservice].information_did_arrive_chair(botengine, device_object, unique_id, context_id, name)
-                    except Exception as e:
-                        botengine.get_logger().warning("location.py - Error delivering 'information_did_arrive_chair' message to device microservice (continuing execution): " + str(e))
-                        import traceback
-                        botengine.get_logger().error(traceback.format_exc())
-
-
-def information_did_leave_chair(botengine, location_object, device_object, unique_id, context_id, name):
+    bus.send(botengine, location_object, "information_did_arrive_chair", device_object, unique_id, context_id, name, defer=defer)
+
+
+def information_did_leave_chair(botengine, location_object, device_object, unique_id, context_id, name, defer=False):
     """
     Signal throughout all microservices that an occupant was seen leaving this region
     :param botengine: BotEngine
@@ -1169,36 +797,14 @@ def information_did_leave_chair(botengine, location_object, device_object, uniqu
     :param subregion_id: Subregion ID
     :param context_id: Context ID
     :param name: Name of the subregion, None if not given
+    :param defer: True to deliver this signal once at the end of the execution, coalescing identical signals
     """
     name = _enforce_name(name, context_id)
 
-    # Location microservices
-    for microservice in location_object.intelligence_modules:
-        if hasattr(location_object.intelligence_modules[microservice], 'information_did_leave_chair'):
-            try:
-                import time
-                t = time.time()
-                location_object.intelligence_modules[microservice].information_did_leave_chair(botengine, device_object, unique_id, context_id, name)
-                location_object.intelligence_modules[microservice].track_statistics(botengine, (time.time() - t) * 1000)
-            except Exception as e:
-                botengine.get_logger().warning("location.py - Error delivering 'information_did_leave_chair' to location microservice (continuing execution): " + str(e))
-                import traceback
-                botengine.get_logger().error(traceback.format_exc())
-
-    # Device microservices
-    for device_id in location_object.devices:
-        if hasattr(location_object.devices[device_id], "intelligence_modules"):
-            for microservice in location_object.devices[device_id].intelligence_modules:
-                if hasattr(location_object.devices[device_id].intelligence_modules[microservice], 'information_did_leave_chair'):
-                    try:
-                        location_object.devices[device_id].intelligence_modules[microservice].information_did_leave_chair(botengine, device_object, unique_id, context_id, name)
-                    except Exception as e:
-                        botengine.get_logger().warning("location.py - Error delivering 'information_did_leave_chair' message to device microservice (continuing execution): " + str(e))
-                        import traceback
-                        botengine.get_logger().error(traceback.format_exc())
-
-
-def did_start_detecting_visitor(botengine, location_object):
+    bus.send(botengine, location_object, "information_did_leave_chair", device_object, unique_id, context_id, name, defer=defer)
+
+
+def did_start_detecting_visitor(botengine, location_object, defer=False):
     """
     Signal throughout all microservices that 2 or more people are reliably detected in the home
     :param botengine: BotEngine
@@ -1207,34 +813,12 @@ def did_start_detecting_visitor(botengine, location_object):
     :param subregion_id: Subregion ID
     :param context_id: Context ID
     :param name: Name of the subregion, None if not given
+    :param defer: True to deliver this signal once at the end of the execution, coalescing identical signals
     """
-    # Location microservices
-    for microservice in location_object.intelligence_modules:
-        if hasattr(location_object.intelligence_modules[microservice], 'did_start_detecting_visitor'):
-            try:
-                import time
-                t = time.time()
-                location_object.intelligence_modules[microservice].did_start_detecting_visitor(botengine)
-                location_object.intelligence_modules[microservice].track_statistics(botengine, (time.time() - t) * 1000)
-            except Exception as e:
-                botengine.get_logger().warning("location.py - Error delivering 'did_start_detecting_visitor' to location microservice (continuing execution): " + str(e))
-                import traceback
-                botengine.get_logger().error(traceback.format_exc())
-
-    # Device microservices
-    for device_id in location_object.devices:
-        if hasattr(location_object.devices[device_id], "intelligence_modules"):
-            for microservice in location_object.devices[device_id].intelligence_modules:
-                if hasattr(location_object.devices[device_id].intelligence_modules[microservice], 'did_start_detecting_visitor'):
-                    try:
-                        location_object.devices[device_id].intelligence_modules[microservice].did_start_detecting_visitor(botengine)
-                    except Exception as e:
-                        botengine.get_logger().warning("location.py - Error delivering 'did_start_detecting_visitor' message to device microservice (continuing execution): " + str(e))
-                        import traceback
-                        botengine.get_logger().error(traceback.format_exc())
-
-
-def did_stop_detecting_visitor(botengine, location_object):
+    bus.send(botengine, location_object, "did_start_detecting_visitor", defer=defer)
+
+
+def did_stop_detecting_visitor(botengine, location_object, defer=False):
     """
     Signal throughout all microservices that 1 or fewer people are currently detected in the home
     :param botengine: BotEngine
@@ -1243,34 +827,12 @@ def did_stop_detecting_visitor(botengine, location_object):
     :param subregion_id: Subregion ID
     :param context_id: Context ID
     :param name: Name of the subregion, None if not given
+    :param defer: True to deliver this signal once at the end of the execution, coalescing identical signals
     """
-    # Location microservices
-    for microservice in location_object.intelligence_modules:
-        if hasattr(location_object.intelligence_modules[microservice], 'did_stop_detecting_visitor'):
-            try:
-                import time
-                t = time.time()
-                location_object.intelligence_modules[microservice].did_stop_detecting_visitor(botengine)
-                location_object.intelligence_modules[microservice].track_statistics(botengine, (time.time() - t) * 1000)
-            except Exception as e:
-                botengine.get_logger().warning("location.py - Error delivering 'did_stop_detecting_visitor' to location microservice (continuing execution): " + str(e))
-                import traceback
-                botengine.get_logger().error(traceback.format_exc())
-
-    # Device microservices
-    for device_id in location_object.devices:
-        if hasattr(location_object.devices[device_id], "intelligence_modules"):
-            for microservice in location_object.devices[device_id].intelligence_modules:
-                if hasattr(location_object.devices[device_id].intelligence_modules[microservice], 'did_stop_detecting_visitor'):
-                    try:
-                        location_object.devices[device_id].intelligence_modules[microservice].did_stop_detecting_visitor(botengine)
-                    except Exception as e:
-                        botengine.get_logger().warning("location.py - Error delivering 'did_stop_detecting_visitor' message to device microservice (continuing execution): " + str(e))
-                        import traceback
-                        botengine.get_logger().error(traceback.format_exc())
-
-
-def did_start_detecting_together(botengine, location_object):
+    bus.send(botengine, location_object, "did_stop_detecting_visitor", defer=defer)
+
+
+def did_start_detecting_together(botengine, location_object, defer=False):
     """
     Signal throughout all microservices that 2 or more people are believed to be in the same room
     :param botengine: BotEngine
@@ -1279,34 +841,12 @@ def did_start_detecting_together(botengine, location_object):
     :param subregion_id: Subregion ID
     :param context_id: Context ID
     :param name: Name of the subregion, None if not given
+    :param defer: True to deliver this signal once at the end of the execution, coalescing identical signals
     """
-    # Location microservices
-    for microservice in location_object.intelligence_modules:
-        if hasattr(location_object.intelligence_modules[microservice], 'did_start_detecting_together'):
-            try:
-                import time
-                t = time.time()
-                location_object.intelligence_modules[microservice].did_start_detecting_together(botengine)
-                location_object.intelligence_modules[microservice].track_statistics(botengine, (time.time() - t) * 1000)
-            except Exception as e:
-                botengine.get_logger().warning("location.py - Error delivering 'did_start_detecting_together' to location microservice (continuing execution): " + str(e))
-                import traceback
-                botengine.get_logger().error(traceback.format_exc())
-
-    # Device microservices
-    for device_id in location_object.devices:
-        if hasattr(location_object.devices[device_id], "intelligence_modules"):
-            for microservice in location_object.devices[device_id].intelligence_modules:
-                if hasattr(location_object.devices[device_id].intelligence_modules[microservice], 'did_start_detecting_together'):
-                    try:
-                        location_object.devices[device_id].intelligence_modules[microservice].did_start_detecting_together(botengine)
-                    except Exception as e:
-                        botengine.get_logger().warning("location.py - Error delivering 'did_start_detecting_together' message to device microservice (continuing execution): " + str(e))
-                        import traceback
-                        botengine.get_logger().error(traceback.format_exc())
-
-
-def did_stop_detecting_together(botengine, location_object):
+    bus.send(botengine, location_object, "did_start_detecting_together", defer=defer)
+
+
+def did_stop_detecting_together(botengine, location_object, defer=False):
     """
     Signal throughout all microservices that there are no 2 or more people detected in the same room
     :param botengine: BotEngine
@@ -1315,31 +855,9 @@ def did_stop_detecting_together(botengine, location_object):
     :param subregion_id: Subregion ID
     :param context_id: Context ID
     :param name: Name of the subregion, None if not given
+    :param defer: True to deliver this signal once at the end of the execution, coalescing identical signals
     """
-    # Location microservices
-    for microservice in location_object.intelligence_modules:
-        if hasattr(location_object.intelligence_modules[microservice], 'did_stop_detecting_together'):
-            try:
-                import time
-                t = time.time()
-                location_object.intelligence_modules[microservice].did_stop_detecting_together(botengine)
-                location_object.intelligence_modules[microservice].track_statistics(botengine, (time.time() - t) * 1000)
-            except Exception as e:
-                botengine.get_logger().warning("location.py - Error delivering 'did_stop_detecting_together' to location microservice (continuing execution): " + str(e))
-                import traceback
-                botengine.get_logger().error(traceback.format_exc())
-
-    # Device microservices
-    for device_id in location_object.devices:
-        if hasattr(location_object.devices[device_id], "intelligence_modules"):
-            for microservice in location_object.devices[device_id].intelligence_modules:
-                if hasattr(location_object.devices[device_id].intelligence_modules[microservice], 'did_stop_detecting_together'):
-                    try:
-                        location_object.devices[device_id].intelligence_modules[microservice].did_stop_detecting_together(botengine)
-                    except Exception as e:
-                        botengine.get_logger().warning("location.py - Error delivering 'did_stop_detecting_together' message to device microservice (continuing execution): " + str(e))
-                        import traceback
-                        botengine.get_logger().error(traceback.format_exc())
+    bus.send(botengine, location_object, "did_stop_detecting_together", defer=defer)
 
 
 def information_out_of_bed(botengine, location_object, start_time_ms, device_object):
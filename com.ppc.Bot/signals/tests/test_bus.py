@@ -0,0 +1,55 @@
+import unittest
+
+import signals.bus as bus
+import signals.radar as radar
+from intelligence.intelligence import Intelligence
+from locations.location import Location
+
+from botengine_pytest import BotEnginePyTest
+
+
+class RadarListener(Intelligence):
+    def __init__(self, botengine, parent):
+        Intelligence.__init__(self, botengine, parent)
+        self._init_statistics()
+        self.targets = []
+
+    def information_did_update_targets(self, botengine, device_object, targets):
+        self.targets.append((device_object, targets))
+
+
+class TestBus(unittest.TestCase):
+    def test_bus(self):
+        botengine = BotEnginePyTest({})
+        botengine.reset()
+        location_object = Location(botengine, 0)
+        listener = RadarListener(botengine, location_object)
+        location_object.intelligence_modules["test.listener"] = listener
+
+        # Only the modules that implement the signal are registered for it
+        handlers = location_object.microservice_handlers(botengine, "information_did_update_targets")
+        assert [handler.__self__ for handler in handlers] == [listener]
+
+        radar.information_did_update_targets(botengine, location_object, "radar", {"0": {"x": 1}})
+        assert listener.targets == [("radar", {"0": {"x": 1}})]
+
+        # A burst of identical deferred signals is delivered once, when the execution flushes them
+        listener.targets.clear()
+        for _ in range(5):
+            radar.information_did_update_targets(botengine, location_object, "radar", {"0": {"x": 2}}, defer=True)
+        radar.information_did_update_targets(botengine, location_object, "radar", {"0": {"x": 3}}, defer=True)
+        assert listener.targets == []
+        assert "_pending_signals" not in location_object.__getstate__()
+
+        bus.flush(botengine, location_object)
+        assert listener.targets == [("radar", {"0": {"x": 2}}), ("radar", {"0": {"x": 3}})]
+
+        # A coalescing key keeps only the last arguments
+        listener.targets.clear()
+        for x in range(5):
+            bus.send(botengine, location_object, "information_did_update_targets", "radar", {"0": {"x": x}}, defer=True, key="radar")
+        bus.flush(botengine, location_object)
+        assert listener.targets == [("radar", {"0": {"x": 4}})]
+
+        # Signals nobody implements go nowhere
+        bus.send(botengine, location_object, "did_start_detecting_visitor")
@@ -0,0 +1,26 @@
+import unittest
+
+import bot
+
+from botengine_pytest import BotEnginePyTest
+
+
+class TestDeviceTypeRegistry(unittest.TestCase):
+    def test_device_type_registry(self):
+        botengine = BotEnginePyTest({"time": 1687373406646, "trigger": 0, "source": 0, "locationId": 123, "access": []})
+
+        classes = bot.extract_available_device_type_classes(botengine)
+        assert len(classes) > 0
+
+        # The registry is built once per process
+        assert bot.extract_available_device_type_classes(botengine) is classes
+
+        device_type_class = bot.get_device_type_class(botengine, 9138)
+        assert device_type_class in classes
+        assert 9138 in device_type_class.DEVICE_TYPES
+        assert bot.get_device_type_class(botengine, -1) is None
+
+        # The first class declaring a device type is the one used for new devices
+        for class_ in classes:
+            for device_type in class_.DEVICE_TYPES:
+                assert classes.index(bot.get_device_type_class(botengine, device_type)) <= classes.index(class_)
@@ -0,0 +1,45 @@
+import copy
+import unittest
+
+import index
+import manifest
+from locations.location import Location
+
+from botengine_pytest import BotEnginePyTest
+
+
+class TestManifest(unittest.TestCase):
+    def test_manifest(self):
+        microservices = index.MICROSERVICES
+        try:
+            fingerprint, table = manifest.location_table(manifest.LOCATION_MICROSERVICES)
+            assert list(table.keys()) == [x["module"] for x in microservices.get("LOCATION_MICROSERVICES", [])]
+            assert manifest.location_table(manifest.LOCATION_MICROSERVICES) == (fingerprint, table)
+            assert manifest.device_table("not a device type")[1] == {}
+
+            botengine = BotEnginePyTest({})
+            botengine.reset()
+            location_object = Location(botengine, 0)
+            location_object.new_version(botengine)
+            assert location_object.synchronized_fingerprints[manifest.LOCATION_MICROSERVICES] == fingerprint
+
+            # Nothing changed, so nothing is synchronized
+            modules = dict(location_object.intelligence_modules)
+            location_object.initialize(botengine)
+            assert location_object.intelligence_modules == modules
+
+            # A bot upgrade that removes a microservice compiles a new fingerprint and synchronizes again
+            if len(table) > 0:
+                upgraded = copy.deepcopy(microservices)
+                removed = upgraded["LOCATION_MICROSERVICES"].pop()
+                index.MICROSERVICES = upgraded
+                new_fingerprint, new_table = manifest.location_table(manifest.LOCATION_MICROSERVICES)
+                assert new_fingerprint != fingerprint
+                assert removed["module"] not in new_table
+
+                location_object.initialize(botengine)
+                assert removed["module"] not in location_object.intelligence_modules
+                assert location_object.synchronized_fingerprints[manifest.LOCATION_MICROSERVICES] == new_fingerprint
+
+        finally:
+            index.MICROSERVICES = microservices
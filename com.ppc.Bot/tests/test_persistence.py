@@ -0,0 +1,155 @@
+import unittest
+
+import bot
+import persistence
+
+from botengine_pytest import BotEnginePyTest
+
+
+class TestPersistence(unittest.TestCase):
+    def test_sharded_controller(self):
+        botengine = BotEnginePyTest(
+            {
+                "time": 1687373406646,
+                "trigger": 0,
+                "source": 0,
+                "locationId": 1546987,
+                "access": [
+                    {
+                        "category": 1,
+                        "trigger": False,
+                        "read": True,
+                        "control": True,
+                        "location": {
+                            "locationId": 1546987,
+                            "name": "Destry Teeter's Home",
+                            "event": "HOME.:.PRESENT.AI",
+                            "timezone": {
+                                "id": "America/Los_Angeles",
+                                "offset": -480,
+                                "dst": True,
+                                "name": "Pacific Standard Time",
+                            },
+                            "zip": "83501",
+                            "latitude": "46.39950",
+                            "longitude": "-117.02710",
+                            "language": "en",
+                            "organizationId": 202,
+                        },
+                    },
+                    {
+                        "category": 4,
+                        "trigger": True,
+                        "read": True,
+                        "control": True,
+                        "device": {
+                            "deviceId": "0015BC001A100466",
+                            "deviceType": 9138,
+                            "description": "Test Motion",
+                            "locationId": 1546987,
+                            "startDate": 1654623396000,
+                            "connected": True,
+                        },
+                    },
+                ],
+            }
+        )
+
+        bot.run(botengine)
+
+        manifest = botengine.load_variable(persistence.MANIFEST_VARIABLE_NAME)
+        assert manifest is not None
+        assert manifest["locations"] == [1546987]
+        assert manifest["devices"] == ["0015BC001A100466"]
+        assert persistence.CONTROLLER_SHARD_NAME in botengine.variables
+        assert persistence.location_shard_name(1546987) in botengine.variables
+        assert persistence.measurements_shard_name("0015BC001A100466") in botengine.variables
+        assert botengine.load_variable(persistence.LEGACY_VARIABLE_NAME) is None
+
+        # The controller is rebuilt from its shards with the object graph intact
+        controller = persistence.load_controller(botengine)
+        location_object = controller.locations[1546987]
+        device_object = location_object.devices["0015BC001A100466"]
+        assert device_object.location_object is location_object
+        for microservice_object in location_object.intelligence_modules.values():
+            assert microservice_object.parent is location_object
+
+        # Once an execution has loaded from shards, saving an unchanged controller skips every shard
+        persistence.save_controller(botengine, controller)
+        controller = persistence.load_controller(botengine)
+        location_object = controller.locations[1546987]
+        device_object = location_object.devices["0015BC001A100466"]
+        botengine.variables_to_flush.clear()
+        persistence.save_controller(botengine, controller)
+        assert list(botengine.variables_to_flush.keys()) == ["-core-"]
+
+        # A new measurement only touches that device's location and measurement shards
+        botengine.variables_to_flush.clear()
+        device_object.add_measurement(botengine, "motionStatus", True, botengine.get_timestamp())
+        persistence.save_controller(botengine, controller)
+        assert persistence.measurements_shard_name("0015BC001A100466") in botengine.variables_to_flush
+        assert persistence.CONTROLLER_SHARD_NAME not in botengine.variables_to_flush
+
+        controller = persistence.load_controller(botengine)
+        device_object = controller.get_device(botengine, "0015BC001A100466")
+        assert device_object.measurements["motionStatus"][0] == (True, botengine.get_timestamp())
+
+    def test_controller_cache(self):
+        inputs = {"time": 1687373406646, "trigger": 0, "source": 0, "locationId": 1546987, "access": []}
+        botengine = BotEnginePyTest(inputs)
+        persistence.clear_controller_cache()
+        controller = persistence.load_controller(botengine)
+        assert controller is None
+
+        controller = bot.Controller()
+        persistence.save_controller(botengine, controller)
+
+        # A warm execution reuses the live controller while the manifest at the server still describes it
+        assert persistence.load_controller(botengine) is controller
+
+        # The controller left the cache when it was loaded; an execution that doesn't save it loads the shards
+        reloaded = persistence.load_controller(botengine)
+        assert reloaded is not None and reloaded is not controller
+
+        # Another execution saved a different controller at the server
+        persistence.save_controller(botengine, reloaded)
+        cache = dict(persistence._controller_cache)
+        elsewhere = bot.Controller()
+        elsewhere.saved_elsewhere = True
+        persistence.save_controller(botengine, elsewhere)
+        persistence._controller_cache.update(cache)
+        loaded = persistence.load_controller(botengine)
+        assert loaded is not reloaded and loaded.saved_elsewhere
+
+        # Controllers larger than the memory budget are never kept
+        persistence.CONTROLLER_CACHE_MAX_BYTES, max_bytes = 0, persistence.CONTROLLER_CACHE_MAX_BYTES
+        try:
+            persistence.save_controller(botengine, controller)
+            assert len(persistence._controller_cache) == 0
+        finally:
+            persistence.CONTROLLER_CACHE_MAX_BYTES = max_bytes
+            persistence.clear_controller_cache()
+
+    def test_legacy_controller(self):
+        botengine = BotEnginePyTest({"time": 1687373406646, "trigger": 0, "source": 0, "locationId": 1546987, "access": []})
+        botengine.save_variable(persistence.LEGACY_VARIABLE_NAME, "legacy", required_for_each_execution=True)
+        assert persistence.load_controller(botengine) == "legacy"
+
+        # The legacy controller is kept until the shards have been loaded back
+        persistence.save_controller(botengine, bot.Controller())
+        assert botengine.load_variable(persistence.LEGACY_VARIABLE_NAME) == "legacy"
+        shard = botengine.variables.pop(persistence.CONTROLLER_SHARD_NAME)
+        assert persistence.load_controller(botengine) == "legacy"
+
+        botengine.variables[persistence.CONTROLLER_SHARD_NAME] = shard
+        assert isinstance(persistence.load_controller(botengine), bot.Controller)
+        assert botengine.load_variable(persistence.LEGACY_VARIABLE_NAME) is None
+
+        # Without a legacy controller, missing or stale shards are never mistaken for a new bot
+        botengine.variables.pop(persistence.CONTROLLER_SHARD_NAME)
+        with self.assertRaises(persistence.ControllerLoadError):
+            persistence.load_controller(botengine)
+
+        botengine.variables[persistence.CONTROLLER_SHARD_NAME] = persistence._dumps(bot.Controller(), {}) + b"."
+        with self.assertRaises(persistence.ControllerLoadError):
+            persistence.load_controller(botengine)
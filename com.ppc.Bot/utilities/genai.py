@@ -177,8 +177,10 @@ def openai_chat_completion_model(
             body["function_call"] = function_call
     import json
 
+    import utilities.utilities as utilities
+
     botengine.get_logger(f"{__name__}").debug(
-        "<openai_chat_completion_model() body={}".format(json.dumps(body))
+        utilities.LazyString("<openai_chat_completion_model() body={}".format, utilities.LazyString(json.dumps, body))
     )
     return body
 
@@ -147,3 +147,64 @@ class TestUtilities(unittest.TestCase):
 
         json_loads_mock.return_value = {"app": {"core": -1}}
         assert utilities.is_core_bot(botengine, True)
+
+    def test_utilities_normalize_measurement(self):
+        # Values that are already typed are returned as-is
+        for value in [1, 2.5, True, None, [1, 2]]:
+            assert utilities.normalize_measurement(value) is value
+
+        expected = {
+            "0": 0,
+            "-1": -1,
+            "+5": 5,
+            "1.5": 1.5,
+            ".5": 0.5,
+            "1e3": 1000.0,
+            " 12 ": 12,
+            "True": True,
+            "true": True,
+            "False": False,
+            "false": False,
+            "None": None,
+            "'abc'": "abc",
+            "[1, 2]": [1, 2],
+            "1,2": (1, 2),
+            "{'a': 1}": {"a": 1},
+            "0x1F": 31,
+            # Strings that aren't Python literals stay strings
+            "007": "007",
+            "abc": "abc",
+            "Door open": "Door open",
+            "2024-01-15": "2024-01-15",
+            "192.168.1.1": "192.168.1.1",
+            '{"a": true}': '{"a": true}',
+            "inf": "inf",
+            "": "",
+            # Never evaluated as code
+            "len": "len",
+            "__import__('os')": "__import__('os')",
+        }
+        for measure, value in expected.items():
+            for _ in range(2):
+                assert utilities.normalize_measurement(measure) == value
+                assert type(utilities.normalize_measurement(measure)) is type(value)
+
+        # Containers are never shared between measurements
+        assert utilities.normalize_measurement("[1, 2]") is not utilities.normalize_measurement("[1, 2]")
+
+    def test_utilities_logger_handle(self):
+        botengine = BotEnginePyTest({})
+        botengine.get_logger_handle = MagicMock(side_effect=botengine.get_logger)
+
+        handle = utilities.LoggerHandle("utilities.tests")
+        assert handle.get(botengine) is botengine.get_logger("utilities.tests")
+        assert handle.get(botengine) is handle.get(botengine)
+        assert botengine.get_logger_handle.call_count == 1
+
+        # Loggers are resolved once per class and named after it
+        with patch.object(Location, "_logger_handle", None, create=True):
+            location_object = Location(botengine, 0)
+            assert location_object.get_logger(botengine) is botengine.get_logger("locations.location.Location")
+            location_object.get_logger(botengine)
+            assert botengine.get_logger_handle.call_count == 2
+            assert "_logger_handle" not in location_object.__dict__
@@ -310,24 +310,80 @@ def ms_to_human_readable_string(ms, include_seconds=False):
     return str.strip()
 
 
+# Maximum number of raw measurement strings to remember normalized values for
+NORMALIZED_MEASUREMENTS_CACHE_SIZE = 1024
+
+# Raw measurement string : normalized value. Only immutable values are remembered.
+_normalized_measurements = {}
+
+# Measurement strings that are Python keywords, after stripping whitespace
+_MEASUREMENT_KEYWORDS = {"True": True, "False": False, "None": None}
+
+# Integer and floating point measurement strings, following Python's literal rules
+_MEASUREMENT_INT_PATTERN = r"[+-]?(?:0+|[1-9][0-9]*)"
+_MEASUREMENT_FLOAT_PATTERN = r"[+-]?(?:[0-9]+\.[0-9]*(?:[eE][+-]?[0-9]+)?|\.[0-9]+(?:[eE][+-]?[0-9]+)?|[0-9]+[eE][+-]?[0-9]+)"
+
+
 def normalize_measurement(measure):
     """
     Transform a measurement's value, which could be a string, into a real value - like a boolean or int or float
+    Values that are already typed are returned as-is. Strings are parsed as Python literals, never evaluated as code.
     :param measure: a raw measurement's value
     :return: a value that has been corrected into the right type
     """
-    try:
-        return eval(measure, {}, {})
+    if not isinstance(measure, str):
+        return measure
 
-    except Exception:
-        if measure in ["true", "True"]:
-            return True
+    if measure in _normalized_measurements:
+        return _normalized_measurements[measure]
 
-        elif measure in ["false", "False"]:
-            return False
+    value = _parse_measurement(measure)
 
-        else:
-            return measure
+    if value is None or isinstance(value, (bool, int, float, str)):
+        if len(_normalized_measurements) >= NORMALIZED_MEASUREMENTS_CACHE_SIZE:
+            _normalized_measurements.clear()
+        _normalized_measurements[measure] = value
+
+    return value
+
+
+def _parse_measurement(measure):
+    """
+    Parse a raw measurement string
+    :param measure: Raw measurement string
+    :return: bool, int, float, None, a string, or a list / tuple / dict / set literal
+    """
+    if measure in ["true", "True"]:
+        return True
+
+    elif measure in ["false", "False"]:
+        return False
+
+    text = measure.strip()
+    if len(text) == 0:
+        return measure
+
+    if text in _MEASUREMENT_KEYWORDS:
+        return _MEASUREMENT_KEYWORDS[text]
+
+    import re
+
+    if re.fullmatch(_MEASUREMENT_INT_PATTERN, text):
+        return int(text)
+
+    if re.fullmatch(_MEASUREMENT_FLOAT_PATTERN, text):
+        return float(text)
+
+    if text[0] in "0123456789+-.'\"[({" or "," in text:
+        # Quoted strings, containers, delimited values and less common number formats
+        import ast
+
+        try:
+            return ast.literal_eval(text)
+        except Exception:
+            pass
+
+    return measure
 
 
 def get_answer(question_object):
@@ -860,6 +916,129 @@ def pause_playback(botengine, seconds=1):
         time.sleep(seconds)
 
 
+# ===============================================================================
+# CSV Export
+# ===============================================================================
+def write_csv(sink, rows, compress=False):
+    """
+    Write rows to a file-like sink with the standard csv writer, one row at a time.
+    Only one row is held in memory, so rows can come from a generator that downloads them as it goes.
+
+    :param sink: Text file-like object opened with newline="", or a binary file-like object when compressing
+    :param rows: Iterable of rows, each a list of values
+    :param compress: True to write an lz4 frame of the UTF-8 .csv content to a binary sink
+    :return: Number of rows written
+    """
+    import csv
+
+    if not compress:
+        writer = csv.writer(sink, lineterminator="\n")
+        count = 0
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+        return count
+
+    import io
+
+    import lz4.frame
+
+    # The sink belongs to the caller, so it stays open after the lz4 frame is finished
+    stream = lz4.frame.LZ4FrameFile(sink, mode="wb")
+    text = io.TextIOWrapper(stream, encoding="utf-8", newline="")
+    try:
+        return write_csv(text, rows)
+    finally:
+        text.flush()
+        text.detach()
+        stream.close()
+
+
+# ===============================================================================
+# Lazy Log Messages
+# ===============================================================================
+class LazyString:
+    """
+    Log message, or part of one, that is only built when a logger emits it.
+    This is the same as the botengine's LazyString, for microservices.
+
+    Loggers convert a message with str() only when its level is enabled, so wrapping an expensive representation
+    skips it entirely at higher log levels:
+
+        botengine.get_logger(f"{__name__}").debug(utilities.LazyString("body={}".format, utilities.LazyString(json.dumps, body)))
+    """
+
+    __slots__ = ("function", "args", "kwargs")
+
+    def __init__(self, function, *args, **kwargs):
+        """
+        :param function: Function that builds the string, e.g. "template {}".format or json.dumps
+        :param args: Arguments to the function
+        :param kwargs: Keyword arguments to the function
+        """
+        self.function = function
+        self.args = args
+        self.kwargs = kwargs
+
+    def __str__(self):
+        return str(self.function(*self.args, **self.kwargs))
+
+    def __format__(self, format_spec):
+        return format(str(self), format_spec)
+
+
+# ===============================================================================
+# Logger Handles
+# ===============================================================================
+class LoggerHandle:
+    """
+    Logger of one class or module that is resolved once, instead of on every log line.
+    Declare it once, and log through it instead of botengine.get_logger(f"{__name__}.{__class__.__name__}"):
+
+        _logger = utilities.LoggerHandle(f"{__name__}.MyClass")
+        _logger.get(botengine).debug(">my_method()")
+
+    The handle comes from botengine.get_logger_handle(), which follows playback and Lambda logging configuration
+    changes and returns early from messages at disabled levels.
+    """
+
+    __slots__ = ("name", "_botengine_class", "_handle")
+
+    def __init__(self, name):
+        """
+        :param name: Logger name
+        """
+        self.name = name
+        self._botengine_class = None
+        self._handle = None
+
+    def get(self, botengine):
+        """
+        :param botengine: BotEngine environment
+        :return: Logger handle
+        """
+        # Playback imports a new botengine module for every bot, so the handle is resolved again for each one
+        if botengine.__class__ is not self._botengine_class:
+            self._handle = botengine.get_logger_handle(self.name)
+            self._botengine_class = botengine.__class__
+        return self._handle
+
+
+def get_class_logger(botengine, cls):
+    """
+    Logger handle named after a class, the same as botengine.get_logger(f"{__name__}.{__class__.__name__}").
+    The handle is kept on the class itself, so it's never saved with the objects.
+    :param botengine: BotEngine environment
+    :param cls: Class
+    :return: Logger handle
+    """
+    handle = cls.__dict__.get("_logger_handle")
+    if handle is None:
+        handle = LoggerHandle("{}.{}".format(cls.__module__, cls.__name__))
+        cls._logger_handle = handle
+    return handle.get(botengine)
+
+
 # ===============================================================================
 # Color Class for CLI
 # ===============================================================================
@@ -149,7 +149,7 @@ class FilterExampleMicroservice(Filter):
 
         :param botengine: BotEngine environment
         :param reference: Optional reference passed into botengine.request_data(..)
-        :param csv_dict: { device_object: 'csv data string' }
+        :param csv_dict: { device_object: DataRequestContent iterable of CSV rows }
         """
         botengine.get_logger().info("Filter: async_data_request_ready()")
         return
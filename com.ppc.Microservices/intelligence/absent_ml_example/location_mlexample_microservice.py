@@ -414,7 +414,7 @@ class LocationMlExampleMicroservice(Intelligence):
 
         :param botengine: BotEngine environment
         :param reference: Optional reference passed into botengine.request_data(..)
-        :param csv_dict: { device_object: 'csv data string' }
+        :param csv_dict: { device_object: DataRequestContent iterable of CSV rows }
         """
         if reference == "all":
             # This is a data request response that was driven by the 'data_request' microservice package.
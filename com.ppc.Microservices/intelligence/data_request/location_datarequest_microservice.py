@@ -7,6 +7,8 @@ file 'LICENSE.txt', which is part of this source code package.
 @author: David Moss
 '''
 
+import csv
+
 from intelligence.intelligence import Intelligence
 import utilities.utilities as utilities
 import signals.analytics as analytics
@@ -278,7 +280,7 @@ class LocationDataRequestMicroservice(Intelligence):
 
         :param botengine: BotEngine environment
         :param reference: Optional reference passed into botengine.request_data(..)
-        :param csv_dict: { device_object: 'csv data string' }
+        :param csv_dict: { device_object: DataRequestContent iterable of CSV rows }
         """
         botengine.get_logger(f"{__name__}.{__class__.__name__}").info(">async_data_request_ready() reference={}".format(reference))
         
@@ -299,9 +301,9 @@ class LocationDataRequestMicroservice(Intelligence):
 
             if EXPORT_CSV_TO_LOCAL_FILES:
                 filename = "{}_{}.csv".format(d.device_id, d.device_type)
-                with open(filename, "w") as text_file:
+                with open(filename, "w", newline="") as text_file:
                     botengine.get_logger(f"{__name__}.{__class__.__name__}").info("|async_data_request_ready() Saving CSV data to {} ...".format(filename))
-                    text_file.write(csv_dict[d])
+                    csv.writer(text_file).writerows(csv_dict[d])
 
         # Split-phase logic: Store reference for post-processing
         # Load existing postprocess list (might be None or a list)
@@ -10,6 +10,7 @@ AWS Lambda execution environment wrapper
 
 import importlib
 import json
+import logging
 import sys
 import time
 import traceback
@@ -20,9 +21,23 @@ import boto3  # type: ignore
 LOG_LEVEL_DEFAULT = "warn"  # Default log level
 LOG_LEVEL_EVENTS = "info"  # Event log level
 
+# Lowest Python logging level enabled by each log level
+LOG_LEVEL_THRESHOLDS = {
+    "debug": logging.DEBUG,
+    "info": logging.INFO,
+    "warn": logging.WARNING,
+    "error": logging.ERROR,
+}
+
 # AWS Lambda output size limit
 OUTPUT_SIZE = 256 * 1024  # 256 KiB
 
+# Log levels returned to the server, from the highest to the lowest priority
+LOG_PRIORITIES = [["EXCEPTION", "CRITICAL", "ERROR", "WARN"], ["INFO"], ["DEBUG"]]
+
+# Share of the remaining output size that the log events of each priority may fill
+LOG_PRIORITY_BUDGETS = [1.0, 0.75, 0.75]
+
 
 def lambda_handler(data, context):
     """
@@ -46,7 +61,7 @@ def lambda_handler(data, context):
         else LOG_LEVEL_DEFAULT
     )
     logger.info(">lambda_handler() api_hosts={}".format(data.get("apiHosts") or data.get("apiHost")))
-    logger.debug(f"|lambda_handler() data={json.dumps(data)}")
+    logger.debug(BotEngine.LazyString("|lambda_handler() data={}".format, BotEngine.LazyString(json.dumps, data)))
 
     # Get allowable output size
     allowed_output_size = OUTPUT_SIZE - len(json.dumps(data).encode("utf-8"))
@@ -139,6 +154,14 @@ class LambdaLogger:
         # Current log time based on bot input
         self.log_time = int(time.time() * 1000)
 
+    def isEnabledFor(self, level):
+        """
+        Same as logging.Logger.isEnabledFor(), so callers can skip building messages that won't be logged
+        :param level: Python logging level, e.g. logging.DEBUG
+        :return: True if messages at this level are logged
+        """
+        return level >= LOG_LEVEL_THRESHOLDS.get(self.log_level, logging.WARNING)
+
     def log(self, level, message):
         if level == "debug":
             self.debug(message)
@@ -226,6 +249,42 @@ class LambdaLogger:
             }
         )
 
+    def _pack_log_events(self, size_available):
+        """
+        Select the log events to return within the available number of bytes.
+        Each event is encoded once, and each priority may only fill its share of the space left by the higher priorities,
+        so verbose logging can't crowd out the errors, the lower priorities, or the microservice statistics.
+
+        :param size_available: Number of bytes available for the encoded log events
+        :return: (List of log events in the order they were logged, encoded size of the log events in bytes)
+        """
+        priorities = {}
+        for index, levels in enumerate(LOG_PRIORITIES):
+            for level in levels:
+                priorities["[{}]".format(level)] = index
+
+        tiers = [[] for _ in LOG_PRIORITIES]
+        for log in self.log_events:
+            for tag, index in priorities.items():
+                if tag in log["message"]:
+                    tiers[index].append(log)
+                    break
+
+        # An empty list is encoded as "[]", and each event after the first is preceded by ", "
+        size = 0
+        selected = set()
+        for index, tier in enumerate(tiers):
+            budget = size + int((size_available - size) * LOG_PRIORITY_BUDGETS[index])
+            for log in tier:
+                log_size = len(json.dumps(log).encode("utf-8")) + (2 if size > 0 else 0)
+                if size + log_size > budget:
+                    continue
+
+                size += log_size
+                selected.add(id(log))
+
+        return [log for log in self.log_events if id(log) in selected], size
+
     def get_lambda_return(
         self, botengine=None, bot=None, allowed_output_size=256 * 1024
     ):
@@ -266,13 +325,15 @@ class LambdaLogger:
 
                 try:
                     self.debug(
-                        "RAG documents executed: inputs ={}".format(
-                            json.dumps(botengine.get_inputs())
+                        BotEngine.LazyString(
+                            "RAG documents executed: inputs ={}".format,
+                            BotEngine.LazyString(json.dumps, botengine.get_inputs()),
                         )
                     )
                     self.debug(
-                        "RAG documents updated : response={}".format(
-                            json.dumps(response)
+                        BotEngine.LazyString(
+                            "RAG documents updated : response={}".format,
+                            BotEngine.LazyString(json.dumps, response),
                         )
                     )
                 except Exception:
@@ -289,31 +350,20 @@ class LambdaLogger:
             response["tracebacks"] = self.tracebacks
 
         # Prioritize logging outputs
-        priorities = [["EXCEPTION", "CRITICAL", "ERROR", "WARN"], ["INFO"], ["DEBUG"]]
         response["logEvents"] = []
-        for priority in priorities:
-            for log in self.log_events:
-                size_available = allowed_output_size - len(
-                    json.dumps(response).encode("utf-8")
-                )
-                priorities_available = {
-                    level: f"[{level}]" in log["message"] for level in priority
-                }
-                if size_available and any(priorities_available.values()):
-                    response["logEvents"].append(log)
-
-        # Limit response to 256 KiB
-        if len(json.dumps(response).encode("utf-8")) > allowed_output_size:
-            # Remove last log
-            if len(response["logEvents"]) > 0:
-                response["logEvents"].pop()
+        response_size = len(json.dumps(response).encode("utf-8"))
+        response["logEvents"], log_events_size = self._pack_log_events(
+            allowed_output_size - response_size
+        )
+        response_size += log_events_size
 
         # Include additional bot server statistics for individual microservices if space allows
         # and if the bot has the capability to provide them
         if bot is not None and hasattr(bot, "get_intelligence_statistics"):
             statistics = bot.get_intelligence_statistics(botengine)
             if (
-                len(json.dumps(response).encode("utf-8"))
+                response_size
+                + len(', "microservices": ')
                 + len(json.dumps(statistics).encode("utf-8"))
                 < allowed_output_size
             ):
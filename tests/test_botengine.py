@@ -1,6 +1,6 @@
 import logging
-from logging import Logger
 import unittest
+from logging import Logger
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -448,9 +448,938 @@ class TestBotEngine(unittest.TestCase):
         logger.info("Timers after execution" + str(timers))
         assert len(timers) == 1
         assert timers[0][0] == MAXINT
-        
+
+    @requests_mock.mock()
+    @patch("botengine.BotEngine.get_logger")
+    @patch("botengine.BotEngine.get_bundle_id")
+    @patch("botengine.BotEngine.get_cloud_address")
+    @patch("botengine.BotEngine.get_bot_type")
+    def test_botengine_flush_all(
+        self,
+        mock_for_requests,
+        mock_get_bot_type,
+        mock_get_cloud_address,
+        mock_get_bundle_id,
+        mock_get_logger,
+    ):
+        mock_get_bot_type.return_value = 0
+        mock_get_cloud_address.return_value = "https://app.host.com"
+        mock_get_bundle_id.return_value = "com.ppc.Tests"
+        add_logger(mock_get_logger)
+        # Import BotEngine class
+        import botengine as botengine_module
+        from botengine import BotEngine
+
+        # Initialize BotEngine
+        api_key = "1234567890"
+        host = "https://app.host.com"
+        start_key = 1
+        raw_inputs = {"apiKey": api_key, "apiHost": host, "startKey": start_key}
+        mock_for_requests.post(
+            host + "/analytic/start", headers={}, json={"resultCode": 0}
+        )
+        botengine = BotEngine(raw_inputs)
+
+        import dill
+
+        mock_for_requests.get(
+            host + "/analytic/variables/-core-", headers={}, content=dill.dumps({})
+        )
+        botengine._download_core_variables()
+        botengine.set_inputs({
+                "time": 1687373406646,
+                "trigger": 0,
+                "source": 0,
+                "locationId": 0,
+            })
+
+        # Local stand-in for every flush endpoint
+        mock_for_requests.post(host + "/analytic/variables", json={"resultCode": 0})
+        mock_for_requests.put(host + "/analytic/tags", json={"resultCode": 0})
+        mock_for_requests.post(host + "/analytic/dataRequests", json={"resultCode": 0})
+        mock_for_requests.put(host + "/cloud/json/rules/1/attrs", json={"resultCode": 0})
+
+        default_max_workers = botengine_module.FLUSH_MAX_WORKERS
+        for max_workers in [default_max_workers, 1]:
+            if max_workers > 1:
+                # A failing flush is collected without stopping the other flushes
+                mock_for_requests.put(host + "/analytic/parameters", text="not json")
+            else:
+                mock_for_requests.put(host + "/analytic/parameters", json={"resultCode": 0})
+
+            botengine.commands_to_flush = [{"deviceId": "a", "params": []}]
+            botengine.save_variable("variable", 1)
+            botengine.tags_to_create = [{"tag": "tag", "type": 1}]
+            botengine.data_requests = [{"key": "reference"}]
+            botengine.rules = {1: "ACTIVE"}
+
+            botengine_module.FLUSH_MAX_WORKERS = max_workers
+            mock_for_requests.reset_mock()
+            try:
+                errors = botengine.flush_all()
+            finally:
+                botengine_module.FLUSH_MAX_WORKERS = default_max_workers
+
+            if max_workers > 1:
+                assert list(errors.keys()) == ["commands"]
+            else:
+                assert errors == {}
+
+            paths = sorted(
+                "{} {}".format(r.method.lower(), r.path)
+                for r in mock_for_requests.request_history
+            )
+            assert paths == [
+                "post /analytic/datarequests",
+                "post /analytic/variables",
+                "put /analytic/parameters",
+                "put /analytic/tags",
+                "put /cloud/json/rules/1/attrs",
+            ]
+
+            # Worker threads never replace the main session
+            assert botengine._get_session() is botengine.session
+
+    @requests_mock.mock()
+    @patch("botengine.BotEngine.get_logger")
+    @patch("botengine.BotEngine.get_bundle_id")
+    @patch("botengine.BotEngine.get_cloud_address")
+    @patch("botengine.BotEngine.get_bot_type")
+    def test_botengine_compressed_variables(
+        self,
+        mock_for_requests,
+        mock_get_bot_type,
+        mock_get_cloud_address,
+        mock_get_bundle_id,
+        mock_get_logger,
+    ):
+        mock_get_bot_type.return_value = 0
+        mock_get_cloud_address.return_value = "https://app.host.com"
+        mock_get_bundle_id.return_value = "com.ppc.Tests"
+        add_logger(mock_get_logger)
+        # Import BotEngine class
+        from botengine import (
+            _decode_binary_variable,
+            BotEngine,
+            COMPRESSED_VARIABLE_HEADER,
+        )
+
+        # Initialize BotEngine
+        api_key = "1234567890"
+        host = "https://app.host.com"
+        start_key = 1
+        raw_inputs = {"apiKey": api_key, "apiHost": host, "startKey": start_key}
+        mock_for_requests.post(
+            host + "/analytic/start", headers={}, json={"resultCode": 0}
+        )
+        botengine = BotEngine(raw_inputs)
+        botengine.set_inputs({
+                "time": 1687373406646,
+                "trigger": 0,
+                "source": 0,
+                "locationId": 0,
+            })
+
+        import hashlib
+
+        import dill
+
+        value = {"measurements": [("temperature", 21.5, i) for i in range(1000)]}
+        mock_for_requests.post(host + "/analytic/variables", json={"resultCode": 0})
+
+        # Compression is opt-in
+        assert botengine.compress_variables is False
+        botengine.compress_variables = True
+        botengine.save_variable("large", value)
+        botengine.save_variable("small", 1)
+        botengine.flush_binary_variables()
+
+        request = mock_for_requests.request_history[-1]
+        body = bytes(request.body)
+        assert request.qs["name"] == ["large", "small"]
+        large_length, small_length = [int(length) for length in request.qs["length"]]
+        assert large_length + small_length == len(body)
+        assert large_length < len(dill.dumps(value))
+        assert request.headers["Content-MD5"] == hashlib.md5(body).digest().hex()
+
+        # Compressed variables are wrapped, small variables are stored as-is
+        large = body[:large_length]
+        small = body[large_length:]
+        assert large[:1] == COMPRESSED_VARIABLE_HEADER
+        assert small == dill.dumps(1)
+
+        # Compressed and legacy uncompressed variables are both readable
+        mock_for_requests.get(host + "/analytic/variables/large", content=large)
+        mock_for_requests.get(
+            host + "/analytic/variables/legacy", content=dill.dumps(value)
+        )
+        botengine.variables = {}
+        assert botengine.load_variable("large") == value
+        assert botengine.load_variable("legacy") == value
+
+        # Variables that are already serialized are stored without serializing them again, and load as the same bytes
+        shard = dill.dumps(value)
+        botengine.save_serialized_variables({"shard": shard})
+        assert "shard" not in botengine.variables
+        botengine.flush_binary_variables()
+        body = bytes(mock_for_requests.request_history[-1].body)
+        assert dill.loads(_decode_binary_variable(body)) == shard
+        mock_for_requests.get(host + "/analytic/variables/shard", content=body)
+        assert botengine.load_variable("shard") == shard
+
+    @requests_mock.mock()
+    @patch("botengine.BotEngine.get_logger")
+    @patch("botengine.BotEngine.get_bundle_id")
+    @patch("botengine.BotEngine.get_cloud_address")
+    @patch("botengine.BotEngine.get_bot_type")
+    def test_botengine_system_property_cache(
+        self,
+        mock_for_requests,
+        mock_get_bot_type,
+        mock_get_cloud_address,
+        mock_get_bundle_id,
+        mock_get_logger,
+    ):
+        mock_get_bot_type.return_value = 0
+        mock_get_cloud_address.return_value = "https://app.host.com"
+        mock_get_bundle_id.return_value = "com.ppc.Tests"
+        add_logger(mock_get_logger)
+        # Import BotEngine class
+        import botengine as botengine_module
+        from botengine import BotEngine
+
+        # Initialize BotEngine
+        api_key = "1234567890"
+        host = "https://app.host.com"
+        start_key = 1
+        raw_inputs = {"apiKey": api_key, "apiHost": host, "startKey": start_key}
+        mock_for_requests.post(
+            host + "/analytic/start", headers={}, json={"resultCode": 0}
+        )
+        botengine = BotEngine(raw_inputs)
+        botengine_module._system_properties_cache.clear()
+
+        threshold = mock_for_requests.get(
+            host + "/cloud/json/systemProperty/ppc.bot.minCountdownThreshold", text="15000"
+        )
+        missing = mock_for_requests.get(
+            host + "/cloud/json/systemProperty/missing", text=""
+        )
+
+        # Prefetched properties are served from the cache, across BotEngine instances
+        botengine.prefetch_system_properties()
+        assert threshold.call_count == 1
+        assert botengine.get_system_property("ppc.bot.minCountdownThreshold") == "15000"
+        other_botengine = BotEngine({"apiKey": api_key, "apiHost": host, "startKey": start_key})
+        assert other_botengine.get_system_property("ppc.bot.minCountdownThreshold") == "15000"
+        assert threshold.call_count == 1
+
+        # Missing properties are cached too
+        assert botengine.get_system_property("missing") is None
+        assert botengine.get_system_property("missing") is None
+        assert missing.call_count == 1
+
+        # Unreadable responses are never cached
+        broken = mock_for_requests.get(
+            host + "/cloud/json/systemProperty/broken", text="{not json"
+        )
+        assert botengine.get_system_property("broken") is None
+        assert botengine.get_system_property("broken") is None
+        assert broken.call_count == 2
+
+        # Another bot in the same process has its own cache
+        mock_get_bundle_id.return_value = "com.ppc.Other"
+        assert botengine.get_system_property("ppc.bot.minCountdownThreshold") == "15000"
+        assert threshold.call_count == 2
+        mock_get_bundle_id.return_value = "com.ppc.Tests"
+
+        # Expired properties are downloaded again
+        key = ((host,), "com.ppc.Tests", "ppc.bot.minCountdownThreshold")
+        botengine_module._system_properties_cache[key] = (0, "15000")
+        assert botengine.get_system_property("ppc.bot.minCountdownThreshold") == "15000"
+        assert threshold.call_count == 3
+        botengine_module._system_properties_cache.clear()
+
+    @requests_mock.mock()
+    @patch("botengine.BotEngine.get_logger")
+    @patch("botengine.BotEngine.get_bundle_id")
+    @patch("botengine.BotEngine.get_cloud_address")
+    @patch("botengine.BotEngine.get_bot_type")
+    def test_botengine_get_measurements(
+        self,
+        mock_for_requests,
+        mock_get_bot_type,
+        mock_get_cloud_address,
+        mock_get_bundle_id,
+        mock_get_logger,
+    ):
+        mock_get_bot_type.return_value = 0
+        mock_get_cloud_address.return_value = "https://app.host.com"
+        mock_get_bundle_id.return_value = "com.ppc.Tests"
+        add_logger(mock_get_logger)
+        # Import BotEngine class
+        from botengine import _measurement_months, BotEngine
+
+        # Initialize BotEngine
+        api_key = "1234567890"
+        host = "https://app.host.com"
+        start_key = 1
+        raw_inputs = {"apiKey": api_key, "apiHost": host, "startKey": start_key}
+        mock_for_requests.post(
+            host + "/analytic/start", headers={}, json={"resultCode": 0}
+        )
+        botengine = BotEngine(raw_inputs)
+
+        # 2023-01-15 to 2023-06-10 UTC
+        oldest_timestamp_ms = 1673740800000
+        newest_timestamp_ms = 1686355200000
+        months = _measurement_months(oldest_timestamp_ms, newest_timestamp_ms)
+        assert len(months) == 6
+        assert months[0] == (1685577600000, newest_timestamp_ms)
+        assert months[-1] == (oldest_timestamp_ms, 1675209600000)
+        assert all(months[i][0] == months[i + 1][1] for i in range(len(months) - 1))
+
+        # March 2023 has no measurements
+        empty_month = 1677628800000
+
+        def parameters(request, context):
+            start = int(request.qs["startdate"][0])
+            if start == empty_month:
+                return {"resultCode": 0, "measures": []}
+            # Each month arrives newest first
+            return {"resultCode": 0, "measures": [{"name": "power", "value": str(start), "time": start + i} for i in reversed(range(3))]}
+
+        history = mock_for_requests.get(host + "/analytic/devices/SAMPLE_01/parameters", json=parameters)
+
+        # Everything newer than the first month without measurements, months oldest first, each month in server order
+        measures = botengine.get_measurements("SAMPLE_01", oldest_timestamp_ms=oldest_timestamp_ms, newest_timestamp_ms=newest_timestamp_ms)["measures"]
+        assert len(measures) == 9
+        assert [m["time"] for m in measures[:3]] == [1680307200002, 1680307200001, 1680307200000]
+        assert [m["value"] for m in measures[::3]] == ["1680307200000", "1682899200000", "1685577600000"]
+
+        # The generator skips empty months and streams the entire range
+        history.reset()
+        measures = list(botengine.iterate_measurements("SAMPLE_01", oldest_timestamp_ms, newest_timestamp_ms))
+        assert history.call_count == 6
+        assert len(measures) == 15
+        assert [m["time"] for m in measures] == sorted(m["time"] for m in measures)
+        assert measures[0]["time"] == oldest_timestamp_ms
+
+    @requests_mock.mock()
+    @patch("botengine.BotEngine.get_logger")
+    @patch("botengine.BotEngine.get_bundle_id")
+    @patch("botengine.BotEngine.get_cloud_address")
+    @patch("botengine.BotEngine.get_bot_type")
+    def test_botengine_load_variables(
+        self,
+        mock_for_requests,
+        mock_get_bot_type,
+        mock_get_cloud_address,
+        mock_get_bundle_id,
+        mock_get_logger,
+    ):
+        import io
+
+        import dill
+
+        mock_get_bot_type.return_value = 0
+        mock_get_cloud_address.return_value = "https://app.host.com"
+        mock_get_bundle_id.return_value = "com.ppc.Tests"
+        add_logger(mock_get_logger)
+        # Import BotEngine class
+        import botengine as botengine_module
+        from botengine import BotEngine
+
+        # Initialize BotEngine
+        api_key = "1234567890"
+        host = "https://app.host.com"
+        start_key = 1
+        raw_inputs = {"apiKey": api_key, "apiHost": host, "startKey": start_key}
+        mock_for_requests.post(
+            host + "/analytic/start", headers={}, json={"resultCode": 0}
+        )
+        botengine = BotEngine(raw_inputs)
+
+        # A batch of variables is downloaded concurrently, skipping the ones already loaded
+        for name in ["a", "b", "c"]:
+            mock_for_requests.get(host + "/analytic/variables/" + name, content=dill.dumps(name.upper()))
+        botengine.variables["c"] = "loaded"
+        assert botengine.load_variables(["a", "b", "c"]) == {"a": "A", "b": "B", "c": "loaded"}
+        assert sorted(request.path for request in mock_for_requests.request_history if request.method == "GET") == [
+            "/analytic/variables/a",
+            "/analytic/variables/b",
+        ]
+
+        # A download that breaks partway through resumes after the last byte received
+        value = list(range(100000))
+        content = dill.dumps(value)
+
+        class BrokenStream(io.BytesIO):
+            def read(self, *args, **kwargs):
+                if self.tell() >= 1000:
+                    raise ConnectionResetError("Connection reset by peer")
+                return super().read(*args, **kwargs)
+
+        mock_for_requests.get(
+            host + "/analytic/variables/large",
+            [
+                {"body": BrokenStream(content)},
+                {"status_code": 206, "content": content[1000:]},
+            ],
+        )
+        with patch.object(botengine_module, "VARIABLE_CHUNK_BYTES", 500):
+            assert botengine.load_variable("large") == value
+        assert mock_for_requests.request_history[-1].headers["Range"] == "bytes=1000-"
+
+        # A server that ignores the range sends the whole variable again
+        mock_for_requests.get(
+            host + "/analytic/variables/restarted",
+            [{"body": BrokenStream(content)}, {"content": content}],
+        )
+        with patch.object(botengine_module, "VARIABLE_CHUNK_BYTES", 500):
+            assert botengine.load_variable("restarted") == value
+
+        # Declared variables are prefetched at the start of an execution
+        botengine._reset_core_variable()
+        botengine.set_prefetch_variables(["d", "a"])
+        assert botengine.get_prefetch_variables() == ["d", "a"]
+        mock_for_requests.get(host + "/analytic/variables/d", content=dill.dumps("D"))
+        botengine.prefetch_variables()
+        assert botengine.variables["d"] == "D"
+        assert mock_for_requests.request_history[-1].path == "/analytic/variables/d"
+
+    @requests_mock.mock()
+    @patch("botengine.BotEngine.get_logger")
+    @patch("botengine.BotEngine.get_bundle_id")
+    @patch("botengine.BotEngine.get_cloud_address")
+    @patch("botengine.BotEngine.get_bot_type")
+    def test_botengine_download_data_requests(
+        self,
+        mock_for_requests,
+        mock_get_bot_type,
+        mock_get_cloud_address,
+        mock_get_bundle_id,
+        mock_get_logger,
+    ):
+        import pickle
+
+        import lz4.block
+        import lz4.frame
+
+        mock_get_bot_type.return_value = 0
+        mock_get_cloud_address.return_value = "https://app.host.com"
+        mock_get_bundle_id.return_value = "com.ppc.Tests"
+        add_logger(mock_get_logger)
+        # Import BotEngine class
+        import botengine as botengine_module
+        from botengine import BotEngine, DataRequestContent
+
+        # Initialize BotEngine
+        api_key = "1234567890"
+        host = "https://app.host.com"
+        start_key = 1
+        raw_inputs = {"apiKey": api_key, "apiHost": host, "startKey": start_key}
+        mock_for_requests.post(
+            host + "/analytic/start", headers={}, json={"resultCode": 0}
+        )
+        botengine = BotEngine(raw_inputs)
+
+        frame_csv = "measure_time,index,power\n" + "".join("{},0,{}\n".format(1000 + i, i) for i in range(2000))
+        block_csv = 'measure_time,index,status\n1000,0,"a,b"\n1001,0,c'
+        mock_for_requests.get("https://data.host.com/frame", content=lz4.frame.compress(frame_csv.encode("utf-8")))
+        mock_for_requests.get("https://data.host.com/block", content=lz4.block.compress(block_csv.encode("utf-8"), store_size=False))
+        data = [
+            {"key": "history", "deviceId": "SAMPLE_01", "url": "https://data.host.com/frame", "dataLength": len(frame_csv)},
+            {"key": "history", "deviceId": "SAMPLE_02", "url": "https://data.host.com/block", "dataLength": len(block_csv)},
+        ]
+
+        # Large files are held in a memory-mapped temporary file
+        with patch.object(botengine_module, "DATA_REQUEST_SPILL_BYTES", 1024), patch.object(botengine_module, "DATA_REQUEST_CHUNK_BYTES", 512):
+            events = botengine.download_data_requests(data)
+
+        frame = events["history"]["SAMPLE_01"]
+        block = events["history"]["SAMPLE_02"]
+        assert frame._file is not None and block._file is None
+        assert len(frame) == len(frame_csv)
+        rows = list(frame)
+        assert rows[0] == ["measure_time", "index", "power"]
+        assert rows[-1] == ["2999", "0", "1999"]
+        assert len(list(frame)) == 2001
+        assert frame.text() == frame_csv
+        assert list(block) == [["measure_time", "index", "status"], ["1000", "0", "a,b"], ["1001", "0", "c"]]
+
+        # Microservices that expect the CSV string keep working
+        assert str(block) == block_csv
+        with pytest.warns(DeprecationWarning):
+            assert block.splitlines()[1] == '1000,0,"a,b"'
+        assert pickle.loads(pickle.dumps(frame)).text() == frame_csv
+        frame.close()
+        block.close()
+        assert list(frame) == []
+
+        # Playback recordings hold the decompressed files
+        botengine.playback = True
+        events = botengine.download_data_requests([{"key": None, "deviceId": "SAMPLE_01", "dataLength": 9, "data": "a,b\n1,2\n"}])
+        assert list(events[None]["SAMPLE_01"]) == [["a", "b"], ["1", "2"]]
+        assert list(DataRequestContent()) == []
+
+    @requests_mock.mock()
+    @patch("botengine.BotEngine.get_logger")
+    @patch("botengine.BotEngine.get_bundle_id")
+    @patch("botengine.BotEngine.get_cloud_address")
+    @patch("botengine.BotEngine.get_bot_type")
+    def test_botengine_timer_index(
+        self,
+        mock_for_requests,
+        mock_get_bot_type,
+        mock_get_cloud_address,
+        mock_get_bundle_id,
+        mock_get_logger,
+    ):
+        mock_get_bot_type.return_value = 0
+        mock_get_cloud_address.return_value = "https://app.host.com"
+        mock_get_bundle_id.return_value = "com.ppc.Tests"
+        add_logger(mock_get_logger)
+        # Import BotEngine class
+        from botengine import BotEngine, MAXINT, TIMERS_VARIABLE_NAME
+
+        # Initialize BotEngine
+        api_key = "1234567890"
+        host = "https://app.host.com"
+        start_key = 1
+        raw_inputs = {"apiKey": api_key, "apiHost": host, "startKey": start_key}
+        mock_for_requests.post(
+            host + "/analytic/start", headers={}, json={"resultCode": 0}
+        )
+        mock_for_requests.get(
+            host + "/cloud/json/systemProperty/ppc.bot.minCountdownThreshold", text="10000"
+        )
+        botengine = BotEngine(raw_inputs)
+        now = botengine.get_system_time_ms()
+        botengine.set_inputs({
+                "time": now,
+                "trigger": 0,
+                "source": 0,
+                "locationId": 0,
+            })
+        botengine.variables = {"-core-": {TIMERS_VARIABLE_NAME: None}}
+
+        def fired(botengine, argument):
+            pass
+
+        assert not botengine.is_timer_running("a")
+        assert botengine.timer_timestamp_ms("a") is None
+
+        botengine.set_alarm(now + 300000, fired, "a", "a")
+        botengine.set_alarm(now + 100000, fired, "b", "b")
+        botengine.set_alarm(now + 200000, fired, "c", "c")
+        botengine.set_alarm(now + 200000, fired, "d", "d")
+
+        # Resetting an alarm replaces the previous alarm with the same reference
+        botengine.set_alarm(now + 400000, fired, "b", "b")
+
+        saved_timers = botengine.load_variable(TIMERS_VARIABLE_NAME)
+        assert [t[3] for t in saved_timers] == ["c", "d", "a", "b", None]
+        assert saved_timers[-1][0] == MAXINT
+        assert botengine.is_timer_running("b")
+        assert botengine.timer_timestamp_ms("b") == now + 400000
+
+        botengine.cancel_timers("c")
+        assert [t[3] for t in saved_timers] == ["d", "a", "b", None]
+        assert not botengine.is_timer_running("c")
+        assert botengine.timer_timestamp_ms("c") is None
+
+        # The timers list is still modified directly when timers fire, which refreshes the index
+        saved_timers.pop(0)
+        botengine.save_variable(TIMERS_VARIABLE_NAME, saved_timers, overwrite=True)
+        assert not botengine.is_timer_running("d")
+        botengine.set_alarm(now + 100000, fired, "e", "e")
+        assert [t[3] for t in saved_timers] == ["e", "a", "b", None]
+
+        # Legacy timer lists are indexed when loaded
+        mock_for_requests.delete(host + "/analytic/execute", json={"resultCode": 0})
+        botengine.variables["-core-"][TIMERS_VARIABLE_NAME] = [
+            (now + 100000, fired, None, "x"),
+            (now + 200000, fired, None, "x"),
+            (MAXINT, now, None, None),
+        ]
+        assert botengine.timer_timestamp_ms("x") == now + 100000
+        botengine.cancel_timers("x")
+        assert botengine.load_variable(TIMERS_VARIABLE_NAME) == [(MAXINT, now, None, None)]
+
+        # Legacy timer lists saved out of order are sorted when loaded
+        botengine.variables["-core-"][TIMERS_VARIABLE_NAME] = [
+            (now + 300000, fired, None, "y"),
+            (now + 100000, fired, None, "z"),
+            (MAXINT, now, None, None),
+        ]
+        botengine.cancel_timers("z")
+        assert [t[3] for t in botengine.load_variable(TIMERS_VARIABLE_NAME)] == ["y", None]
+
+        # A timer the server schedules later than the timers behind it stays in timestamp order
+        from botengine import _schedule_next_timer
+
+        botengine.set_alarm(now + 100000, fired, "f", "f")
+        botengine.set_alarm(now + 200000, fired, "g", "g")
+        with patch.object(botengine, "is_server_version_newer_than", return_value=True), patch.object(
+            botengine, "_execute_again_at_timestamp", return_value=now + 250000
+        ):
+            _schedule_next_timer(botengine, None)
+        saved_timers = botengine.load_variable(TIMERS_VARIABLE_NAME)
+        assert [t[3] for t in saved_timers] == ["g", "f", "y", None]
+        assert botengine.timer_timestamp_ms("f") == now + 250000
+
+        botengine.cancel_timers("f")
+        assert not botengine.is_timer_running("f")
+        botengine.set_alarm(now + 150000, fired, "g", "g")
+        assert [t[3] for t in botengine.load_variable(TIMERS_VARIABLE_NAME)] == ["g", "y", None]
+
+    @requests_mock.mock()
+    @patch("botengine.BotEngine.get_logger")
+    @patch("botengine.BotEngine.get_bundle_id")
+    @patch("botengine.BotEngine.get_cloud_address")
+    @patch("botengine.BotEngine.get_bot_type")
+    def test_botengine_flush_states(
+        self,
+        mock_for_requests,
+        mock_get_bot_type,
+        mock_get_cloud_address,
+        mock_get_bundle_id,
+        mock_get_logger,
+    ):
+        mock_get_bot_type.return_value = 0
+        mock_get_cloud_address.return_value = "https://app.host.com"
+        mock_get_bundle_id.return_value = "com.ppc.Tests"
+        add_logger(mock_get_logger)
+        # Import BotEngine class
+        from botengine import BotEngine
+
+        # Initialize BotEngine
+        api_key = "1234567890"
+        host = "https://app.host.com"
+        start_key = 1
+        raw_inputs = {"apiKey": api_key, "apiHost": host, "startKey": start_key}
+        mock_for_requests.post(
+            host + "/analytic/start", headers={}, json={"resultCode": 0}
+        )
+        botengine = BotEngine(raw_inputs)
+        botengine.set_inputs({
+                "time": botengine.get_system_time_ms(),
+                "trigger": 0,
+                "source": 0,
+                "locationId": 123,
+            })
+
+        state_url = host + "/cloud/json/locations/123/state"
+        mock_for_requests.get(
+            state_url + "?name=unchanged", json={"value": {"b": 2, "a": 1}}
+        )
+        mock_for_requests.get(
+            state_url + "?name=partial", json={"value": {"a": 1, "b": 2}}
+        )
+        put = mock_for_requests.put(state_url, json={"resultCode": 0})
+
+        # Writing states never goes to the server until they are flushed
+        assert botengine.get_state("unchanged") == {"a": 1, "b": 2}
+        botengine.set_state("unchanged", {"a": 1, "b": 2})
+        botengine.set_state("changed", {"c": 3})
+        botengine.set_state("partial", {"b": 3}, overwrite=False)
+        botengine.set_state("partial", {"c": 4}, overwrite=False)
+        assert put.call_count == 0
+
+        # Partial updates that haven't been flushed are applied to the server copy
+        assert botengine.get_state("partial") == {"a": 1, "b": 3, "c": 4}
+
+        # Unchanged states are skipped
+        botengine.flush_states()
+        assert sorted(request.qs["name"][0] for request in put.request_history) == ["changed", "partial"]
+        assert put.request_history[0].json() == {"value": {"c": 3}}
+
+        # States the server already holds are not flushed again
+        botengine.set_state("changed", {"c": 3})
+        botengine.flush_states()
+        assert put.call_count == 2
+
+        botengine.set_state("changed", {"c": 5})
+        botengine.flush_states()
+        assert put.call_count == 3
+        assert put.last_request.json() == {"value": {"c": 5}}
+
+    def test_botengine_indexed_recording(self):
+        import json
+        import os
+        import tempfile
+
+        from botengine import (
+            _convert_recording,
+            _IndexedRecording,
+            _is_indexed_recording,
+        )
+
+        recording = {
+            "location_info": {"id": 123, "timezone": {"id": "US/Pacific"}},
+            "sub_locations": [{"id": 456}],
+            "device_properties": {"SAMPLE_01": None},
+            "data_requests": {"SAMPLE_01": "SAMPLE_01_parameters.csv"},
+            "data": [
+                {"trigger": "8", "device_id": "SAMPLE_01", "timestamp_ms": str(1000 + i), "value": [i, {"a": 1.5}]}
+                for i in range(25)
+            ],
+        }
+        with tempfile.TemporaryDirectory() as directory:
+            source = os.path.join(directory, "recording.json")
+            with open(source, "w") as f:
+                json.dump(recording, f)
+            with open(os.path.join(directory, "SAMPLE_01_parameters.csv"), "w") as f:
+                f.write("paramName,measureTime\n")
+
+            destination = os.path.join(directory, "recording.rec")
+            assert _convert_recording(source, destination, chunk_events=10) == 25
+            assert _is_indexed_recording(destination)
+            assert not _is_indexed_recording(source)
+
+            with _IndexedRecording(destination) as indexed:
+                assert len(indexed) == 25
+                assert [chunk[3] for chunk in indexed.index["chunks"]] == [10, 10, 5]
+                assert indexed.first_timestamp_ms() == 1000
+                assert indexed.section("location_info") == recording["location_info"]
+                assert indexed.section("sub_locations") == recording["sub_locations"]
+                assert indexed.section("system_properties", {}) == {}
+                assert list(indexed.events()) == recording["data"]
+                assert list(indexed.events(start_chunk=2)) == recording["data"][20:]
+                assert indexed.locate(0) == (0, 0)
+                assert indexed.locate(23) == (2, 3)
+                assert indexed.locate(25) == (3, 0)
+
+                extracted = indexed.extract_files(os.path.join(directory, "extracted"))
+                with open(os.path.join(extracted, "SAMPLE_01_parameters.csv")) as f:
+                    assert f.read() == "paramName,measureTime\n"
+
+    def test_botengine_playback_checkpoint(self):
+        import importlib
+        import os
+        import random
+        import sys
+        import tempfile
+        from types import SimpleNamespace
+
+        import botengine
+
+        attributes = {"states": {}, "states_to_flush": {}, "data_requests": [], "cancelled_timers": False}
+        attributes["variables"] = {"-core-": {"[t]": [[2000, None, "bot"]]}, "recording": botengine._IndexedRecording}
+        attributes["questions_to_ask"] = {"question": 3}
+        bot = {"bundle_id": "com.ppc.Tests", "access": {"location": {"locationId": 123}}}
+        bot["BotEngine"] = SimpleNamespace(**attributes)
+        activated = []
+
+        with tempfile.TemporaryDirectory() as directory:
+            random.seed(0)
+            botengine.playback_timestamp_ms = 1500
+            botengine.playback_states = {"status": [{"value": 1}]}
+            botengine._save_playback_checkpoint(
+                directory, 1500, 12, {"did_start_playback": True}, [bot], activated.append
+            )
+            botengine._save_playback_checkpoint(directory, 3000, 20, {}, [bot], activated.append)
+            expected = [random.random() for i in range(5)]
+
+            assert botengine._find_playback_checkpoint(directory, 1000) is None
+            assert botengine._find_playback_checkpoint(directory, 2999) == os.path.join(directory, "1500.dill")
+            assert botengine._find_playback_checkpoint(os.path.join(directory, "missing"), 2999) is None
+
+            # Bot modules are imported again before each execution, so classes are resolved against the new import
+            original = sys.modules.pop("botengine")
+            try:
+                reimported = importlib.import_module("botengine")
+                restored = {"bundle_id": "com.ppc.Tests", "BotEngine": SimpleNamespace()}
+                random.seed(1)
+                original.playback_timestamp_ms = None
+                original.playback_states = {}
+                position, timestamp_ms, loop_state = original._load_playback_checkpoint(
+                    os.path.join(directory, "1500.dill"), [restored], activated.append
+                )
+            finally:
+                sys.modules["botengine"] = original
+
+        assert (position, timestamp_ms, loop_state) == (12, 1500, {"did_start_playback": True})
+        assert activated == [bot, bot, restored]
+        assert restored["access"] == bot["access"]
+        assert restored["BotEngine"].variables["-core-"] == attributes["variables"]["-core-"]
+        assert restored["BotEngine"].variables["recording"] is reimported._IndexedRecording
+        assert restored["BotEngine"].questions_to_ask == {"question": 3}
+        assert restored["BotEngine"]._timer_index is None
+        assert original.playback_timestamp_ms == 1500
+        assert original.playback_states == {"status": [{"value": 1}]}
+        assert [random.random() for i in range(5)] == expected
+
+    @patch("botengine.BotEngine.get_logger")
+    @patch("botengine.BotEngine.get_bundle_id")
+    @patch("botengine.BotEngine.get_cloud_address")
+    @patch("botengine.BotEngine.get_bot_type")
+    def test_botengine_playback_checkpoint_resume(
+        self,
+        mock_get_bot_type,
+        mock_get_cloud_address,
+        mock_get_bundle_id,
+        mock_get_logger,
+    ):
+        import tempfile
+
+        import botengine as botengine_module
+        from botengine import BotEngine
+
+        mock_get_bot_type.return_value = 0
+        mock_get_cloud_address.return_value = "https://app.host.com"
+        mock_get_bundle_id.return_value = "com.ppc.Tests"
+        add_logger(mock_get_logger)
+
+        def start(count):
+            # A playback BotEngine with the overrides the playback installs on it
+            bot_engine = BotEngine(
+                {"apiKey": "1234567890", "apiHost": "https://app.host.com"},
+                count=count,
+                playback=True,
+                local_execution_count=0,
+            )
+            bot_engine.get_system_property = lambda name: None
+            bot_engine.get_system_time_ms = lambda: botengine_module.playback_timestamp_ms
+            bot_engine._reset_core_variable()
+            botengine_module.playback_narratives = []
+            botengine_module.playback_timestamp_ms = 0
+            return {"bundle_id": "com.ppc.Tests", "BotEngine": bot_engine, "access": None}
+
+        def replay(bot, events):
+            bot_engine = bot["BotEngine"]
+            for i in events:
+                botengine_module.playback_timestamp_ms = 1000000 + i * 60000
+                bot_engine.set_inputs({"time": botengine_module.playback_timestamp_ms, "trigger": 8, "source": 0, "locationId": 123})
+                bot_engine.count += 1
+                bot_engine.local_execution_count += 1
+                total = bot_engine.load_variable("total") or 0
+                bot_engine.save_variable("total", total + i, required_for_each_execution=True)
+                bot_engine.set_alarm(botengine_module.playback_timestamp_ms + 3600000, checkpoint_timer_fired, i, "timer{}".format(i % 3))
+                bot_engine.set_state("status", {"event": i})
+                bot_engine.tag_location("event{}".format(i))
+                bot_engine.rules[i % 2] = i
+                bot_engine.commands_to_flush.append({"deviceId": "SAMPLE_01", "params": [{"name": "ppc.event", "value": i}]})
+                botengine_module.playback_narratives.append({"event": i})
+
+        def snapshot(bot):
+            state = botengine_module._playback_checkpoint_state(
+                vars(bot["BotEngine"]), botengine_module.PLAYBACK_CHECKPOINT_EXCLUDED_ATTRIBUTES
+            )
+            core = dict(state["variables"]["-core-"])
+            timers = core.pop("[t]")
+            state["variables"] = dict(state["variables"], **{"-core-": core})
+            return state, [(t[0], getattr(t[1], "__name__", None), t[2], t[3]) for t in timers], list(botengine_module.playback_narratives)
+
+        # Uninterrupted playback
+        uninterrupted = start(5)
+        replay(uninterrupted, range(10))
+        expected = snapshot(uninterrupted)
+
+        # Playback that stops at a checkpoint halfway through, and resumes from it
+        with tempfile.TemporaryDirectory() as directory:
+            interrupted = start(5)
+            replay(interrupted, range(4))
+            filename = botengine_module._save_playback_checkpoint(directory, 1240000, 4, {}, [interrupted], lambda bot: None)
+
+            resumed = start(0)
+            assert botengine_module._load_playback_checkpoint(filename, [resumed], lambda bot: None)[0] == 4
+            replay(resumed, range(4, 10))
+
+        assert snapshot(resumed) == expected
+        assert resumed["BotEngine"].count == 15
+        assert resumed["BotEngine"].load_variable("total") == 45
+        assert resumed["BotEngine"].is_timer_running("timer2")
+        assert len(resumed["BotEngine"].tags_to_create) == 10
+
+    def test_botengine_playback_batch(self):
+        import json
+        import os
+        import tempfile
+        import zipfile
+
+        from botengine import _find_recordings, _playback_batch
+
+        def call(command, stdout=None, stderr=None, stdin=None):
+            recording = command[command.index("--playback") + 1]
+            assert command[command.index("--run") + 1] == "com.ppc.Tests"
+            if "broken" in recording:
+                stdout.write("Traceback")
+                return 3
+
+            with open(command[command.index("--playback_summary") + 1], "w") as f:
+                json.dump({"recording": recording}, f)
+            return 0
+
+        with tempfile.TemporaryDirectory() as directory:
+            for filename in ["b.json", "a.zip", "broken.rec", "notes.txt"]:
+                open(os.path.join(directory, filename), "w").close()
+
+            recordings = _find_recordings([directory, "other.json"])
+            assert recordings == [
+                os.path.join(directory, "a.zip"),
+                os.path.join(directory, "b.json"),
+                os.path.join(directory, "broken.rec"),
+                "other.json",
+            ]
+
+            cwd = os.getcwd()
+            os.chdir(directory)
+            try:
+                with patch("subprocess.call", side_effect=call):
+                    assert _playback_batch(recordings, ["com.ppc.Tests"], workers=2, session_id="test") == 1
+
+                with open(os.path.join("playback_batch_test", "summary.json")) as f:
+                    report = json.load(f)
+            finally:
+                os.chdir(cwd)
+
+            assert report["recordings"] == 4
+            assert report["failed"] == 1
+            assert [result["recording"] for result in report["results"]] == recordings
+            assert [result["exit_code"] for result in report["results"]] == [0, 0, 3, 0]
+            assert report["results"][0]["summary"] == {"recording": recordings[0]}
+            assert report["results"][2]["summary"] is None
+
+            # Worker processes can't ask which .json file of a zip recording to playback
+            with zipfile.ZipFile(os.path.join(directory, "c.zip"), "w") as z:
+                z.writestr("c/c.json", "[]")
+                z.writestr("c/c_merged.json", "[]")
+
+            os.chdir(directory)
+            try:
+                with patch("subprocess.call", side_effect=call) as mock_call:
+                    assert _playback_batch([directory], ["com.ppc.Tests"], session_id="zip") == 1
+                    assert mock_call.call_count == 0
+                    assert _playback_batch([directory], ["com.ppc.Tests"], session_id="zip", merged=True) == 1
+                    assert mock_call.call_count == 4
+            finally:
+                os.chdir(cwd)
+
+    def test_botengine_extract_device_modules(self):
+        import os
+
+        from botengine import _extract_device_modules
+
+        bot_directory = os.path.join(os.path.dirname(os.path.dirname(os.path.realpath(__file__))), "com.ppc.Bot")
+        modules = _extract_device_modules(bot_directory)
+        assert "devices.motion.motion" in modules
+        assert "devices.motion.develco.motion" in modules
+        # Device classes only live in device type subdirectories
+        assert "devices.device" not in modules
+        assert not any(".tests." in module or "__pycache__" in module for module in modules)
+        assert modules == _extract_device_modules(bot_directory)
+
 # Helper functions
 
+def checkpoint_timer_fired(botengine, argument):
+    """
+    Timer callback saved by name in playback checkpoints
+    """
+    pass
+
+
 def add_logger(mock_get_logger) -> Logger:
     """
     Add a logger to the botengine instance
@@ -0,0 +1,114 @@
+import importlib
+import json
+import unittest
+from unittest.mock import MagicMock
+
+
+class TestLambda(unittest.TestCase):
+    # Setup and teardown methods
+    # Use to copy to a filename we can import naturally
+    def setup_method(self, method):
+        import os
+        import shutil
+
+        shutil.copy(os.path.join("./", "botengine"), "botengine.py")
+        pass
+
+    def teardown_method(self, method):
+        import os
+
+        try:
+            os.remove("botengine.py")
+        except Exception:
+            pass
+
+    def test_lambda_get_lambda_return(self):
+        # 'lambda' is a keyword, so the module can't be imported with an import statement
+        aws_lambda = importlib.import_module("lambda")
+
+        logger = aws_lambda.LambdaLogger(log_level="debug")
+        for i in range(200):
+            logger.debug("debug {} ".format(i) + "d" * 100)
+            logger.info("info {} ".format(i) + "i" * 100)
+        logger.error("error")
+
+        botengine = MagicMock()
+        botengine.get_bot_type.return_value = 0
+        bot = MagicMock()
+        bot.get_intelligence_statistics.return_value = [
+            {"name": "microservice", "calls": 1, "time": 10}
+        ]
+
+        # Everything fits
+        response = logger.get_lambda_return(botengine, bot, 1024 * 1024)
+        assert len(response["logEvents"]) == len(logger.log_events)
+        assert response["logEvents"] == logger.log_events
+        assert response["microservices"] == bot.get_intelligence_statistics.return_value
+
+        # Errors are always kept, and the response never exceeds the allowed size
+        allowed_output_size = 16 * 1024
+        response = logger.get_lambda_return(botengine, bot, allowed_output_size)
+        assert len(json.dumps(response).encode("utf-8")) <= allowed_output_size
+        messages = [log["message"] for log in response["logEvents"]]
+        assert any("[ERROR]" in message for message in messages)
+        assert any("[INFO]" in message for message in messages)
+        assert any("[DEBUG]" in message for message in messages)
+        assert "microservices" in response
+
+        # Log events keep the order they were logged in
+        positions = [logger.log_events.index(log) for log in response["logEvents"]]
+        assert positions == sorted(positions)
+
+    def test_lambda_lazy_logging(self):
+        import logging
+
+        aws_lambda = importlib.import_module("lambda")
+        import botengine
+
+        calls = []
+
+        def serialize(content):
+            calls.append(content)
+            return json.dumps(content)
+
+        # Messages below the log level are never built
+        logger = aws_lambda.LambdaLogger(log_level="info")
+        assert logger.isEnabledFor(logging.INFO)
+        assert not logger.isEnabledFor(logging.DEBUG)
+        logger.debug(botengine.LazyString("body={}".format, botengine.LazyString(serialize, {"a": 1})))
+        assert calls == []
+        assert logger.log_events == []
+
+        logger.info(botengine.LazyString("body={}".format, botengine.LazyString(serialize, {"a": 1})))
+        assert calls == [{"a": 1}]
+        assert logger.log_events[0]["message"].endswith('body={"a": 1}')
+
+    def test_lambda_logger_handle(self):
+        aws_lambda = importlib.import_module("lambda")
+        import botengine
+
+        loggers, config = botengine._bot_loggers, botengine._bot_logger_config
+        try:
+            botengine._bot_logger_config = None
+            botengine._bot_loggers = {"botengine": aws_lambda.LambdaLogger(log_level="info")}
+            handle = botengine.BotEngine.get_logger_handle("signals.bus")
+            assert botengine.BotEngine.get_logger_handle("signals.bus") is handle
+
+            # The single Lambda logger describes the service of each handle
+            handle.info("first")
+            botengine.BotEngine.get_logger("intelligence").info("second")
+            handle.debug("disabled")
+            handle.info("third")
+            messages = [log["message"] for log in botengine._bot_loggers["botengine"].log_events]
+            assert len(messages) == 3
+            assert messages[0].endswith("signals.bus first")
+            assert messages[1].endswith("intelligence second")
+            assert messages[2].endswith("signals.bus third")
+
+            # The next execution brings a new Lambda logger
+            botengine._bot_loggers = {"botengine": aws_lambda.LambdaLogger(log_level="debug")}
+            handle.debug("enabled")
+            assert botengine._bot_loggers["botengine"].log_events[0]["message"].endswith("signals.bus enabled")
+        finally:
+            botengine._bot_loggers, botengine._bot_logger_config = loggers, config
+            botengine._bot_logger_handles.clear()
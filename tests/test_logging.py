@@ -0,0 +1,56 @@
+import ast
+import glob
+import os
+import unittest
+
+# Calls that serialize entire payloads, which are too expensive to build for a log message that isn't emitted
+EXPENSIVE_CALLS = ["dumps", "pformat", "format_exc"]
+
+# Files that run on every bot execution
+HOT_PATHS = ["botengine", "lambda.py"] + sorted(glob.glob("com.ppc.Bot/**/*.py", recursive=True))
+
+
+class TestLogging(unittest.TestCase):
+    def test_no_eager_debug_formatting(self):
+        """
+        Debug messages must defer expensive representations with LazyString,
+        or only be built inside an `if logger.isEnabledFor(logging.DEBUG):` block.
+        """
+        eager = []
+        for filename in HOT_PATHS:
+            if "{}tests{}".format(os.sep, os.sep) in filename:
+                continue
+
+            with open(filename) as f:
+                tree = ast.parse(f.read(), filename)
+
+            parents = {}
+            for node in ast.walk(tree):
+                for child in ast.iter_child_nodes(node):
+                    parents[child] = node
+
+            for node in ast.walk(tree):
+                if not (isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute) and node.func.attr == "debug"):
+                    continue
+
+                expensive = [
+                    call
+                    for argument in node.args
+                    for call in ast.walk(argument)
+                    if isinstance(call, ast.Call)
+                    and isinstance(call.func, ast.Attribute)
+                    and call.func.attr in EXPENSIVE_CALLS
+                ]
+                if len(expensive) == 0:
+                    continue
+
+                parent = parents.get(node)
+                while parent is not None:
+                    if isinstance(parent, ast.If) and "isEnabledFor" in ast.unparse(parent.test):
+                        break
+                    parent = parents.get(parent)
+
+                if parent is None:
+                    eager.append("{}:{} {}".format(filename, node.lineno, ast.unparse(expensive[0])))
+
+        assert eager == [], "Eager debug formatting:\n" + "\n".join(eager)